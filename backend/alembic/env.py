@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from app.core.config import settings
 from app.db.base import Base
+from app.db.base_class import UTCDateTime
 from app.utils.logger import setup_logs
 
 setup_logs("alembic", level=logging.INFO)
@@ -50,6 +51,15 @@ def process_revision_directives(context, revision, directives):
             logger.info("No changes in schema detected.")
 
 
+def render_item(type_, obj, autogen_context):
+    """
+    Render the custom column types as their implementation, so the migrations do not depend on the app.
+    """
+    if type_ == "type" and isinstance(obj, UTCDateTime):
+        return "sa.DateTime(timezone=True)"
+    return False
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -69,6 +79,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         process_revision_directives=process_revision_directives,
+        render_item=render_item,
     )
 
     with context.begin_transaction():
@@ -80,6 +91,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         process_revision_directives=process_revision_directives,
+        render_item=render_item,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,95 @@
+"""Add indexes on the foreign keys and the hot filter columns
+
+Revision ID: 33ae14ea2c5e
+Revises: a3c1e7d2b9f4
+Create Date: 2026-10-18 16:41:37.208519
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "33ae14ea2c5e"
+down_revision = "a3c1e7d2b9f4"
+branch_labels = None
+depends_on = None
+
+# Table -> (index name, columns) of the indexes on the foreign keys
+FOREIGN_KEY_INDEXES = {
+    "transaction": [("ix_transaction_treasury_id", ["treasury_id"])],
+    "transactionv1": [("ix_transactionv1_treasury_id", ["treasury_id"])],
+    "barrel": [
+        ("ix_barrel_drink_item_id", ["drink_item_id"]),
+        ("ix_barrel_transaction_id_purchase", ["transaction_id_purchase"]),
+        ("ix_barrel_transaction_id_sale", ["transaction_id_sale"]),
+        ("ix_barrel_transaction_v1_id", ["transaction_v1_id"]),
+    ],
+    "consumable": [
+        ("ix_consumable_consumable_item_id", ["consumable_item_id"]),
+        ("ix_consumable_transaction_id_purchase", ["transaction_id_purchase"]),
+        ("ix_consumable_transaction_id_sale", ["transaction_id_sale"]),
+        ("ix_consumable_transaction_v1_id_purchase", ["transaction_v1_id_purchase"]),
+        ("ix_consumable_transaction_v1_id_sale", ["transaction_v1_id_sale"]),
+    ],
+    "noninventoried": [
+        ("ix_noninventoried_non_inventoried_item_id", ["non_inventoried_item_id"]),
+        ("ix_noninventoried_transaction_id", ["transaction_id"]),
+    ],
+    "outofstock": [
+        ("ix_outofstock_item_id", ["item_id"]),
+        ("ix_outofstock_transaction_v1_id", ["transaction_v1_id"]),
+    ],
+    "glass": [
+        ("ix_glass_barrel_id", ["barrel_id"]),
+        ("ix_glass_transaction_id", ["transaction_id"]),
+        ("ix_glass_transaction_v1_id", ["transaction_v1_id"]),
+    ],
+}
+
+
+def upgrade() -> None:
+    for table, indexes in FOREIGN_KEY_INDEXES.items():
+        for name, columns in indexes:
+            op.create_index(name, table, columns)
+
+    op.create_index("ix_account_username", "account", ["username"])
+    op.create_index("ix_transaction_datetime_id", "transaction", ["datetime", "id"])
+
+    # Partial indexes, only the rows the hot queries look for are indexed
+    in_stock_barrel = sa.text("empty_or_solded = false")
+    op.create_index(
+        "ix_barrel_in_stock",
+        "barrel",
+        ["drink_item_id", "is_mounted"],
+        postgresql_where=in_stock_barrel,
+        sqlite_where=in_stock_barrel,
+    )
+    in_stock_consumable = sa.text("solded = false")
+    op.create_index(
+        "ix_consumable_in_stock",
+        "consumable",
+        ["consumable_item_id"],
+        postgresql_where=in_stock_consumable,
+        sqlite_where=in_stock_consumable,
+    )
+    pending_transaction = sa.text("status = 'PENDING'")
+    op.create_index(
+        "ix_transaction_pending",
+        "transaction",
+        ["status"],
+        postgresql_where=pending_transaction,
+        sqlite_where=pending_transaction,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transaction_pending", table_name="transaction")
+    op.drop_index("ix_consumable_in_stock", table_name="consumable")
+    op.drop_index("ix_barrel_in_stock", table_name="barrel")
+    op.drop_index("ix_transaction_datetime_id", table_name="transaction")
+    op.drop_index("ix_account_username", table_name="account")
+
+    for table, indexes in FOREIGN_KEY_INDEXES.items():
+        for name, _ in indexes:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""Allow at most one pending transaction
+
+Revision ID: 8d0f62b4c1a7
+Revises: 33ae14ea2c5e
+Create Date: 2026-10-18 17:26:04.581932
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d0f62b4c1a7"
+down_revision = "33ae14ea2c5e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The upgrade fails if several transactions are pending, they must be validated or deleted first
+    pending_transaction = sa.text("status = 'PENDING'")
+    op.drop_index("ix_transaction_pending", table_name="transaction")
+    op.create_index(
+        "ix_transaction_pending",
+        "transaction",
+        ["status"],
+        unique=True,
+        postgresql_where=pending_transaction,
+        sqlite_where=pending_transaction,
+    )
+
+
+def downgrade() -> None:
+    pending_transaction = sa.text("status = 'PENDING'")
+    op.drop_index("ix_transaction_pending", table_name="transaction")
+    op.create_index(
+        "ix_transaction_pending",
+        "transaction",
+        ["status"],
+        postgresql_where=pending_transaction,
+        sqlite_where=pending_transaction,
+    )
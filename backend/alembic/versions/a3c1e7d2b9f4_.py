@@ -0,0 +1,26 @@
+"""Add a version column to the treasury
+
+Revision ID: a3c1e7d2b9f4
+Revises: 4f4b5e91840c
+Create Date: 2026-10-18 15:02:11.417263
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3c1e7d2b9f4"
+down_revision = "4f4b5e91840c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows start at version 1, as rows inserted by the ORM do
+    op.add_column("treasury", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.alter_column("treasury", "version", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("treasury", "version")
@@ -0,0 +1,51 @@
+"""Add the sales rollup
+
+Revision ID: c5d2e8a417f3
+Revises: 8d0f62b4c1a7
+Create Date: 2026-10-18 19:12:47.208361
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5d2e8a417f3"
+down_revision = "8d0f62b4c1a7"
+branch_labels = None
+depends_on = None
+
+rollup_item_type = sa.Enum("GLASS", "BARREL", "CONSUMABLE", "NON_INVENTORIED", name="rollupitemtype")
+
+
+def upgrade() -> None:
+    # The rollup starts empty, the `rebuild-rollup` command backfills it from the existing transactions
+    op.create_table(
+        "salesrollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "trade",
+            postgresql.ENUM("PURCHASE", "SALE", name="tradetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "payment_method",
+            postgresql.ENUM("CARD", "CASH", "LYDIA", "TRANSFER", name="paymentmethod", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("item_type", rollup_item_type, nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("cost", sa.Float(), nullable=False),
+        sa.Column("lydia_fees", sa.Float(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("day", "trade", "payment_method", "item_type", "item_id", name="uq_salesrollup_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("salesrollup")
+    rollup_item_type.drop(op.get_bind(), checkfirst=True)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Security
 
+from app.core.types import SecurityScopes
 from app.core.utils.backend.alert_backend import TestException
-from app.schemas.utils_endpoints import HealthResponse, RootResponse, VersionResponse
+from app.dependencies import get_current_active_account, get_db
+from app.schemas.utils_endpoints import HealthResponse, PoolStatusResponse, RootResponse, VersionResponse
 from app.utils.get_version import get_version
 
 base_router = APIRouter(tags=["Utils"])
@@ -23,6 +25,19 @@ async def health():
     return {"status": "OK"}
 
 
+@base_router.get(
+    "/pool",
+    status_code=200,
+    response_model=PoolStatusResponse,
+    dependencies=[Security(get_current_active_account, scopes=[SecurityScopes.PRESIDENT.value])],
+)
+async def pool():
+    """
+    Connection pool statistics endpoint, restricted to the presidents.
+    """
+    return get_db.pool_status()
+
+
 @base_router.get("/error", status_code=500)
 async def error():
     """
@@ -43,10 +43,11 @@ async def read_accounts(
 
 
 @router.post("/", response_model=account_schema.Account)
-async def create_account(account: account_schema.AccountCreate, db: DBDependency):
+async def create_account(body: account_schema.AccountCreateBody, db: DBDependency):
     """
     Create a new account.
     """
+    account = await account_schema.validate_account_body(account_schema.AccountCreate, body)
     if await accounts.query(db, username=account.username, limit=1):
         logger.debug(USERNAME_UNAVAILABLE, account.username)
         raise HTTPException(
@@ -79,12 +80,13 @@ async def read_account(account_id: int, db: DBDependency):
     response_model=account_schema.Account,
     dependencies=[Security(get_current_active_account, scopes=[SecurityScopes.PRESIDENT.value])],
 )
-async def update_account(account_id: int, account: account_schema.AccountUpdate, db: DBDependency):
+async def update_account(account_id: int, body: account_schema.AccountUpdateBody, db: DBDependency):
     """
     Update an account by ID.
 
     This endpoint requires authentication with the "president" scope.
     """
+    account = await account_schema.validate_account_body(account_schema.AccountUpdate, body)
     old_account = await accounts.read(db, account_id)
     if old_account is None:
         logger.debug(ACCOUNT_NOT_FOUND, account_id)
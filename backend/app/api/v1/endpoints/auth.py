@@ -3,7 +3,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_password_async
 from app.core.translation import Translator
 from app.crud.crud_account import account as accounts
 from app.dependencies import DBDependency, get_current_active_account
@@ -23,10 +23,12 @@ async def login(db: DBDependency, form_data: OAuth2PasswordRequestForm = Depends
     """
     account = ((await accounts.query(db, username=form_data.username, limit=1))[0:1] or [None])[0]
     # Check if account exists, if password is correct and if account is active
-    if not account or not verify_password(form_data.password, account.password) or account.is_active is False:
+    # The password is only checked once, bcrypt is slow on purpose
+    valid_password = account is not None and await verify_password_async(form_data.password, account.password)
+    if not account or not valid_password or account.is_active is False:
         if not account:
             logger.debug("Account %s not found", form_data.username)
-        elif not verify_password(form_data.password, account.password):
+        elif not valid_password:
             logger.debug("Invalid password for %s", form_data.username)
         elif account.is_active is False:
             logger.debug("Account %s is not active", form_data.username)
@@ -48,13 +50,14 @@ async def read_account_me(current_account: account_schema.Account = Security(get
 
 @router.put("/me/", response_model=account_schema.Account)
 async def update_account_me(
-    account_in: account_schema.OwnAccountUpdate,
+    body: account_schema.OwnAccountUpdateBody,
     db: DBDependency,
     current_account: account_schema.Account = Security(get_current_active_account),
 ):
     """
     Updates the current user's account information.
     """
+    account_in = await account_schema.validate_account_body(account_schema.OwnAccountUpdate, body)
     # Check if username is already taken
     if (
         account_in.username
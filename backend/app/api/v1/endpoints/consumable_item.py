@@ -1,7 +1,8 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, Security, status
+from fastapi import APIRouter, HTTPException, Request, Security, status
 
+from app.core.responses import catalog_cache
 from app.core.translation import Translator
 from app.crud.crud_consumable import consumable as consumables
 from app.crud.crud_consumable_item import consumable_item as consumable_items
@@ -23,11 +24,18 @@ CONSUMABLE_ITEM_USED = "Consumable item %s is used"
     response_model=list[consumable_item_schema.ConsumableItem],
     dependencies=[Security(get_current_active_account)],
 )
-async def read_consumable_items(db: DBDependency):
+async def read_consumable_items(request: Request, db: DBDependency):
     """
     Retrieve a list of all consumable items.
+
+    The response has an `ETag`, a request with a matching `If-None-Match` header is answered with a 304.
     """
-    return await consumable_items.query(db, limit=None)
+    return await catalog_cache.respond(
+        request,
+        list[consumable_item_schema.ConsumableItem],
+        [consumable_items.model.__tablename__],
+        lambda: consumable_items.query(db, limit=None),
+    )
 
 
 @router.post(
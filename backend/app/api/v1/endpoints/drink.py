@@ -1,7 +1,8 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, Security, status
+from fastapi import APIRouter, HTTPException, Request, Security, status
 
+from app.core.responses import catalog_cache
 from app.core.translation import Translator
 from app.crud.crud_barrel import barrel as barrels
 from app.crud.crud_drink_item import drink_item as drinks
@@ -38,11 +39,18 @@ async def read_drink(drink_id: int, db: DBDependency):
     response_model=list[drink_schema.DrinkItem],
     dependencies=[Security(get_current_active_account)],
 )
-async def read_drinks(db: DBDependency):
+async def read_drinks(request: Request, db: DBDependency):
     """
     Retrieve all drinks.
+
+    The response has an `ETag`, a request with a matching `If-None-Match` header is answered with a 304.
     """
-    return await drinks.query(db, limit=None)
+    return await catalog_cache.respond(
+        request,
+        list[drink_schema.DrinkItem],
+        [drinks.model.__tablename__],
+        lambda: drinks.query(db, limit=None),
+    )
 
 
 @router.post(
@@ -1,7 +1,8 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Security, status
 
+from app.core.responses import catalog_cache
 from app.core.translation import Translator
 from app.core.utils.misc import process_query_parameters, to_query_parameters
 from app.crud.crud_out_of_stock import out_of_stock as out_of_stocks
@@ -21,19 +22,27 @@ logger = logging.getLogger("app.api.v1.out_of_stock_item")
     dependencies=[Security(get_current_active_account)],
 )
 async def read_out_of_stock_items_buy(
+    request: Request,
     db: DBDependency,
     query=Depends(to_query_parameters(out_of_stock_item_schema.OutOfStockItemBase)),
 ):
     """
     Retrieve a list of out of stock items for buying.
+
+    The response has an `ETag`, a request with a matching `If-None-Match` header is answered with a 304.
     """
     query_parameters = process_query_parameters(query)
     logger.debug("Query parameters: %s", query_parameters)
-    return await out_of_stock_items.query(
-        db,
-        limit=None,
-        buy_or_sell=True,
-        **query_parameters,
+    return await catalog_cache.respond(
+        request,
+        list[out_of_stock_item_schema.OutOfStockItem],
+        [out_of_stock_items.model.__tablename__],
+        lambda: out_of_stock_items.query(
+            db,
+            limit=None,
+            buy_or_sell=True,
+            **query_parameters,
+        ),
     )
 
 
@@ -43,19 +52,27 @@ async def read_out_of_stock_items_buy(
     dependencies=[Security(get_current_active_account)],
 )
 async def read_out_of_stock_items_sell(
+    request: Request,
     db: DBDependency,
     query=Depends(to_query_parameters(out_of_stock_item_schema.OutOfStockItemBase)),
 ):
     """
     Retrieve a list of out of stock items for selling.
+
+    The response has an `ETag`, a request with a matching `If-None-Match` header is answered with a 304.
     """
     query_parameters = process_query_parameters(query)
     logger.debug("Query parameters: %s", query_parameters)
-    return await out_of_stock_items.query(
-        db,
-        limit=None,
-        buy_or_sell=False,
-        **query_parameters,
+    return await catalog_cache.respond(
+        request,
+        list[out_of_stock_item_schema.OutOfStockItem],
+        [out_of_stock_items.model.__tablename__],
+        lambda: out_of_stock_items.query(
+            db,
+            limit=None,
+            buy_or_sell=False,
+            **query_parameters,
+        ),
     )
 
 
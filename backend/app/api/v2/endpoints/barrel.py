@@ -3,7 +3,9 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, Security, status
 
+from app.core.responses import ModelResponse
 from app.core.translation import Translator
+from app.crud.base import loader_profile
 from app.crud.crud_barrel import barrel as barrels
 from app.dependencies import DBDependency, get_current_active_account
 from app.models import barrel as barrel_model
@@ -14,6 +16,10 @@ translator = Translator(element="barrel")
 
 logger = logging.getLogger("app.api.v2.barrel")
 
+# Relationships needed to build the response models, the other ones are not loaded
+barrel_loader = loader_profile(barrel_model.Barrel.drink_item)
+barrel_bulk_loader = loader_profile(barrel_model.Barrel.drink_item, join=False)
+
 
 @router.get(
     "/",
@@ -44,7 +50,10 @@ async def read_barrels(
         query_parameters["drink_item_id"] = drink_item_id
 
     logger.debug("Query parameters: %s", query_parameters)
-    return await barrels.query(db, limit=None, **query_parameters)
+    return ModelResponse(
+        list[barrel_schema.Barrel],
+        await barrels.query(db, limit=None, options=barrel_loader, **query_parameters),
+    )
 
 
 @router.get(
@@ -64,33 +73,26 @@ async def read_distinct_barrels(db: DBDependency, is_mounted: bool | None = None
     if is_mounted is not None:
         query_parameters["is_mounted"] = is_mounted
 
-    distinct_barrels = await barrels.query(
+    distinct_barrels = await barrels.query_grouped(
         db,
-        distinct=barrel_model.Barrel.drink_item_id,
+        group_by=barrel_model.Barrel.drink_item_id,
+        options=barrel_loader,
         empty_or_solded=False,
-        limit=None,
         **query_parameters,
     )
 
-    result = []
-    for distinct_barrel in distinct_barrels:
-        quantity = len(
-            await barrels.query(
-                db,
-                drink_item_id=distinct_barrel.drink_item_id,
-                empty_or_solded=False,
-                **query_parameters,
-            ),
-        )
-        distinct_object = barrel_schema.BarrelDistinct.model_validate(
-            {
-                **distinct_barrel.dict(),
-                "quantity": quantity,
-            },
-        )
-        result.append(distinct_object)
-
-    return result
+    return ModelResponse(
+        list[barrel_schema.BarrelDistinct],
+        [
+            barrel_schema.BarrelDistinct.model_validate(
+                {
+                    **distinct_barrel.dict(),
+                    "quantity": quantity,
+                },
+            )
+            for distinct_barrel, quantity in distinct_barrels
+        ],
+    )
 
 
 @router.post(
@@ -105,6 +107,21 @@ async def create_barrel(barrel: barrel_schema.BarrelCreate, db: DBDependency):
     return await barrels.create_v2(db, obj_in=barrel)
 
 
+@router.post(
+    "/bulk/",
+    response_model=list[barrel_schema.Barrel],
+    dependencies=[Security(get_current_active_account)],
+)
+async def create_barrels(
+    barrels_in: list[barrel_schema.BarrelCreateBulk],
+    db: DBDependency,
+):
+    """
+    Create barrels in the database at once, each one is created `quantity` times.
+    """
+    return await barrels.create_many_v2(db, objs_in=barrels_in, options=barrel_bulk_loader)
+
+
 @router.patch(
     "/{barrel_id}",
     response_model=barrel_schema.Barrel,
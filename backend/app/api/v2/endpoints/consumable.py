@@ -1,8 +1,11 @@
 import logging
+from typing import Any
 
 from fastapi import APIRouter, HTTPException, Security, status
 
+from app.core.responses import ModelResponse
 from app.core.translation import Translator
+from app.crud.base import loader_profile
 from app.crud.crud_consumable import consumable as consumables
 from app.dependencies import DBDependency, get_current_active_account
 from app.models import consumable as consumable_model
@@ -13,6 +16,10 @@ translator = Translator(element="consumable")
 
 logger = logging.getLogger("app.api.v2.consumable")
 
+# Relationships needed to build the response models, the other ones are not loaded
+consumable_loader = loader_profile(consumable_model.Consumable.consumable_item)
+consumable_bulk_loader = loader_profile(consumable_model.Consumable.consumable_item, join=False)
+
 
 @router.get(
     "/",
@@ -30,14 +37,17 @@ async def read_consumables(
     Query parameters:
         - `all`: A boolean indicating whether to return all consumables or only non-empty ones.
     """
-    query_parameters = {}
+    query_parameters: dict[str, Any] = {}
     if consumable_item_id:
         query_parameters["consumable_item_id"] = consumable_item_id
     if not all:
         query_parameters["solded"] = False
     logger.debug("Query parameters: %s", query_parameters)
 
-    return await consumables.query(db, limit=None, **query_parameters)
+    return ModelResponse(
+        list[consumable_schema.Consumable],
+        await consumables.query(db, limit=None, options=consumable_loader, **query_parameters),
+    )
 
 
 @router.get(
@@ -49,7 +59,7 @@ async def read_consumable(consumable_id: int, db: DBDependency):
     """
     Retrieve a consumable.
     """
-    db_consumable = await consumables.read(db, consumable_id)
+    db_consumable = await consumables.read(db, consumable_id, options=consumable_loader)
     if db_consumable is None:
         logger.debug("Consumable %s not found", consumable_id)
         raise HTTPException(
@@ -68,31 +78,25 @@ async def read_distinct_consumables(db: DBDependency):
     """
     Retrieve a list of distinct consumables.
     """
-    distinct_consumables = await consumables.query(
+    distinct_consumables = await consumables.query_grouped(
         db,
-        distinct=consumable_model.Consumable.consumable_item_id,
+        group_by=consumable_model.Consumable.consumable_item_id,
+        options=consumable_loader,
         solded=False,
-        limit=None,
     )
 
-    result = []
-    for distinct_consumable in distinct_consumables:
-        quantity = len(
-            await consumables.query(
-                db,
-                consumable_item_id=distinct_consumable.consumable_item_id,
-                solded=False,
-            ),
-        )
-        distinct_object = consumable_schema.ConsumableDistinct.model_validate(
-            {
-                **distinct_consumable.dict(),
-                "quantity": quantity,
-            },
-        )
-        result.append(distinct_object)
-
-    return result
+    return ModelResponse(
+        list[consumable_schema.ConsumableDistinct],
+        [
+            consumable_schema.ConsumableDistinct.model_validate(
+                {
+                    **distinct_consumable.dict(),
+                    "quantity": quantity,
+                },
+            )
+            for distinct_consumable, quantity in distinct_consumables
+        ],
+    )
 
 
 @router.post(
@@ -110,6 +114,21 @@ async def create_consumable(
     return await consumables.create_v2(db, obj_in=consumable)
 
 
+@router.post(
+    "/bulk/",
+    response_model=list[consumable_schema.Consumable],
+    dependencies=[Security(get_current_active_account)],
+)
+async def create_consumables(
+    consumables_in: list[consumable_schema.ConsumableCreateBulk],
+    db: DBDependency,
+):
+    """
+    Create consumables in the database at once, each one is created `quantity` times.
+    """
+    return await consumables.create_many_v2(db, objs_in=consumables_in, options=consumable_bulk_loader)
+
+
 @router.patch(
     "/{consumable_id}",
     response_model=consumable_schema.Consumable,
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Security
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import event_bus
+from app.dependencies import get_current_active_account
+
+router = APIRouter(tags=["event"], prefix="/event")
+
+logger = logging.getLogger("app.api.v2.event")
+
+
+def format_event(event: str, data: str) -> str:
+    """
+    Format a message of a Server-Sent Events stream.
+    """
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def stream_events(keepalive: float) -> AsyncIterator[str]:
+    """
+    Stream the change events as Server-Sent Events, until the client disconnects.
+
+    :param keepalive: The number of seconds after which a comment is sent if no event was, for the proxies
+        not to close the connection.
+    """
+    async with event_bus.subscribe() as messages:
+        # The client is subscribed, the state it fetches now is not older than the next changes
+        yield format_event("resync", "{}")
+        while True:
+            try:
+                message = await asyncio.wait_for(messages.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Listen again in case the broker lost its connection
+                await event_bus.listen()
+                yield ": keepalive\n\n"
+                continue
+
+            if message is None:
+                logger.debug("Change events lost, asking the client to resync")
+                yield format_event("resync", "{}")
+            else:
+                yield format_event("change", message)
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    dependencies=[Security(get_current_active_account)],
+)
+async def read_events():
+    """
+    Stream the changes of the barrels, consumables, transactions, catalogs and accounts, as Server-Sent Events
+    (`text/event-stream`). The changes of the catalogs and of the accounts only have their `id`.
+
+    Events:
+        - `resync`: The client must fetch the whole state again, it is the first event of the stream,
+                and it is sent again when changes were lost.
+        - `change`: A JSON array of changes, each one with the `table`, the `action` (created, updated or
+                deleted), the `id` of the record and the changed columns in `data` (empty for a deletion).
+    """
+    return StreamingResponse(
+        stream_events(settings.EVENT_KEEPALIVE),
+        media_type="text/event-stream",
+        # Neither the browser nor the reverse proxy may hold the events back
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
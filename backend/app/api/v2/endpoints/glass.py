@@ -2,10 +2,14 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Security, status
 
+from app.core.responses import ModelResponse
 from app.core.translation import Translator
 from app.core.utils.misc import process_query_parameters, to_query_parameters
+from app.crud.base import loader_profile
 from app.crud.crud_glass import glass as glasses
 from app.dependencies import DBDependency, get_current_active_account
+from app.models.barrel import Barrel
+from app.models.glass import Glass
 from app.schemas.v2 import glass as glass_schema
 
 router = APIRouter(tags=["glass"], prefix="/glass")
@@ -13,6 +17,9 @@ router = APIRouter(tags=["glass"], prefix="/glass")
 translator = Translator(element="glass")
 logger = logging.getLogger("app.api.v2.glass")
 
+# Relationships needed to build the response models, the other ones are not loaded
+glass_loader = loader_profile((Glass.barrel, Barrel.drink_item))
+
 
 @router.get(
     "/",
@@ -29,7 +36,10 @@ async def read_glasses(
     logger.debug("Query parameters: %s", query)
     query_parameters = process_query_parameters(query)
     logger.debug("Query parameters: %s", query_parameters)
-    return await glasses.query(db, limit=None, **query_parameters)
+    return ModelResponse(
+        list[glass_schema.Glass],
+        await glasses.query(db, limit=None, options=glass_loader, **query_parameters),
+    )
 
 
 @router.get(
@@ -41,7 +51,7 @@ async def read_glass(glass_id: int, db: DBDependency):
     """
     Retrieve a glass.
     """
-    glass = await glasses.read(db, id=glass_id)
+    glass = await glasses.read(db, id=glass_id, options=glass_loader)
     if not glass:
         logger.debug("Glass %s not found", glass_id)
         raise HTTPException(
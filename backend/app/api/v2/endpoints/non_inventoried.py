@@ -2,9 +2,12 @@ import logging
 
 from fastapi import APIRouter, HTTPException, Security, status
 
+from app.core.responses import ModelResponse
 from app.core.translation import Translator
+from app.crud.base import loader_profile
 from app.crud.crud_non_inventoried import non_inventoried as non_inventorieds
 from app.dependencies import DBDependency, get_current_active_account
+from app.models.non_inventoried import NonInventoried
 from app.schemas.v2 import non_inventoried as non_inventoried_schema
 
 router = APIRouter(tags=["non_inventoried"], prefix="/non_inventoried")
@@ -12,6 +15,9 @@ router = APIRouter(tags=["non_inventoried"], prefix="/non_inventoried")
 translator = Translator(element="non_inventoried")
 logger = logging.getLogger("app.api.v2.endpoints.non_inventoried")
 
+# Relationships needed to build the response models, the other ones are not loaded
+non_inventoried_loader = loader_profile(NonInventoried.non_inventoried_item)
+
 
 @router.get(
     "/",
@@ -22,7 +28,10 @@ async def read_non_inventorieds(db: DBDependency):
     """
     Retrieve a list of non inventorieds.
     """
-    return await non_inventorieds.query(db, limit=None)
+    return ModelResponse(
+        list[non_inventoried_schema.NonInventoried],
+        await non_inventorieds.query(db, limit=None, options=non_inventoried_loader),
+    )
 
 
 @router.get(
@@ -34,7 +43,7 @@ async def read_non_inventoried(non_inventoried_id: int, db: DBDependency):
     """
     Retrieve a non inventoried.
     """
-    non_inventoried = await non_inventorieds.read(db, id=non_inventoried_id)
+    non_inventoried = await non_inventorieds.read(db, id=non_inventoried_id, options=non_inventoried_loader)
     if not non_inventoried:
         logger.debug("NonInventoried %s not found", non_inventoried_id)
         raise HTTPException(
@@ -1,10 +1,12 @@
 import logging
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Security, status
+from fastapi import APIRouter, HTTPException, Request, Security, status
 
+from app.core.responses import catalog_cache
 from app.core.translation import Translator
 from app.core.types import TradeType
+from app.crud.base import loader_profile
 from app.crud.crud_non_inventoried import non_inventoried as non_inventorieds
 from app.crud.crud_non_inventoried_item import (
     non_inventoried_item as non_inventoried_items,
@@ -17,6 +19,9 @@ router = APIRouter(tags=["non_inventoried_item"], prefix="/non_inventoried_item"
 translator = Translator(element="non_inventoried_item")
 logger = logging.getLogger("app.api.v2.endpoints.non_inventoried_item")
 
+# The response models do not need any relationship
+non_inventoried_item_loader = loader_profile()
+
 
 @router.get(
     "/",
@@ -24,6 +29,7 @@ logger = logging.getLogger("app.api.v2.endpoints.non_inventoried_item")
     dependencies=[Security(get_current_active_account)],
 )
 async def read_non_inventoried_items(
+    request: Request,
     db: DBDependency,
     trade: TradeType | None = None,
     name: str | None = None,
@@ -34,6 +40,8 @@ async def read_non_inventoried_items(
     Query parameters:
         - `trade`: The trade type.
         - `name`: The non inventoried item name.
+
+    The response has an `ETag`, a request with a matching `If-None-Match` header is answered with a 304.
     """
     logger.debug("Trade: %s, name: %s", trade, name)
     query_parameters: dict[str, Any] = {}
@@ -41,7 +49,12 @@ async def read_non_inventoried_items(
         query_parameters["trade"] = trade.value
     if name:
         query_parameters["name"] = name
-    return await non_inventoried_items.query(db, limit=None, **query_parameters)
+    return await catalog_cache.respond(
+        request,
+        list[non_inventoried_item_schema.NonInventoriedItem],
+        [non_inventoried_items.model.__tablename__],
+        lambda: non_inventoried_items.query(db, limit=None, options=non_inventoried_item_loader, **query_parameters),
+    )
 
 
 @router.get(
@@ -56,6 +69,7 @@ async def read_non_inventoried_item(non_inventoried_item_id: int, db: DBDependen
     non_inventoried_item = await non_inventoried_items.read(
         db,
         id=non_inventoried_item_id,
+        options=non_inventoried_item_loader,
     )
     if not non_inventoried_item:
         logger.debug("NonInventoriedItem %s not found", non_inventoried_item_id)
@@ -0,0 +1,69 @@
+import logging
+
+from fastapi import APIRouter, Depends, Security
+
+from app.core.types import SecurityScopes
+from app.crud.crud_sales_rollup import sales_rollup
+from app.dependencies import DBDependency, get_current_active_account
+from app.schemas.v2 import sales_report as sales_report_schema
+
+router = APIRouter(tags=["report"], prefix="/report")
+
+logger = logging.getLogger("app.api.v2.report")
+
+
+@router.get(
+    "/nights/",
+    response_model=list[sales_report_schema.NightReport],
+    dependencies=[
+        Security(get_current_active_account, scopes=[SecurityScopes.TREASURER.value]),
+    ],
+)
+async def read_nights(
+    db: DBDependency,
+    query=Depends(sales_report_schema.ReportQuery),
+):
+    """
+    Retrieve the revenue of each night, read from the sales rollup.
+
+    Query parameters:
+        - `start`: If specified, the first night to return.
+        - `end`: If specified, the last night to return.
+
+    This endpoint requires authentication with the "treasury" scope.
+    """
+    return await sales_rollup.read_nights(db, start=query.start, end=query.end)
+
+
+@router.get(
+    "/top-sellers/",
+    response_model=list[sales_report_schema.TopSeller],
+    dependencies=[
+        Security(get_current_active_account, scopes=[SecurityScopes.TREASURER.value]),
+    ],
+)
+async def read_top_sellers(
+    db: DBDependency,
+    query=Depends(sales_report_schema.TopSellerQuery),
+):
+    """
+    Retrieve the items which sold the most over a period, read from the sales rollup.
+
+    Query parameters:
+        - `start`: If specified, the first night of the period.
+        - `end`: If specified, the last night of the period.
+        - `item_type`: If specified, only the items of this type are ranked.
+        - `by_quantity`: If True, the items are ranked by quantity sold instead of revenue.
+        - `limit`: The number of items to return, 10 by default.
+
+    This endpoint requires authentication with the "treasury" scope.
+    """
+    logger.debug("Top sellers query: %s", query)
+    return await sales_rollup.read_top_sellers(
+        db,
+        start=query.start,
+        end=query.end,
+        item_type=query.item_type,
+        by_quantity=query.by_quantity,
+        limit=query.limit,
+    )
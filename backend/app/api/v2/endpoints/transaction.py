@@ -1,12 +1,23 @@
 import logging
+from datetime import datetime
+from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi.responses import StreamingResponse
 
+from app.core.responses import ModelResponse
 from app.core.translation import Translator
 from app.core.types import SecurityScopes
-from app.core.utils.misc import process_query_parameters
+from app.core.utils.misc import decode_cursor, encode_cursor, process_query_parameters
+from app.crud.base import loader_profile
 from app.crud.crud_transaction import transaction as transactions
-from app.dependencies import DBDependency, get_current_active_account
+from app.crud.crud_transaction import with_price_sum
+from app.dependencies import DBDependency, get_current_active_account, get_db
+from app.models.barrel import Barrel
+from app.models.consumable import Consumable
+from app.models.glass import Glass
+from app.models.non_inventoried import NonInventoried
+from app.models.transaction import Transaction
 from app.schemas.v2 import transaction as transaction_schema
 
 router = APIRouter(tags=["transaction"], prefix="/transaction")
@@ -14,6 +25,41 @@ translator = Translator(element="transaction")
 
 logger = logging.getLogger("app.api.v2.transaction")
 
+# Relationships needed to build the response models, the other ones are not loaded
+transaction_loader = [*loader_profile(), with_price_sum]
+transaction_detail_loader = [
+    *loader_profile(
+        (Transaction.barrels_purchase, Barrel.drink_item),
+        (Transaction.barrels_sale, Barrel.drink_item),
+        (Transaction.glasses, Glass.barrel, Barrel.drink_item),
+        (Transaction.non_inventorieds, NonInventoried.non_inventoried_item),
+        (Transaction.consumables_purchase, Consumable.consumable_item),
+        (Transaction.consumables_sale, Consumable.consumable_item),
+    ),
+    with_price_sum,
+]
+# The price sum of the validated transaction is computed by the database, its items are not needed
+transaction_validate_loader = loader_profile()
+
+# Transactions are listed by datetime, the id breaks the ties between transactions of the same datetime
+transaction_keyset = (Transaction.datetime, Transaction.id)
+pagination_fields = {"cursor", "limit"}
+
+
+async def stream_transactions(**query_parameters: Any) -> AsyncIterator[str]:
+    """
+    Stream transactions as newline delimited JSON, one transaction per line.
+    The response is sent after the request's session is closed, so the stream uses its own session.
+    """
+    async with get_db.get_session() as session:
+        async for transaction in transactions.stream(
+            session,
+            options=transaction_loader,
+            order_by=transaction_keyset,
+            **query_parameters,
+        ):
+            yield transaction_schema.Transaction.model_validate(transaction).model_dump_json(by_alias=True) + "\n"
+
 
 @router.post(
     "/",
@@ -25,18 +71,27 @@ async def create_transaction(
     db: DBDependency,
 ):
     """
-    Create a new transaction in the database.
+    Create a new transaction in the database, there can be at most one pending transaction at a time.
     """
-    pending_transaction = await transactions.query(
-        db,
-        status=transaction_schema.Status.PENDING,
-    )
-    if pending_transaction:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=translator.ALREADY_PENDING_TRANSACTION,
-        )
-    return await transactions.create_v2(db, obj_in=transaction)
+    return await transactions.create_pending(db, obj_in=transaction)
+
+
+@router.post(
+    "/cart/",
+    response_model=transaction_schema.TransactionDetail,
+    dependencies=[Security(get_current_active_account)],
+)
+async def create_cart_transaction(
+    cart: transaction_schema.TransactionCartCreate,
+    db: DBDependency,
+):
+    """
+    Sell a whole cart at once: the transaction is created with all its items and validated.
+
+    The cart contains glasses (by barrel, with a quantity), consumables (by id),
+    and non inventoried items (by non inventoried item, with a quantity).
+    """
+    return await transactions.create_cart(db, obj_in=cart, options=transaction_detail_loader)
 
 
 @router.post(
@@ -70,7 +125,7 @@ async def validate_transaction(
     """
     Validate a transaction.
     """
-    old_transaction = await transactions.read(db, id=transaction_id)
+    old_transaction = await transactions.read(db, id=transaction_id, options=transaction_validate_loader)
     if not old_transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,13 +176,51 @@ async def delete_transaction(
 async def read_transactions(
     db: DBDependency,
     query=Depends(transaction_schema.TransactionQuery),
+    stream: bool = False,
 ):
     """
-    Retrieve transactions.
+    Retrieve transactions, ordered by datetime.
+
+    Query parameters:
+        - `limit`: If specified, the maximum number of transactions to return. When the page is full,
+                the `X-Next-Cursor` response header contains the cursor of the next page.
+        - `cursor`: If specified, return the transactions after the page this cursor comes from.
+        - `stream`: If True, return the transactions as newline delimited JSON (`application/x-ndjson`),
+                streamed from the database instead of being loaded all at once.
     """
-    query_parameters = process_query_parameters(query)
+    query_parameters = process_query_parameters(query, exclude=pagination_fields)
     logger.debug("Query parameters: %s", query_parameters)
-    return await transactions.query(db, limit=None, **query_parameters)
+
+    after = None
+    if query.cursor is not None:
+        try:
+            last_datetime, last_id = decode_cursor(query.cursor)
+            after = (datetime.fromisoformat(last_datetime), int(last_id))
+        except (ValueError, TypeError) as e:
+            logger.debug("Invalid cursor %s", query.cursor)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=translator.INVALID_CURSOR,
+            ) from e
+
+    if stream:
+        return StreamingResponse(
+            stream_transactions(after=after, limit=query.limit, **query_parameters),
+            media_type="application/x-ndjson",
+        )
+
+    result = await transactions.query(
+        db,
+        limit=query.limit,
+        options=transaction_loader,
+        order_by=transaction_keyset,
+        after=after,
+        **query_parameters,
+    )
+    headers = {}
+    if query.limit is not None and len(result) == query.limit:
+        headers["X-Next-Cursor"] = encode_cursor(result[-1].datetime.isoformat(), result[-1].id)
+    return ModelResponse(list[transaction_schema.Transaction], result, headers=headers)
 
 
 @router.get(
@@ -142,7 +235,7 @@ async def read_transaction(
     """
     Retrieve a transaction.
     """
-    transaction = await transactions.read(db, id=transaction_id)
+    transaction = await transactions.read(db, id=transaction_id, options=transaction_detail_loader)
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -3,12 +3,13 @@ import asyncio
 import logging
 import sys
 
-from app.commands.dump_db import dump_db
+from app.commands.dump_db import COMPRESSIONS, dump_db, dump_db_stream
 from app.commands.execute_sql import execute_sql_command
 from app.commands.init_db import init_db
-from app.commands.load_db import load_db
+from app.commands.load_db import BATCH_SIZE, load_db
 from app.commands.migrate_db import migrate_db
 from app.commands.open_api import open_api
+from app.commands.rebuild_rollup import rebuild_rollup
 from app.commands.reset_db import reset_db
 from app.db.pre_start import pre_start
 from app.dependencies import get_db
@@ -88,8 +89,26 @@ dump_db_parser.add_argument(
     "-o",
     "--output",
     type=str,
-    help="Output file",
-    default="dump.json",
+    help="Output file, or output directory with the ndjson format",
+    default=None,
+)
+dump_db_parser.add_argument(
+    "--format",
+    choices=["json", "ndjson"],
+    help="Dump format: a single JSON file, or a directory with one NDJSON file per table and a manifest",
+    default="json",
+)
+dump_db_parser.add_argument(
+    "--compression",
+    choices=list(COMPRESSIONS),
+    help="Compression of the table files, with the ndjson format",
+    default="none",
+)
+dump_db_parser.add_argument(
+    "--batch-size",
+    type=int,
+    help="Number of rows read from the database at once, with the ndjson format",
+    default=1000,
 )
 
 load_db_parser = subparsers.add_parser(
@@ -100,9 +119,20 @@ load_db_parser.add_argument(
     "-i",
     "--input",
     type=str,
-    help="Input file",
+    help="Input file, or input directory of a dump with the ndjson format",
     default="dump.json",
 )
+load_db_parser.add_argument(
+    "--batch-size",
+    type=int,
+    help="Number of rows inserted at once",
+    default=BATCH_SIZE,
+)
+
+rebuild_rollup_parser = subparsers.add_parser(
+    "rebuild-rollup",
+    help="Rebuild the sales rollup from the transactions",
+)
 
 execute_parser = subparsers.add_parser(
     "execute",
@@ -144,9 +174,14 @@ async def main(command: str) -> None:
         case "migrate":
             await migrate_db(bypass_revision=args.bypass_revision, force=args.force)
         case "dump":
-            await dump_db(args.output)
+            if args.format == "ndjson":
+                await dump_db_stream(args.output or "dump", compression=args.compression, batch_size=args.batch_size)
+            else:
+                await dump_db(args.output or "dump.json")
         case "load":
-            await load_db(args.input)
+            await load_db(args.input, batch_size=args.batch_size)
+        case "rebuild-rollup":
+            await rebuild_rollup()
         case "execute":
             await execute_sql_command(args.command)
 
@@ -1,14 +1,28 @@
+import datetime
+import gzip
+import hashlib
+import io
 import json
 import logging
-from typing import Any
+from pathlib import Path
+from typing import Any, TextIO
 
-from sqlalchemy import inspect
+from sqlalchemy import Table, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base_class import Base
+from app.db.databases.postgres import PostgresDatabase
+from app.db.select_db import select_db
 from app.dependencies import get_db
 
 logger = logging.getLogger("app.command")
 
+# Version of the layout of the streamed dumps, stored in their manifest
+DUMP_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+# Compression -> extension of the table files
+COMPRESSIONS = {"none": "", "gzip": ".gz"}
+
 
 async def dump_db(output_file: str) -> None:
     logger.info("Creating dump data")
@@ -29,3 +43,94 @@ async def dump_db(output_file: str) -> None:
         json.dump(data, f, indent=2, default=str)
 
     logger.info("Dump of data created")
+
+
+def open_table_file(path: Path, compression: str, mode: str) -> TextIO:
+    """
+    Open a table file of a streamed dump as text.
+
+    :param path: The path of the file
+    :param compression: The compression of the file, one of `COMPRESSIONS`
+    :param mode: "r" to read the file, "w" to write it
+    :return: The opened file
+    """
+    if compression == "gzip":
+        return io.TextIOWrapper(gzip.GzipFile(path, mode), encoding="utf-8")
+    return io.TextIOWrapper(open(path, mode + "b"), encoding="utf-8")
+
+
+async def dump_table(session: AsyncSession, table: Table, file: TextIO, batch_size: int) -> tuple[int, str]:
+    """
+    Write the rows of a table to a file, one JSON array per line, in the order of the table columns.
+    The rows are read from a server-side cursor by batches, so only one batch is in memory at a time.
+
+    :param session: The database session
+    :param table: The table to dump
+    :param file: The file to write the rows to
+    :param batch_size: The number of rows fetched from the cursor at once
+    :return: The number of rows and the SHA-256 checksum of the uncompressed lines
+    """
+    checksum = hashlib.sha256()
+    count = 0
+    # The rows are ordered so that two dumps of the same data are identical
+    query = table.select().order_by(*table.primary_key.columns).execution_options(yield_per=batch_size)
+    result = await session.stream(query)
+    async for rows in result.partitions():
+        lines = "".join(json.dumps(list(row), default=str) + "\n" for row in rows)
+        checksum.update(lines.encode("utf-8"))
+        file.write(lines)
+        count += len(rows)
+    return count, checksum.hexdigest()
+
+
+async def dump_db_stream(output_dir: str, compression: str = "none", batch_size: int = 1000) -> dict[str, Any]:
+    """
+    Dump the database to a directory, with one NDJSON file per table and a manifest.
+
+    The manifest lists the tables in the order they must be loaded, with their columns, their number of rows
+    and the checksum of their file, it is written last so a dump without manifest is incomplete.
+    The memory used does not depend on the size of the database, but on `batch_size`.
+
+    :param output_dir: The directory to write the dump to, it is created if needed
+    :param compression: The compression of the table files, one of `COMPRESSIONS`
+    :param batch_size: The number of rows fetched from the database at once
+    :return: The manifest
+    """
+    logger.info("Creating streamed dump data")
+
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    extension = ".ndjson" + COMPRESSIONS[compression]
+
+    manifest: dict[str, Any] = {
+        "version": DUMP_VERSION,
+        "format": "ndjson",
+        "compression": compression,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "tables": [],
+    }
+    async with get_db.get_session() as session:
+        if isinstance(select_db(), PostgresDatabase):
+            # All the tables are read from the same snapshot, so the dump is consistent
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        for table in Base.metadata.sorted_tables:
+            file_name = table.name + extension
+            with open_table_file(directory / file_name, compression, "w") as file:
+                rows, checksum = await dump_table(session, table, file, batch_size)
+            logger.info("Table %s dumped: %s rows", table.name, rows)
+            manifest["tables"].append(
+                {
+                    "name": table.name,
+                    "file": file_name,
+                    "columns": [column.name for column in table.columns],
+                    "rows": rows,
+                    "sha256": checksum,
+                },
+            )
+
+    with open(directory / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    logger.info("Streamed dump of data created")
+    return manifest
@@ -1,10 +1,16 @@
 import datetime
+import functools
+import hashlib
 import json
 import logging
-from typing import Any, Tuple
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
 
-from sqlalchemy import Table, inspect, text
+from sqlalchemy import Dialect, Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from app.commands.dump_db import MANIFEST_FILE, open_table_file
 from app.db.base_class import Base
 from app.db.databases.postgres import PostgresDatabase
 from app.db.select_db import select_db
@@ -12,64 +18,232 @@ from app.dependencies import get_db
 
 logger = logging.getLogger("app.command")
 
+# Number of rows inserted at once
+BATCH_SIZE = 5000
+
+Converter = Callable[[Any], Any]
+
+# The types dumped in their string form, and their parsers
+PARSERS: dict[type, Converter] = {
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+}
+
+
+class DumpChecksumError(Exception):
+    """
+    The content of a table file of a dump does not match its manifest.
+    """
+
+
+def build_converters(table: Table, dialect: Dialect) -> list[Converter]:
+    """
+    Build, once per table, the functions converting the values of a dump to the values sent to the driver.
+    The datetimes and the dates are parsed from their string form, then the values go through the bind processor
+    of their column, as they would if they were inserted by SQLAlchemy.
+
+    :param table: The table the values are loaded into
+    :param dialect: The dialect of the database
+    :return: The converters, in the order of the table columns
+    """
+    converters: list[Converter] = []
+    for column in table.columns:
+        parse: Converter | None = None
+        if from_string := PARSERS.get(column.type.python_type):
+            parse = functools.partial(parse_string, from_string)
+        process = column.type.dialect_impl(dialect).bind_processor(dialect)
+
+        if parse and process:
+            converters.append(functools.partial(parse_and_process, parse, process))
+        else:
+            converters.append(parse or process or identity)
+    return converters
+
+
+def parse_string(from_string: Converter, value: Any) -> Any:
+    """
+    Parse a value dumped in its string form, the values already parsed (e.g. by JSON) are left as is.
+    """
+    return from_string(value) if isinstance(value, str) else value
+
+
+def parse_and_process(parse: Converter, process: Converter, value: Any) -> Any:
+    """
+    Parse a value, then convert it with the bind processor of its column.
+    """
+    return process(parse(value))
+
+
+def identity(value: Any) -> Any:
+    """
+    Leave a value as is, for the columns needing no conversion.
+    """
+    return value
+
+
+def batched(rows: Iterator[Sequence[Any]], converters: list[Converter], size: int) -> Iterator[list[tuple]]:
+    """
+    Convert rows and group them by batches.
+
+    :param rows: The rows of the dump, their values in the order of the table columns
+    :param converters: The converters of the table, see `build_converters`
+    :param size: The number of rows of a batch
+    :return: An iterator over the batches
+    """
+    batch: list[tuple] = []
+    for row in rows:
+        batch.append(tuple(convert(value) for convert, value in zip(converters, row)))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def insert_batch(connection: AsyncConnection, table: Table, batch: list[tuple]) -> None:
+    """
+    Insert converted rows, with COPY on PostgreSQL and a single executemany on the other databases.
+
+    :param connection: The connection of the load, within its transaction
+    :param table: The table to insert the rows into
+    :param batch: The converted rows
+    """
+    columns = [column.name for column in table.columns]
+    if connection.dialect.name == "postgresql":
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        await driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            table.name,
+            records=batch,
+            columns=columns,
+            schema_name=table.schema,
+        )
+        return
+
+    # The statement is sent as is to the driver, the values are already converted
+    statement = str(table.insert().compile(dialect=connection.dialect))
+    await connection.exec_driver_sql(statement, batch)
 
-async def load_db(input_file: str) -> None:
-    logger.info("Loading dump data")
 
+def read_json_dump(input_file: Path) -> dict[str, tuple[list[str], Iterator[Sequence[Any]]]]:
+    """
+    Read a dump written by `dump_db`, a single JSON file.
+
+    :return: Table name -> (columns, rows)
+    """
     with open(input_file, encoding="utf-8") as f:
         data = json.load(f)
 
+    def read_rows(columns: list[str], rows: list[dict[str, Any]]) -> Iterator[Sequence[Any]]:
+        for row in rows:
+            yield tuple(row[column] for column in columns)
+
+    return {
+        table_name: (table_data["columns"], read_rows(table_data["columns"], table_data["data"]))
+        for table_name, table_data in data.items()
+    }
+
+
+def read_table_file(directory: Path, compression: str, entry: dict[str, Any]) -> Iterator[Sequence[Any]]:
+    """
+    Read the rows of a table file of a streamed dump, one at a time.
+    The checksum and the number of rows are checked against the manifest once the file is read.
+
+    :raise DumpChecksumError: If the file does not match the manifest
+    """
+    checksum = hashlib.sha256()
+    count = 0
+    with open_table_file(directory / entry["file"], compression, "r") as file:
+        for line in file:
+            checksum.update(line.encode("utf-8"))
+            count += 1
+            yield json.loads(line)
+
+    if count != entry["rows"] or checksum.hexdigest() != entry["sha256"]:
+        msg = f"Table file {entry['file']} does not match the manifest"
+        raise DumpChecksumError(msg)
+
+
+def read_stream_dump(directory: Path) -> dict[str, tuple[list[str], Iterator[Sequence[Any]]]]:
+    """
+    Read a dump written by `dump_db_stream`, a directory with a manifest.
+
+    :return: Table name -> (columns, rows)
+    """
+    with open(directory / MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    return {
+        entry["name"]: (entry["columns"], read_table_file(directory, manifest["compression"], entry))
+        for entry in manifest["tables"]
+    }
+
+
+async def load_db(input_file: str, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Load a dump into the database, in a single transaction.
+    Both the JSON dumps and the streamed dumps (a directory, or its manifest) can be loaded.
+
+    :param input_file: The dump to load
+    :param batch_size: The number of rows inserted at once
+    """
+    logger.info("Loading dump data")
+
+    path = Path(input_file)
+    if path.name == MANIFEST_FILE:
+        path = path.parent
+    data = read_stream_dump(path) if path.is_dir() else read_json_dump(path)
+
     async with get_db.get_session() as session:
-        # Retreive the data from the dump file and load it into the database
-        # The data needs to be loaded in the reverse order of the dump file
-        # to avoid foreign key constraint errors
-        tables = Base.metadata.sorted_tables
-        tables_to_load: list[Tuple[Table, Any]] = []
-        for table in reversed(tables):
-            table_name = table.name
-            if table_name not in data:
-                logger.error("Table %s not in dump file", table_name)
+        # Verify that the columns in the dump file match the columns in the table
+        tables_to_load: list[tuple[Table, Iterator[Sequence[Any]]]] = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in data:
+                logger.error("Table %s not in dump file", table.name)
                 continue
-            table_data = data[table_name]
-            columns = table_data["columns"]
-            rows = table_data["data"]
-
-            # Verify that the columns in the dump file match the columns in the table
-            if columns != [column.name for column in inspect(table).columns]:
+            columns, rows = data[table.name]
+            if columns != [column.name for column in table.columns]:
                 logger.error(
                     "Columns in dump file do not match columns in table %s",
-                    table_name,
+                    table.name,
                 )
                 continue
             tables_to_load.append((table, rows))
 
+        # The data needs to be deleted in the reverse order of the dependencies
+        # to avoid foreign key constraint errors
         logger.info("Deleting data from tables")
-        for table, _ in tables_to_load:
+        for table, _ in reversed(tables_to_load):
             await session.execute(table.delete())
 
-        for table, rows in reversed(tables_to_load):
+        connection = await session.connection()
+        start = time.perf_counter()
+        total = 0
+        for table, rows in tables_to_load:
             logger.info("Loading data for table %s", table.name)
-            for row in rows:
-                # Convert datetime strings to datetime objects
-                for column in table.columns:
-                    if isinstance(row[column.name], str) and column.type.python_type == datetime.datetime:
-                        row[column.name] = datetime.datetime.fromisoformat(
-                            row[column.name],
-                        )
-                await session.execute(table.insert().values(**row))
-
-            # Update the sequence for the primary key
-            # This is needed to avoid duplicate primary key errors
-            # when loading data into the database
-            if table.primary_key and isinstance(select_db(), PostgresDatabase):
-                pk_name = table.primary_key.columns.values()[0].name
-                await session.execute(
-                    text(
-                        f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk_name}'), "
-                        f"coalesce(max({pk_name}), 1)) FROM {table.name}",
-                    ),
-                )
+            table_start = time.perf_counter()
+            count = 0
+            for batch in batched(rows, build_converters(table, connection.dialect), batch_size):
+                await insert_batch(connection, table, batch)
+                count += len(batch)
+            duration = time.perf_counter() - table_start
+            logger.info("Table %s loaded: %s rows, %.0f rows/s", table.name, count, count / duration)
+            total += count
+
+        # Update the sequences of the primary keys once all the rows are inserted
+        # This is needed to avoid duplicate primary key errors
+        # when inserting data into the database afterwards
+        if isinstance(select_db(), PostgresDatabase):
+            for table, _ in tables_to_load:
+                if table.primary_key:
+                    pk_name = table.primary_key.columns.values()[0].name
+                    await session.execute(
+                        text(
+                            f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk_name}'), "
+                            f"coalesce(max({pk_name}), 1)) FROM {table.name}",
+                        ),
+                    )
 
         await session.commit()
 
-    logger.info("Dump of data loaded")
+    duration = time.perf_counter() - start
+    logger.info("Dump of data loaded: %s rows in %.2f s, %.0f rows/s", total, duration, total / duration)
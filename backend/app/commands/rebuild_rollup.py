@@ -0,0 +1,18 @@
+import logging
+import time
+
+from app.crud.crud_sales_rollup import sales_rollup
+from app.dependencies import get_db
+
+logger = logging.getLogger("app.command")
+
+
+async def rebuild_rollup() -> None:
+    """
+    Compute the sales rollup again from the validated transactions, in a single database transaction.
+    """
+    logger.info("Rebuilding the sales rollup")
+    start = time.perf_counter()
+    async with get_db.get_session() as session:
+        rows = await sales_rollup.rebuild(session)
+    logger.info("Sales rollup rebuilt: %s rows in %.2f s", rows, time.perf_counter() - start)
@@ -11,6 +11,7 @@ logger = logging.getLogger("app.core.config")
 
 SupportedLocales = Literal["en", "fr"]
 SupportedEnvironments = Literal["development", "production", "test"]
+SqlitePragmaProfiles = Literal["default", "tuned"]
 
 
 class Settings(BaseSettings):
@@ -21,8 +22,22 @@ class Settings(BaseSettings):
     -----------
     ALERT_BACKEND : str
         The alert backend to use.
+    ALERT_DEDUP_TTL : int
+        The minimum number of seconds between two alerts of the same exception.
+    ALERT_FLUSH_INTERVAL : float
+        The number of seconds during which the alerts are gathered before being sent.
+    ALERT_QUEUE_SIZE : int
+        The maximum number of alerts waiting to be sent.
     API_V1_PREFIX : str
         The prefix for API v1 routes.
+    EVENT_BROKER : str
+        The broker of the change events, "memory" for a single process or "postgres" for LISTEN/NOTIFY.
+    EVENT_CHANNEL : str
+        The PostgreSQL channel of the change events.
+    EVENT_QUEUE_SIZE : int
+        The maximum number of change messages waiting to be sent to a client, before it is asked to resync.
+    EVENT_KEEPALIVE : float
+        The number of seconds after which an idle event stream sends a keepalive comment.
     LOCALE : SupportedLocales
         The supported locale for the application.
     ALLOWED_HOSTS : list[str]
@@ -38,6 +53,17 @@ class Settings(BaseSettings):
         The secret key for JWT authentication.
     ALGORITHM : str
         The algorithm to use for JWT authentication.
+    PRINCIPAL_CACHE_SIZE : int
+        The maximum number of authenticated tokens kept in the principal cache.
+    PRINCIPAL_CACHE_TTL : int
+        The number of seconds an authenticated token stays in the principal cache.
+    PASSWORD_WORKERS : int
+        The number of threads hashing and checking passwords, out of the event loop.
+
+    REPORT_TIMEZONE : str
+        The timezone of the bar, the sales reports are grouped by night in this timezone.
+    REPORT_NIGHT_END_HOUR : int
+        The hour at which a night ends, the sales made before it belong to the previous night.
 
     BASE_ACCOUNT_USERNAME : str
         The username for the base account.
@@ -54,6 +80,22 @@ class Settings(BaseSettings):
         The username for the PostgreSQL database.
     POSTGRES_PASSWORD : str | None
         The password for the PostgreSQL database.
+    POSTGRES_POOL_SIZE : int
+        The number of connections kept open in the pool.
+    POSTGRES_MAX_OVERFLOW : int
+        The number of connections that can be opened beyond the pool size.
+    POSTGRES_POOL_TIMEOUT : float
+        The number of seconds to wait for a connection before giving up.
+    POSTGRES_POOL_RECYCLE : int
+        The age in seconds after which a connection is replaced, -1 to never recycle.
+    POSTGRES_POOL_PRE_PING : bool
+        Whether to test connections with a round trip on each checkout.
+    POSTGRES_STATEMENT_CACHE_SIZE : int
+        The number of prepared statements cached per connection, 0 to disable.
+    SQLITE_PRAGMA_PROFILE : SqlitePragmaProfiles
+        The pragmas applied to the SQLite connections, "tuned" for WAL or "default" for the SQLite defaults.
+    SQLITE_FOREIGN_KEYS : bool
+        Whether SQLite enforces the foreign keys.
     DATABASE_URI : str
         The URI for the database.
 
@@ -70,8 +112,15 @@ class Settings(BaseSettings):
     """
 
     ALERT_BACKEND: str
+    ALERT_DEDUP_TTL: int = 60 * 10  # 10 minutes
+    ALERT_FLUSH_INTERVAL: float = 1
+    ALERT_QUEUE_SIZE: int = 1000
     API_V1_PREFIX: str = "/api/v1"
     API_V2_PREFIX: str = "/api/v2"
+    EVENT_BROKER: str = "memory"
+    EVENT_CHANNEL: str = "clochette_events"
+    EVENT_QUEUE_SIZE: int = 100
+    EVENT_KEEPALIVE: float = 15
     LOCALE: SupportedLocales
 
     ALLOWED_HOSTS: list[str]
@@ -84,6 +133,14 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 1  # 1 day
     SECRET_KEY: str
     ALGORITHM: str = "HS256"  # TODO: Change to ES256 in the future
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: int = 60
+    PASSWORD_WORKERS: int = 2
+
+    # Reports config
+
+    REPORT_TIMEZONE: str = "Europe/Paris"
+    REPORT_NIGHT_END_HOUR: int = Field(default=6, ge=0, lt=24)
 
     # Base account config
 
@@ -97,6 +154,14 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 60 * 30  # 30 minutes
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    SQLITE_PRAGMA_PROFILE: SqlitePragmaProfiles = "tuned"
+    SQLITE_FOREIGN_KEYS: bool = True
 
     @property
     @abstractmethod
@@ -229,6 +294,8 @@ class ConfigTest(Settings):
     POSTGRES_DB: str | None = "test_db"
     POSTGRES_USER: str | None = "test_user"
     POSTGRES_PASSWORD: str | None = "test_password"
+    # The unit tests create rows referencing rows which are mocked instead of being created
+    SQLITE_FOREIGN_KEYS: bool = False
 
     """Github config"""
     GITHUB_USER: str = "test_github_user"
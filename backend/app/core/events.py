@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, Literal, Sequence
+
+from humps import camelize
+from pydantic_core import from_json, to_json
+
+from app.core.config import settings
+from app.core.utils.backend.event_broker import EventBroker, event_broker
+from app.core.versions import table_versions
+
+logger = logging.getLogger("app.core.events")
+
+ChangeAction = Literal["created", "updated", "deleted"]
+
+
+@dataclass
+class ChangeEvent:
+    """
+    A record written by the API, with the columns the clients need to update their state without a request.
+    """
+
+    table: str
+    action: ChangeAction
+    id: int
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # The keys are the same as in the responses of the API
+        self.data = {camelize(key): value for key, value in self.data.items()}
+
+
+class EventBus:
+    """
+    Fan out of the change events to the event streams of the clients.
+
+    The events are published as JSON arrays through the broker, which hands them to the bus of every process.
+    Each subscriber has its own bounded queue of messages: when a subscriber is too slow and its queue is full,
+    its pending messages are replaced by a `None`, telling it to fetch the whole state again.
+    The tables of the received events are marked as changed in `table_versions`, so the catalogs written by another
+    process are not answered from a stale version, and the handlers of their table are called, see `add_handler`.
+    """
+
+    def __init__(self, broker: EventBroker, queue_size: int):
+        """
+        :param broker: The broker carrying the messages between the processes.
+        :param queue_size: The maximum number of messages waiting to be read by a subscriber.
+        """
+        self.broker = broker
+        self.broker.receiver = self._receive
+        self.queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[str | None]] = set()
+        self._handlers: dict[str, list[Callable[[int | None], None]]] = {}
+
+    def add_handler(self, table: str, handler: Callable[[int | None], None]) -> None:
+        """
+        Call a function for each change of a table received from any process, e.g. to drop a cached record.
+
+        :param table: The name of the table
+        :param handler: Called with the id of the changed record, or with None when some changes were lost.
+        """
+        self._handlers.setdefault(table, []).append(handler)
+
+    def _receive(self, message: str | None) -> None:
+        if message is None:
+            # The changes of the other processes may have been lost
+            table_versions.bump_all()
+            for handlers in self._handlers.values():
+                for handler in handlers:
+                    handler(None)
+        else:
+            events = from_json(message)
+            for table in {event["table"] for event in events}:
+                table_versions.bump(table)
+            for event in events:
+                for handler in self._handlers.get(event["table"], ()):
+                    handler(event["id"])
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.debug("Event subscriber lagging behind, asking it to resync")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _pack(self, events: Sequence[ChangeEvent]) -> Iterator[str]:
+        """
+        Serialize the events to JSON arrays no larger than the maximum message size of the broker.
+        """
+        max_size = self.broker.max_message_size
+        items: list[bytes] = []
+        size = 2
+        for event in events:
+            item = to_json(event)
+            if items and max_size is not None and size + len(item) + 1 > max_size:
+                yield "[" + ",".join(item.decode() for item in items) + "]"
+                items, size = [], 2
+            items.append(item)
+            size += len(item) + 1
+        if items:
+            yield "[" + ",".join(item.decode() for item in items) + "]"
+
+    async def publish(self, events: Sequence[ChangeEvent]) -> None:
+        """
+        Publish change events to the subscribers of every process.
+        The changes are already committed, so a failure is only logged: the clients resync on their next connection.
+
+        :param events: The events, sent in as few messages as possible.
+        """
+        try:
+            for message in self._pack(events):
+                await self.broker.publish(message)
+        except Exception as e:
+            logger.exception("Failed to publish %s change events: %s", len(events), e)
+
+    async def listen(self) -> None:
+        """
+        Make sure the messages of every process are received, e.g. after the broker lost its connection.
+        """
+        await self.broker.listen()
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str | None]]:
+        """
+        Subscribe to the change events while the context is active.
+
+        :return: The queue of the messages, JSON arrays of events or `None` when some messages were lost.
+        """
+        await self.broker.listen()
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def close(self) -> None:
+        """
+        Close the broker.
+        """
+        await self.broker.close()
+
+
+event_bus = EventBus(event_broker(), queue_size=settings.EVENT_QUEUE_SIZE)
@@ -4,7 +4,7 @@ from fastapi import status
 from fastapi.requests import Request
 from fastapi.responses import Response
 from starlette.background import BackgroundTask
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.translation import Translator
 from app.core.utils.backend.alert_backend import Alert
@@ -13,8 +13,52 @@ translator = Translator()
 
 logger = logging.getLogger("app.core.middleware")
 
+TRUNCATED_BODY_MARKER = b"[...]"
 
-class ExceptionMonitorMiddleware(BaseHTTPMiddleware):
+
+class BodyTee:
+    """
+    Bounded copy of a request body, filled as the body is streamed to the application.
+    Only the last `max_size` bytes are kept, like a ring buffer.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        :param max_size: The maximum number of bytes kept.
+        """
+        self.max_size = max_size
+        self.buffer = bytearray()
+        self.truncated = False
+        self.complete = False
+
+    def write(self, message: Message) -> None:
+        """
+        Copy the body of an `http.request` message.
+
+        :param message: The ASGI message received by the application.
+        """
+        if message["type"] != "http.request":
+            # The client disconnected, there will be no more body
+            self.complete = True
+            return
+
+        self.buffer += message.get("body", b"")
+        if len(self.buffer) > self.max_size:
+            del self.buffer[: len(self.buffer) - self.max_size]
+            self.truncated = True
+        if not message.get("more_body", False):
+            self.complete = True
+
+    def getvalue(self) -> bytes:
+        """
+        :return: The copied body, starting with a marker if its beginning was dropped.
+        """
+        if self.truncated:
+            return TRUNCATED_BODY_MARKER + bytes(self.buffer)
+        return bytes(self.buffer)
+
+
+class ExceptionMonitorMiddleware:
     """
     This middleware is used to monitor and handle exceptions that occur during
     the processing of an HTTP request. It allows an alert backend function to be
@@ -24,39 +68,66 @@ class ExceptionMonitorMiddleware(BaseHTTPMiddleware):
     The middleware also returns a response a status code of 500 (Internal
     Server Error) ans a default error message to the client, while running the alert
     backend function in the background as a `BackgroundTask`.
+
+    It is a pure ASGI middleware: the request body is not buffered, at most `max_body_size`
+    bytes of it are copied as the application reads it, to be sent along with the alert.
     """
 
-    def __init__(self, app, alert_backend: Alert):
+    def __init__(self, app: ASGIApp, alert_backend: Alert, max_body_size: int = 64 * 1024):
         """
         Initialize the middleware with the given FastAPI app and alert backend
         function.
 
         :param app: The FastAPI app to which the middleware is being added.
         :param alert_backend: The alert backend function to be called when an exception is raised.
+        :param max_body_size: The maximum number of bytes of the request body sent with an alert.
         """
-        super().__init__(app)
+        self.app = app
         self.alert_backend = alert_backend
+        self.max_body_size = max_body_size
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Dispatch the given request through the middleware chain.
+        Pass the given request through the middleware chain.
 
-        :param request: The request being dispatched.
-        :param call_next: The next middleware in the chain.
-        :return: The response from the next middleware in the chain,
-        or a default error response if an exception is raised.
+        :param scope: The ASGI connection scope.
+        :param receive: The ASGI receive channel.
+        :param send: The ASGI send channel.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        body = BodyTee(self.max_body_size)
+        response_started = False
+
+        async def receive_tee() -> Message:
+            message = await receive()
+            body.write(message)
+            return message
+
+        async def send_tracked(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            body: bytes = await request.body()
-            return await call_next(request)
+            await self.app(scope, receive_tee, send_tracked)
         # An unhanded exception was raised during the processing of the request
         except Exception as e:
+            request = Request(scope)
             logger.debug(
                 "Exception raised during processing of request %s %s: %s",
                 request.method,
                 request.url,
                 e,
             )
+            # The body may not have been read by the application before the exception,
+            # read what is left of it, up to the size limit
+            while not body.complete and len(body.buffer) < self.max_body_size:
+                body.write(await receive())
+
             # Create a background task to call the alert backend function with the exception and request details
             task = BackgroundTask(
                 self.alert_backend,
@@ -64,11 +135,17 @@ class ExceptionMonitorMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 url=request.url,
                 headers=request.headers,
-                body=body,
+                body=body.getvalue(),
             )
+            if response_started:
+                # Too late to replace the response, the server handles the exception
+                await task()
+                raise
+
             # Return a default error response with the background task
-            return Response(
+            response = Response(
                 content=translator.INTERNAL_SERVER_ERROR,
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 background=task,
             )
+            await response(scope, receive, send)
@@ -0,0 +1,150 @@
+from email.utils import format_datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Mapping, Sequence
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.core.events import event_bus
+from app.core.versions import table_versions
+
+# Number of rendered responses kept by the catalog cache
+CATALOG_CACHE_SIZE = 256
+
+
+@lru_cache
+def get_type_adapter(response_model: Any) -> TypeAdapter[Any]:
+    """
+    Get the type adapter of a response model, it is built once per response model.
+
+    :param response_model: The response model, e.g. `list[Barrel]`
+    :return: The type adapter
+    """
+    return TypeAdapter(response_model)
+
+
+def render(response_model: Any, content: Any) -> bytes:
+    """
+    Validate content against a response model, from the attributes of the ORM objects, and serialize it to JSON.
+
+    :param response_model: The response model, e.g. `list[Barrel]`
+    :param content: The content, ORM objects or instances of the response model
+    :return: The JSON bytes
+    """
+    adapter = get_type_adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check whether an `If-None-Match` header matches an entity tag, with the weak comparison it requires.
+
+    :param if_none_match: The value of the header, if any
+    :param etag: The entity tag of the current representation
+    :return: Whether the client already has the current representation
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ModelResponse(Response):
+    """
+    JSON response whose content is validated against a response model and serialized by pydantic.
+
+    FastAPI returns the responses returned by the endpoints as is: the content is validated once, from the
+    attributes of the ORM objects, and serialized straight to bytes, instead of being validated, dumped to Python
+    objects and then encoded by `json`. The endpoints keep their `response_model` for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        response_model: Any,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        """
+        :param response_model: The response model of the endpoint
+        :param content: The content of the response, ORM objects or instances of the response model
+        :param status_code: The status code of the response
+        :param headers: The headers of the response
+        """
+        self.response_model = response_model
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Any) -> bytes:
+        return render(self.response_model, content)
+
+
+class CatalogCache:
+    """
+    Conditional responses of the catalog endpoints, the catalogs change a few times a month and are read constantly.
+
+    The entity tag of a response is the version of the tables it is read from, see `TableVersions`. A request
+    whose `If-None-Match` matches it is answered with a 304, and the rendered bytes of the last responses are kept
+    by URL for the other requests: the database is only read once per version.
+    """
+
+    def __init__(self, size: int = CATALOG_CACHE_SIZE):
+        """
+        :param size: The number of rendered responses kept, the oldest one is dropped first
+        """
+        self.size = size
+        self._responses: dict[str, tuple[str, bytes]] = {}
+
+    def clear(self) -> None:
+        """
+        Drop the rendered responses, e.g. when the database is replaced.
+        """
+        self._responses.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        response_model: Any,
+        tables: Sequence[str],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """
+        Answer a request for a catalog.
+
+        :param request: The request
+        :param response_model: The response model of the endpoint
+        :param tables: The names of the tables the catalog is read from
+        :param load: Read the catalog from the database, only called if the response is not cached
+
+        :return: The response, with its `ETag` and `Last-Modified` headers
+        """
+        # The versions only follow the writes of the other processes while their change events are received
+        await event_bus.listen()
+        version, last_modified = table_versions.get(*tables)
+        etag = f'"{table_versions.epoch}-{version}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            # The clients revalidate the catalog each time they use it
+            "Cache-Control": "no-cache",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = f"{request.url.path}?{request.url.query}"
+        cached = self._responses.get(key)
+        if cached is not None and cached[0] == etag:
+            body = cached[1]
+        else:
+            # The version is read before the catalog, the cached bytes are at least as recent as their version
+            body = render(response_model, await load())
+            if key not in self._responses and len(self._responses) >= self.size:
+                del self._responses[next(iter(self._responses))]
+            self._responses[key] = (etag, body)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+catalog_cache = CatalogCache()
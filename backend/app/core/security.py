@@ -1,5 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import MutableMapping
+from functools import partial
+from typing import Any, Callable, MutableMapping, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -17,6 +20,25 @@ JWTPayloadMapping = MutableMapping[str, datetime | bool | str | list[str] | list
 # upgrade the hashes of deprecated schemes to the default one when verifying passwords.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt and zxcvbn take hundreds of milliseconds, they are run by a bounded pool of threads
+# so a burst of logins does not stall the other requests handled by the event loop.
+password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_WORKERS, thread_name_prefix="password")
+
+T = TypeVar("T")
+
+
+async def run_password_work(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU bound password function (hashing, verification, strength check) in the password pool.
+
+    :param func: The function to run.
+    :param args: The positional arguments of the function.
+    :param kwargs: The keyword arguments of the function.
+    :return: The result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, partial(func, *args, **kwargs))
+
 
 def verify_password(plain_password, hashed_password):
     """
@@ -29,6 +51,17 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify that the given plain password matches the given hashed password, out of the event loop.
+
+    :param plain_password: The plain password to be verified.
+    :param hashed_password: The hashed password to be compared against.
+    :return: True if the plain password matches the hashed password, False otherwise.
+    """
+    return await run_password_work(verify_password, plain_password, hashed_password)
+
+
 def is_hashed_password(password: str) -> bool:
     """
     Check if the given password is a hashed password in the bcrypt format.
@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 
 from app.core.config import SupportedLocales, settings
 
@@ -7,7 +9,12 @@ ElementNameMapper: dict[SupportedLocales, str] = {"en": "element", "fr": "élém
 
 @dataclass
 class Translator:
-    """Class to manage the translation of the messages."""
+    """Class to manage the translation of the messages.
+
+    The messages are rendered once per (locale, element) by `compile_catalog`, and set as plain
+    instance attributes, so reading a message is a simple attribute access returning a `str`.
+    The locale is the one of the settings when the translator is created.
+    """
 
     class TranslatedString:
         """Class to manage the translation of a single string."""
@@ -15,16 +22,22 @@ class Translator:
         def __init__(self, strings: dict[SupportedLocales, str]):
             # Check if locales are supported
             self._strings: dict[SupportedLocales, str] = strings
-            self._element: str | None = None
+
+        def render(self, locale: SupportedLocales, element: str | None = None) -> str:
+            """Return the string corresponding to the locale, for the given element."""
+            element = element if element is not None else ElementNameMapper[locale]
+            return self._strings[locale].format(element=element).replace("_", " ").capitalize()
 
         def __str__(self) -> str:
             """Return the string corresponding to the current locale."""
-            element = self._element if self._element is not None else ElementNameMapper[settings.LOCALE]
-            return self._strings[settings.LOCALE].format(element=element).replace("_", " ").capitalize()
+            return self.render(settings.LOCALE)
 
     def __init__(self, element: str | None = None):
         super().__init__()
         self._element = element
+        self._locale: SupportedLocales = settings.LOCALE
+        # The instance attributes shadow the `TranslatedString` class attributes
+        self.__dict__.update(compile_catalog(self._locale, element))
 
     # Define the messages here
     ELEMENT_NOT_FOUND: TranslatedString = TranslatedString(
@@ -128,10 +141,35 @@ class Translator:
         },
     )
 
-    def __getattribute__(self, __name: str) -> str:
-        """Get the translated string."""
-        attr = super().__getattribute__(__name)
-        if isinstance(attr, Translator.TranslatedString):
-            attr._element = self._element
-            return str(attr)
-        return attr
+    CONCURRENT_UPDATE: TranslatedString = TranslatedString(
+        {
+            "en": "{element} was modified in the meantime, please retry",
+            "fr": "{element} a été modifié entre-temps, veuillez réessayer",
+        },
+    )
+
+    INVALID_CURSOR: TranslatedString = TranslatedString(
+        {
+            "en": "Invalid pagination cursor",
+            "fr": "Curseur de pagination invalide",
+        },
+    )
+
+
+@lru_cache
+def compile_catalog(locale: SupportedLocales, element: str | None) -> MappingProxyType[str, str]:
+    """
+    Render all the messages of the `Translator` for a locale and an element.
+
+    :param locale: The locale of the messages
+    :param element: The name of the element the messages are about, None for the generic one
+
+    :return: The read-only mapping of the message names to the rendered messages
+    """
+    return MappingProxyType(
+        {
+            name: value.render(locale, element)
+            for name, value in vars(Translator).items()
+            if isinstance(value, Translator.TranslatedString)
+        },
+    )
@@ -47,3 +47,10 @@ class TransactionType(str, Enum):
 class Status(str, Enum):
     PENDING = "pending"
     VALIDATED = "validated"
+
+
+class RollupItemType(str, Enum):
+    GLASS = "glass"
+    BARREL = "barrel"
+    CONSUMABLE = "consumable"
+    NON_INVENTORIED = "non_inventoried"
@@ -1,12 +1,13 @@
-import json
 import logging
 from traceback import format_exception, print_exception
-from typing import Protocol
+from typing import Any, Awaitable, Protocol
 
-import requests
+import httpx
 from fastapi.datastructures import URL, Headers
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
+from app.core.utils.backend.alert_dispatcher import AlertDispatcher, AlertEvent
 
 logger = logging.getLogger("app.core.utils.backend.alert_backend")
 
@@ -23,7 +24,7 @@ class Alert(Protocol):  # pragma: no cover
         url: URL,
         headers: Headers,
         body: bytes,
-    ) -> None: ...
+    ) -> None | Awaitable[None]: ...
 
 
 def alert_backend() -> Alert:
@@ -31,7 +32,12 @@ def alert_backend() -> Alert:
         return alert_to_terminal
 
     if settings.ALERT_BACKEND == "github":
-        return alert_to_github_issues
+        return AlertDispatcher(
+            GithubIssueSink(),
+            dedup_ttl=settings.ALERT_DEDUP_TTL,
+            flush_interval=settings.ALERT_FLUSH_INTERVAL,
+            max_queue_size=settings.ALERT_QUEUE_SIZE,
+        )
 
     logger.warning("Invalid alert backend: %s", settings.ALERT_BACKEND)
     logger.warning("Falling back to terminal alert")
@@ -61,26 +67,26 @@ def alert_to_terminal(
     print_exception(type(exception), exception, exception.__traceback__, chain=False)
 
 
-def alert_to_github_issues(
-    exception: Exception,
-    method: str,
-    url: URL,
-    headers: Headers,
-    body: bytes,
-) -> None:
-    if isinstance(exception, TestException):  # pragma: no cover
-        return None
+def format_issue(event: AlertEvent, count: int) -> str:
+    """
+    Format an alert to the markdown body of a github issue.
 
-    issue_name = f"{exception.__class__.__name__}: {exception!s}"
-    # Format the exception and request to markdown
-    markdown = f"# {issue_name}\n\n"
-    markdown += f"{method} {url}\n\n"
+    :param event: The first occurrence of the alert.
+    :param count: The number of occurrences of the alert.
+    :return: The markdown body.
+    """
+    exception = event.exception
+    markdown = f"# {exception.__class__.__name__}: {exception!s}\n\n"
+    markdown += f"{event.method} {event.url}\n\n"
+    markdown += f"Occurrences: {count}\n\n"
     markdown += "## Request headers\n"
-    markdown += "\n".join(f"- **{key}**: {value}" for key, value in headers.items() if key != "Authorization")
+    markdown += "\n".join(
+        f"- **{key}**: {value}" for key, value in event.headers.items() if key.lower() != "authorization"
+    )
     markdown += "\n\n"
     markdown += "## Request body\n"
     markdown += "```\n"
-    markdown += body.decode()
+    markdown += event.body.decode(errors="replace")
     markdown += "\n```\n\n"
     markdown += "## Exception traceback\n"
     markdown += "```\n"
@@ -93,46 +99,85 @@ def alert_to_github_issues(
         ),
     )
     markdown += "\n```\n\n"
+    return markdown
 
-    # Create the issue on github
-
-    # Authenticate with github
-    session = requests.Session()
-    session.auth = (settings.GITHUB_USER, settings.GITHUB_TOKEN)
 
-    # Before creating it, check if there is already an issue with the same title
-    github_url = f"https://api.github.com/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues"
-
-    response = session.get(github_url)
-
-    if response.status_code != 200:
-        logger.error("Failed to get issues from github: %s", response.status_code)
-        logger.error(response.content)
-        logger.warning("Falling back to terminal alert")
-        return alert_to_terminal(exception, method, url, headers, body)
-
-    existing_issue = next(
-        (issue for issue in response.json() if issue["title"] == issue_name),
-        None,
-    )
-
-    if existing_issue:
-        logger.warning("Issue already exists on github: %s", existing_issue["html_url"])
-        return None
+class GithubServerError(Exception):
+    pass
 
-    payload = {
-        "title": issue_name,
-        "body": body.decode(),
-        "labels": [label for label in settings.ISSUE_LABELS.split(",") if label],
-    }
 
-    response = session.post(github_url, data=json.dumps(payload))
+class GithubIssueSink:
+    """
+    Alert sink creating github issues with an async HTTP client.
 
-    if response.status_code != 201:
-        logger.error("Failed to create issue on github: {response.status_code}")
-        logger.error(response.content)
-        logger.warning("Falling back to terminal alert")
-        return alert_to_terminal(exception, method, url, headers, body)
+    The titles of the open issues are fetched once and then kept up to date, an alert whose issue
+    is already open is added as a comment. The requests are retried on network and server errors,
+    the alert is logged to the terminal if they still fail.
+    """
 
-    logger.info("Issue created on github: %s", response.json()["html_url"])
-    return None
+    def __init__(
+        self,
+        api_url: str = "https://api.github.com",
+        max_attempts: int = 3,
+        retry_wait: float = 0.5,
+    ):
+        """
+        :param api_url: The url of the github API.
+        :param max_attempts: The maximum number of attempts of each request.
+        :param retry_wait: The number of seconds to wait before the first retry, doubled at each retry.
+        """
+        self.issues_url = f"{api_url}/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues"
+        self.max_attempts = max_attempts
+        self.retry_wait = retry_wait
+        # Title -> comments url of the open issues, None until fetched
+        self._open_issues: dict[str, str] | None = None
+
+    async def _request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request, retried on network and server errors.
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_exponential(multiplier=self.retry_wait),
+            retry=retry_if_exception_type((httpx.TransportError, GithubServerError)),
+            reraise=True,
+        ):
+            with attempt:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code >= 500:
+                    raise GithubServerError(f"{method} {url}: {response.status_code}")
+        return response
+
+    async def __call__(self, event: AlertEvent, count: int) -> None:
+        if isinstance(event.exception, TestException):  # pragma: no cover
+            return
+
+        title = f"{event.exception.__class__.__name__}: {event.exception!s}"
+        markdown = format_issue(event, count)
+        try:
+            async with httpx.AsyncClient(auth=(settings.GITHUB_USER, settings.GITHUB_TOKEN)) as client:
+                if self._open_issues is None:
+                    response = await self._request(client, "GET", self.issues_url, params={"state": "open"})
+                    response.raise_for_status()
+                    self._open_issues = {issue["title"]: issue["comments_url"] for issue in response.json()}
+
+                if title in self._open_issues:
+                    response = await self._request(client, "POST", self._open_issues[title], json={"body": markdown})
+                    response.raise_for_status()
+                    logger.warning("Issue already exists on github, comment added: %s", response.json()["html_url"])
+                    return
+
+                payload = {
+                    "title": title,
+                    "body": markdown,
+                    "labels": [label for label in settings.ISSUE_LABELS.split(",") if label],
+                }
+                response = await self._request(client, "POST", self.issues_url, json=payload)
+                response.raise_for_status()
+                issue = response.json()
+                self._open_issues[title] = issue["comments_url"]
+                logger.info("Issue created on github: %s", issue["html_url"])
+        except (httpx.HTTPError, GithubServerError) as e:
+            logger.error("Failed to send alert to github: %s", e)
+            logger.warning("Falling back to terminal alert")
+            alert_to_terminal(event.exception, event.method, event.url, event.headers, event.body)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from fastapi.datastructures import URL, Headers
+
+logger = logging.getLogger("app.core.utils.backend.alert_dispatcher")
+
+
+@dataclass
+class AlertEvent:
+    """An exception raised during the processing of a request, with the request details."""
+
+    exception: Exception
+    method: str
+    url: URL
+    headers: Headers
+    body: bytes
+    signature: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        # Two events with the same exception raised from the same place are the same alert
+        frames = traceback.extract_tb(self.exception.__traceback__)
+        location = f"{frames[-1].filename}:{frames[-1].lineno}" if frames else ""
+        self.signature = (type(self.exception).__qualname__, str(self.exception), location)
+
+
+class AlertSink(Protocol):  # pragma: no cover
+    async def __call__(self, event: AlertEvent, count: int) -> None: ...
+
+
+class AlertDispatcher:
+    """
+    Alert backend queuing the alerts in memory, and sending them to a sink from a single worker task.
+
+    The alerts received during `flush_interval` seconds are coalesced by signature, and each signature is
+    sent at most once every `dedup_ttl` seconds along with its number of occurrences, so an exception storm
+    (e.g. the database being down) results in a handful of alerts instead of hundreds of HTTP calls.
+    When the queue is full, the new alerts are dropped and only counted.
+    """
+
+    def __init__(
+        self,
+        sink: AlertSink,
+        *,
+        dedup_ttl: float,
+        flush_interval: float,
+        max_queue_size: int,
+    ):
+        """
+        :param sink: The sink to which the coalesced alerts are sent.
+        :param dedup_ttl: The minimum number of seconds between two alerts with the same signature.
+        :param flush_interval: The number of seconds during which the alerts are gathered before being sent.
+        :param max_queue_size: The maximum number of alerts waiting to be sent.
+        """
+        self.sink = sink
+        self.dedup_ttl = dedup_ttl
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+
+        self._queue: asyncio.Queue[AlertEvent] | None = None
+        self._worker: asyncio.Task | None = None
+        # Signature -> time until which the signature is not sent again
+        self._sent: dict[tuple[str, ...], float] = {}
+        # Signature -> number of occurrences not sent yet because of the deduplication
+        self._suppressed: dict[tuple[str, ...], int] = {}
+        self.dropped = 0
+
+    async def __call__(
+        self,
+        exception: Exception,
+        method: str,
+        url: URL,
+        headers: Headers,
+        body: bytes,
+    ) -> None:
+        """
+        Queue an alert, it returns right away.
+        """
+        if self._queue is None or self._worker is None or self._worker.done():
+            # The queue and the worker are bound to the running event loop, they are created on first use
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.create_task(self._run(self._queue))
+
+        try:
+            self._queue.put_nowait(AlertEvent(exception, method, url, headers, body))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Alert queue is full, %s alerts dropped", self.dropped)
+
+    async def _run(self, queue: asyncio.Queue[AlertEvent]) -> None:
+        """
+        Send the queued alerts until the worker is cancelled.
+        """
+        while True:
+            events = [await queue.get()]
+            # Let the identical alerts of a storm pile up before sending them
+            await asyncio.sleep(self.flush_interval)
+            while not queue.empty():
+                events.append(queue.get_nowait())
+
+            try:
+                await self._dispatch(events)
+            finally:
+                for _ in events:
+                    queue.task_done()
+
+    async def _dispatch(self, events: list[AlertEvent]) -> None:
+        """
+        Coalesce the events by signature, and send the ones which are not deduplicated.
+
+        :param events: The events to send.
+        """
+        coalesced: dict[tuple[str, ...], tuple[AlertEvent, int]] = {}
+        for event in events:
+            first, count = coalesced.get(event.signature, (event, 0))
+            coalesced[event.signature] = (first, count + 1)
+
+        now = time.monotonic()
+        self._sent = {signature: until for signature, until in self._sent.items() if until > now}
+        for signature, (event, count) in coalesced.items():
+            if signature in self._sent:
+                logger.debug("Alert %s deduplicated", signature)
+                self._suppressed[signature] = self._suppressed.get(signature, 0) + count
+                continue
+
+            self._sent[signature] = now + self.dedup_ttl
+            try:
+                await self.sink(event, count + self._suppressed.pop(signature, 0))
+            except Exception as e:
+                logger.exception("Failed to send alert %s: %s", signature, e)
+
+    async def join(self) -> None:
+        """
+        Wait until all the queued alerts have been sent.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """
+        Send the queued alerts and stop the worker.
+        """
+        if self._worker is None:
+            return
+
+        if not self._worker.done():
+            await self.join()
+            self._worker.cancel()
+        self._worker = None
+        self._queue = None
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from typing import Callable
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.utils.backend.event_broker")
+
+# Receives the messages published by any process, None meaning that messages may have been lost
+Receiver = Callable[[str | None], None]
+
+
+class EventBroker(ABC):
+    """
+    Transport of the change events between the processes serving the API.
+
+    A message published by a process is handed to the `receiver` of every process, including the publisher.
+    """
+
+    # The maximum size in bytes of a message, None if unbounded
+    max_message_size: int | None = None
+
+    def __init__(self):
+        self.receiver: Receiver = lambda _message: None
+
+    async def listen(self) -> None:  # noqa: B027
+        """
+        Make sure the messages published from now on are received.
+        """
+
+    @abstractmethod
+    async def publish(self, message: str) -> None:  # pragma: no cover
+        ...
+
+    async def close(self) -> None:  # noqa: B027
+        """
+        Stop receiving the messages.
+        """
+
+
+class InProcessEventBroker(EventBroker):
+    """
+    Broker for a single process: the published messages are received right away.
+    """
+
+    async def publish(self, message: str) -> None:
+        self.receiver(message)
+
+
+class PostgresEventBroker(EventBroker):
+    """
+    Broker for several processes sharing a PostgreSQL database, with LISTEN/NOTIFY on a channel.
+
+    Each process holds one connection outside of the pool, listening to the channel and sending the notifications.
+    It is opened on first use and opened again in the background when it is lost. The receiver is told that
+    messages may have been lost each time a connection is opened, as none are received before it listens.
+    """
+
+    # NOTIFY payloads must be shorter than 8000 bytes
+    max_message_size = 7999
+
+    def __init__(self, channel: str, reconnect_delay: float = 1.0):
+        """
+        :param channel: The channel of the notifications.
+        :param reconnect_delay: The delay in seconds between two attempts to open a lost connection again.
+        """
+        super().__init__()
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        # The connection runs one statement at a time, the lock is bound to the running event loop on first use
+        self._lock: asyncio.Lock | None = None
+
+    async def _get_connection(self) -> asyncpg.Connection:
+        """
+        Get the listening connection, opened if needed. The lock must be held.
+        """
+        if self._connection is None or self._connection.is_closed():
+            connection = await asyncpg.connect(
+                user=settings.POSTGRES_USER,
+                password=settings.POSTGRES_PASSWORD,
+                host=settings.POSTGRES_HOST,
+                port=settings.POSTGRES_PORT,
+                database=settings.POSTGRES_DB,
+            )
+            await connection.add_listener(self.channel, self._on_notification)
+            connection.add_termination_listener(self._on_termination)
+            self._connection = connection
+            logger.debug("Listening to the %s channel", self.channel)
+            # The messages sent before the connection listened are lost
+            self.receiver(None)
+        return self._connection
+
+    def _on_notification(self, _connection, _pid: int, _channel: str, payload: str) -> None:
+        self.receiver(payload)
+
+    def _on_termination(self, connection) -> None:
+        if connection is not self._connection:
+            return
+
+        logger.warning("Connection listening to the %s channel lost", self.channel)
+        self._connection = None
+        self.receiver(None)
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """
+        Open the connection again, without waiting for the next use.
+        """
+        while True:
+            try:
+                await self.listen()
+                return
+            except Exception:
+                logger.warning(
+                    "Failed to listen to the %s channel, retrying in %s s", self.channel, self.reconnect_delay
+                )
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def listen(self) -> None:
+        if self._connection is not None and not self._connection.is_closed():
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._get_connection()
+
+    async def publish(self, message: str) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            connection = await self._get_connection()
+            await connection.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def close(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reconnect_task
+            self._reconnect_task = None
+
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+        if not connection.is_closed():
+            await connection.remove_listener(self.channel, self._on_notification)
+            await connection.close()
+
+
+def event_broker() -> EventBroker:
+    if settings.EVENT_BROKER == "memory":
+        return InProcessEventBroker()
+
+    if settings.EVENT_BROKER == "postgres":
+        return PostgresEventBroker(settings.EVENT_CHANNEL)
+
+    logger.warning("Invalid event broker: %s", settings.EVENT_BROKER)
+    logger.warning("Falling back to in-process event broker")
+    return InProcessEventBroker()
@@ -1,4 +1,6 @@
+import json
 import logging
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from copy import deepcopy
 from datetime import datetime
 from enum import Enum
@@ -114,7 +116,7 @@ def to_query_parameters(
     return new_model
 
 
-def process_query_parameters(query_model: DefaultModel) -> dict[str, Any]:
+def process_query_parameters(query_model: DefaultModel, exclude: set[str] | None = None) -> dict[str, Any]:
     """
     Function that processes the query parameters.
     If comparison is True, there are multiple fields for comparison, like key__gt and key__lt.
@@ -125,9 +127,10 @@ def process_query_parameters(query_model: DefaultModel) -> dict[str, Any]:
     }
 
     :param query_model: The query parameters
+    :param exclude: The fields which are not filters, e.g. pagination fields
     :return: The processed query parameters
     """
-    query_parameters = query_model.model_dump(exclude_none=True, exclude_unset=True)
+    query_parameters = query_model.model_dump(exclude_none=True, exclude_unset=True, exclude=exclude)
     processed_query_parameters: dict[str, Any] = {}
     for key, value in query_parameters.items():
         if "__" in key:
@@ -151,6 +154,33 @@ def process_query_parameters(query_model: DefaultModel) -> dict[str, Any]:
     return processed_query_parameters
 
 
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the keyset values of the last record of a page into an opaque pagination cursor.
+
+    :param values: The values of the keyset columns, e.g. the datetime and the id of the record
+    :return: The cursor
+    """
+    return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    Decode a pagination cursor created by `encode_cursor`.
+    Values which are not JSON types (e.g. datetimes) are returned as strings.
+
+    :param cursor: The cursor
+    :return: The keyset values
+    :raises ValueError: If the cursor is malformed
+    """
+    # Decoding errors (base64, utf-8 and JSON) are all subclasses of ValueError
+    values = json.loads(urlsafe_b64decode(cursor.encode()))
+    if not isinstance(values, list):
+        msg = "Malformed cursor"
+        raise ValueError(msg)
+    return values
+
+
 def create_hierarchy_dict(enum: Type[Enum]) -> Dict[str, List[str]]:
     """
     Takes an Enum class and returns a dictionary mapping Enum values to lists of their ancestors in the Enum hierarchy.
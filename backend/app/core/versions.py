@@ -0,0 +1,56 @@
+import secrets
+from datetime import datetime, timezone
+
+
+class TableVersions:
+    """
+    In-process change versions of the tables, bumped whenever records are written by the `create`, `create_many`,
+    `update` and `delete` methods of the CRUD objects.
+
+    The versions are taken from a single counter, so the version of several tables (the highest one) changes
+    as soon as one of them changes. They start over when the process starts: the `epoch`, random for each process,
+    tells the versions of two processes apart. The writes of the other processes are tracked through their change
+    events, see `EventBus`, but the writes made without the CRUD objects (e.g. by the commands) are not: only the
+    catalogs, which are not written otherwise while the API runs, rely on them.
+    """
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self._counter = 0
+        # The version of the tables which did not change since the process started, or since `bump_all`
+        self._floor = (0, datetime.now(timezone.utc).replace(microsecond=0))
+        self._versions: dict[str, tuple[int, datetime]] = {}
+
+    def bump(self, table: str) -> int:
+        """
+        Mark a table as changed.
+
+        :param table: The name of the table
+        :return: The new version of the table
+        """
+        self._counter += 1
+        self._versions[table] = (self._counter, datetime.now(timezone.utc).replace(microsecond=0))
+        return self._counter
+
+    def bump_all(self) -> int:
+        """
+        Mark every table as changed, e.g. when the changes of the other processes may have been missed.
+
+        :return: The new version of the tables
+        """
+        self._counter += 1
+        self._floor = (self._counter, datetime.now(timezone.utc).replace(microsecond=0))
+        return self._counter
+
+    def get(self, *tables: str) -> tuple[int, datetime]:
+        """
+        Get the version of tables, and the last time one of them changed.
+        The tables which did not change since the process started are at version 0, changed when it started.
+
+        :param tables: The names of the tables
+        :return: The version, and the last modification datetime
+        """
+        return max([self._floor, *(self._versions.get(table, self._floor) for table in tables)])
+
+
+table_versions = TableVersions()
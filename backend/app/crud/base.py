@@ -1,13 +1,17 @@
-from datetime import datetime, timezone
-from typing import Any, Generic, Sequence, Tuple, Type, TypeVar
+from typing import Any, AsyncIterator, Generic, Sequence, Tuple, Type, TypeVar
 
+from sqlalchemy import func, insert, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, noload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.orm.strategy_options import _AbstractLoad
 from sqlalchemy.sql.expression import Select, select
 
 from app.core.decorator import handle_exceptions
+from app.core.events import ChangeAction, ChangeEvent, event_bus
 from app.core.translation import Translator
+from app.core.versions import table_versions
 from app.db.base_class import Base
 from app.db.databases.sqlite import SqliteDatabase
 from app.db.select_db import select_db
@@ -21,25 +25,80 @@ ModelT = TypeVar("ModelT", bound=Base)
 CreateSchemaT = TypeVar("CreateSchemaT", bound=DefaultModel)
 # Pydantic validation schema for updating the object
 UpdateSchemaT = TypeVar("UpdateSchemaT", bound=DefaultModel)
+# Any select statement, whatever the selected columns are
+SelectT = TypeVar("SelectT", bound=Select)
 
 
-def patch_timezone_sqlite(obj: ModelT) -> ModelT:
+def loader_profile(
+    *paths: InstrumentedAttribute[Any] | tuple[InstrumentedAttribute[Any], ...],
+    join: bool = True,
+) -> list[ORMOption]:
     """
-    Patch the timezone of a datetime object to UTC.
-    If the database is not SQLite, the object is returned unchanged.
+    Build the loader options of a query which loads only the given relationships.
+    Collections are loaded with a `SELECT ... IN`, many-to-one relationships with a `JOIN`,
+    and every relationship which is not part of the profile is not loaded at all.
 
-    :param obj: The object to patch
-    :return: The patched object
+    Example: `loader_profile(Glass.transaction, (Glass.barrel, Barrel.drink_item))`
+
+    :param paths: The relationships to load, a tuple being a path of nested relationships
+    :param join: If False, many-to-one relationships are loaded with a `SELECT ... IN` as well,
+        the `INSERT ... RETURNING` statements of `CRUDBase.create_many` can not be joined
+    :return: The loader options to give to `CRUDBase.read` or `CRUDBase.query`
     """
-    if not isinstance(select_db(), SqliteDatabase):
-        return obj
+    # Relationships of the root model which are not in the profile are not loaded
+    options: list[ORMOption] = [noload("*")]
+    loaded_paths: set[str] = set()
+
+    for path in paths:
+        relationships = path if isinstance(path, tuple) else (path,)
+        loader: _AbstractLoad | None = None
+        for depth, relationship in enumerate(relationships, start=1):
+            if relationship.property.uselist or not join:
+                loader = loader.selectinload(relationship) if loader else selectinload(relationship)
+            else:
+                loader = loader.joinedload(relationship) if loader else joinedload(relationship)
 
-    for attr in dir(obj):
-        if not attr.startswith("_"):
-            value = getattr(obj, attr)
-            if isinstance(value, datetime):
-                setattr(obj, attr, value.replace(tzinfo=timezone.utc))
-    return obj
+            path_name = ".".join(str(attr) for attr in relationships[:depth])
+            if path_name not in loaded_paths:
+                loaded_paths.add(path_name)
+                # Relationships of the loaded model which are not in the profile are not loaded either
+                options.append(loader.noload("*"))
+
+    return options
+
+
+def apply_filters(
+    query: SelectT,
+    model: Type[ModelT],
+    filters: dict[str, Any],
+) -> SelectT:
+    """
+    Apply filters to a query.
+
+    :param query: The query to apply the filters to
+    :param model: The model whose columns are filtered
+    :param filters: The filters, should be in the form of {column_name: value}
+    :return: The query with the filters applied
+    """
+    for column, value in filters.items():
+        if isinstance(
+            value,
+            dict,
+        ):  # Check whether the value of the filter is a dictionary
+            for (
+                operator,
+                operand,
+            ) in (
+                value.items()
+            ):  # Iterate over the items in the value dictionary, which should contain operator-operand pairs
+                # The operator variable is used to specify the operator to use in the filter
+                # (e.g. > and <), and the operand variable is used as the operand for
+                # the filter. For example, if the value dictionary contained the items {gt: 10},
+                # (the operator comes from the operator module) the filter applied would be column > 10.
+                query = query.where(operator(getattr(model, column), operand))
+        else:
+            query = query.where(getattr(model, column) == value)
+    return query
 
 
 def apply_distinct(
@@ -60,6 +119,30 @@ def apply_distinct(
     return query
 
 
+def apply_keyset(
+    query: Select[Tuple[ModelT]],
+    order_by: Sequence[InstrumentedAttribute[Any]],
+    after: Sequence[Any] | None,
+) -> Select[Tuple[ModelT]]:
+    """
+    Apply a keyset pagination to a query.
+    The records are ordered by the given columns, and only the records strictly after the given
+    values are returned. Contrary to an offset, the database can seek directly to the first record
+    of the page, whatever the page is. The last column must be unique (e.g. the id) for the pages
+    not to overlap.
+
+    :param query: The query to apply the keyset pagination to
+    :param order_by: The columns to order the records by
+    :param after: The values of the order_by columns of the last record of the previous page
+    :return: The query with the keyset pagination applied
+    """
+    if order_by:
+        query = query.order_by(*order_by)
+        if after is not None:
+            query = query.where(tuple_(*order_by) > tuple_(*after))
+    return query
+
+
 class CRUDBase(
     Generic[
         ModelT,
@@ -67,6 +150,9 @@ class CRUDBase(
         UpdateSchemaT,
     ],
 ):
+    # Columns sent to the event streams when a record is written, None if the records of the model are not streamed
+    event_fields: tuple[str, ...] | None = None
+
     def __init__(self, model: Type[ModelT]):
         """
         CRUD object with default methods to Create, Read, Update and Delete.
@@ -81,6 +167,7 @@ class CRUDBase(
         db: AsyncSession,
         id: Any,
         for_update: bool = False,
+        options: Sequence[ORMOption] = (),
     ) -> ModelT | None:
         """
         Get a record by id.
@@ -88,11 +175,11 @@ class CRUDBase(
         :param db: The database session
         :param id: The record id
         :param for_update: Whether to lock the record for update
+        :param options: The loader options, see `loader_profile`
 
         :return: The record
         """
-        obj = await db.get(self.model, id, with_for_update=for_update)
-        return patch_timezone_sqlite(obj) if obj else None
+        return await db.get(self.model, id, with_for_update=for_update, options=options)
 
     async def query(
         self,
@@ -100,6 +187,9 @@ class CRUDBase(
         distinct: InstrumentedAttribute[Any] | None = None,
         skip: int = 0,
         limit: int | None = 100,
+        options: Sequence[ORMOption] = (),
+        order_by: Sequence[InstrumentedAttribute[Any]] = (),
+        after: Sequence[Any] | None = None,
         **filters,
     ) -> Sequence[ModelT]:
         """
@@ -109,43 +199,116 @@ class CRUDBase(
         :param distinct: The distinct option, specify the column name
         :param skip: The number of records to skip
         :param limit: The number of records to return
+        :param options: The loader options, see `loader_profile`
+        :param order_by: The columns to order the records by, used as the keyset of the pagination
+        :param after: The values of the order_by columns of the last record of the previous page
         :param filters: The filters, should be in the form of {column_name: value}
 
         :return: The list of records
         """
 
-        # The function first creates a query object using the db.query method, and then
-        # iterates over the filters to apply them to the query using the query.filter method.
+        # The function first creates a query object using the select function, and then
+        # applies the filters to it using the apply_filters function.
         # The query.distinct method is used to apply the DISTINCT option if specified, and
-        # the query.offset and query.limit methods are used to apply the skip and
-        # limit parameters. Finally, the query.all method is used to execute the query and
-        # return the results as a list of records.
-
-        query = select(self.model)
-
-        for column, value in filters.items():
-            if isinstance(
-                value,
-                dict,
-            ):  # Check whether the value of the filter is a dictionary
-                for (
-                    operator,
-                    operand,
-                ) in (
-                    value.items()
-                ):  # Iterate over the items in the value dictionary, which should contain operator-operand pairs
-                    # The operator variable is used to specify the operator to use in the filter
-                    # (e.g. > and <), and the operand variable is used as the operand for
-                    # the filter. For example, if the value dictionary contained the items {gt: 10},
-                    # (the operator comes from the operator module) the filter applied would be column > 10.
-                    query = query.where(operator(getattr(self.model, column), operand))
-            else:
-                query = query.where(getattr(self.model, column) == value)
+        # the apply_keyset function is used to order the records and to seek after the
+        # previous page. The query.offset and query.limit methods are used to apply the skip and
+        # limit parameters. Finally, the query is executed and the results are returned
+        # as a list of records.
+
+        query = apply_filters(select(self.model).options(*options), self.model, filters)
 
         query = apply_distinct(query, distinct)
+        query = apply_keyset(query, order_by, after)
 
         objs = await db.execute(query.offset(skip).limit(limit))
-        return [patch_timezone_sqlite(obj) for obj in objs.scalars().all()]
+        return list(objs.scalars().all())
+
+    async def exists(self, db: AsyncSession, **filters) -> bool:
+        """
+        Check whether a record matches the filters.
+        No record is loaded: the database stops at the first matching row, which an index can find.
+
+        :param db: The database session
+        :param filters: The filters, should be in the form of {column_name: value}
+
+        :return: Whether a record matches the filters
+        """
+        query = apply_filters(select(self.model.id), self.model, filters)
+        return bool(await db.scalar(select(query.exists())))
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        options: Sequence[ORMOption] = (),
+        order_by: Sequence[InstrumentedAttribute[Any]] = (),
+        after: Sequence[Any] | None = None,
+        limit: int | None = None,
+        batch_size: int = 500,
+        **filters,
+    ) -> AsyncIterator[ModelT]:
+        """
+        Iterate over multiple records with filters, without loading them all in memory.
+        The records are read from a server-side cursor, by batches of `batch_size` rows.
+
+        :param db: The database session, it must stay open during the whole iteration
+        :param options: The loader options, see `loader_profile`
+        :param order_by: The columns to order the records by, used as the keyset of the pagination
+        :param after: The values of the order_by columns of the last record of the previous page
+        :param limit: The number of records to return
+        :param batch_size: The number of rows fetched from the cursor at once
+        :param filters: The filters, should be in the form of {column_name: value}
+
+        :return: An asynchronous iterator over the records
+        """
+        query = apply_filters(select(self.model).options(*options), self.model, filters)
+        query = apply_keyset(query, order_by, after).limit(limit)
+
+        objs = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+        async for obj in objs:
+            yield obj
+
+    async def query_grouped(
+        self,
+        db: AsyncSession,
+        group_by: InstrumentedAttribute[Any],
+        options: Sequence[ORMOption] = (),
+        **filters,
+    ) -> list[tuple[ModelT, int]]:
+        """
+        Get one representative record per group, along with the number of records in the group.
+        The representative record is the one with the lowest id, it is chosen in SQL so that
+        the whole aggregation is a single statement, on SQLite as well as on PostgreSQL.
+
+        :param db: The database session
+        :param group_by: The column to group the records by
+        :param options: The loader options, see `loader_profile`
+        :param filters: The filters, should be in the form of {column_name: value}
+
+        :return: The list of (record, count) tuples, ordered by record id
+        """
+        # The subquery computes, for each group, the id of its representative record and its size
+        groups = (
+            apply_filters(
+                select(
+                    func.min(self.model.id).label("id"),
+                    func.count(self.model.id).label("quantity"),
+                ),
+                self.model,
+                filters,
+            )
+            .group_by(group_by)
+            .subquery()
+        )
+        # The representative records are then fetched by joining on their ids
+        query = (
+            select(self.model, groups.c.quantity)
+            .join(groups, self.model.id == groups.c.id)
+            .options(*options)
+            .order_by(self.model.id)
+        )
+
+        rows = await db.execute(query)
+        return list(rows.tuples().all())
 
     @handle_exceptions(translator.INTEGRITY_ERROR, IntegrityError)
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaT) -> ModelT:
@@ -167,10 +330,42 @@ class CRUDBase(
         db.add(db_obj)
         # Commit the session to persist the model instance in the database
         await db.commit()
+        table_versions.bump(self.model.__tablename__)
         # Refresh the model instance to get the default values for the columns
         await db.refresh(db_obj)
+        await self.publish_changes("created", [db_obj])
         # Return the created model instance
-        return patch_timezone_sqlite(db_obj)
+        return db_obj
+
+    @handle_exceptions(translator.INTEGRITY_ERROR, IntegrityError)
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaT],
+        options: Sequence[ORMOption] = (),
+    ) -> list[ModelT]:
+        """
+        Create several records with a single INSERT statement, the created records are read back with RETURNING.
+
+        :param db: The database session
+        :param objs_in: The records data
+        :param options: The loader options of the created records, see `loader_profile`
+
+        :return: The created records, ordered by id
+        """
+        if not objs_in:
+            return []
+
+        # The rows are not sorted by parameter order, which would prevent batching the rows in a single statement
+        # with some databases, they are sorted by id instead
+        query = insert(self.model).returning(self.model).options(*options)
+        result = await db.scalars(query, [obj_in.model_dump() for obj_in in objs_in])
+        db_objs = sorted(result.all(), key=lambda db_obj: db_obj.id)
+        await db.commit()
+        table_versions.bump(self.model.__tablename__)
+        await self.publish_changes("created", db_objs)
+        return db_objs
 
     @handle_exceptions(translator.INTEGRITY_ERROR, IntegrityError)
     async def update(
@@ -211,8 +406,10 @@ class CRUDBase(
 
         db.add(db_obj)
         await db.commit()
+        table_versions.bump(self.model.__tablename__)
         await db.refresh(db_obj)
-        return patch_timezone_sqlite(db_obj)
+        await self.publish_changes("updated", [db_obj])
+        return db_obj
 
     @handle_exceptions(translator.INTEGRITY_ERROR, IntegrityError)
     async def delete(self, db: AsyncSession, *, id: int) -> ModelT | None:
@@ -227,4 +424,40 @@ class CRUDBase(
         obj = await db.get(self.model, id)
         await db.delete(obj)
         await db.commit()
+        table_versions.bump(self.model.__tablename__)
+        await self.publish_changes("deleted", [obj])
         return obj
+
+    def change_events(self, action: ChangeAction, db_objs: Sequence[ModelT]) -> list[ChangeEvent]:
+        """
+        Build the change events of records, if the records of the model are streamed.
+        The deleted records are described by their id only.
+
+        :param action: The change made to the records
+        :param db_objs: The changed records
+
+        :return: The change events, empty if the records are not streamed
+        """
+        if self.event_fields is None:
+            return []
+
+        fields = self.event_fields if action != "deleted" else ()
+        return [
+            ChangeEvent(
+                self.model.__tablename__,
+                action,
+                db_obj.id,
+                {field: getattr(db_obj, field) for field in fields},
+            )
+            for db_obj in db_objs
+        ]
+
+    async def publish_changes(self, action: ChangeAction, db_objs: Sequence[ModelT]) -> None:
+        """
+        Publish the committed changes of records to the event streams, see `change_events`.
+
+        :param action: The change made to the records
+        :param db_objs: The changed records
+        """
+        if events := self.change_events(action, db_objs):
+            await event_bus.publish(events)
@@ -1,9 +1,116 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.events import event_bus
 from app.crud.base import CRUDBase
 from app.models.account import Account
-from app.schemas.account import AccountCreate, AccountUpdate
+from app.schemas.account import AccountCreate, AccountPrincipal, AccountUpdate, OwnAccountUpdate
+
+logger = logging.getLogger("app.crud.crud_account")
+
+
+class CRUDAccount(CRUDBase[Account, AccountCreate, AccountUpdate | OwnAccountUpdate]):
+    # The events only tell the other processes to drop the principals of the account, no column is sent
+    event_fields = ()
+
+    def __init__(self, model: type[Account]):
+        """
+        CRUD object for the accounts, with an in-process cache of the authenticated principals.
+
+        The cache maps the verified tokens to a snapshot of their account and their scopes, so
+        authenticating a request is a lookup instead of a JWT decoding and a database read.
+        It is a bounded LRU, and each entry expires after `PRINCIPAL_CACHE_TTL` seconds or with its token.
+        The entries of an account are dropped as soon as it is updated or deleted, by this process or by another one
+        through the change events, see `EventBus.add_handler`.
+
+        :param model: The Account model class
+        """
+        super().__init__(model)
+        self._principals: OrderedDict[str, tuple[float, list[str], AccountPrincipal]] = OrderedDict()
+        event_bus.add_handler(model.__tablename__, self.invalidate)
+
+    def remember_principal(
+        self,
+        token: str,
+        *,
+        account: Account,
+        scopes: list[str],
+        expires_at: float | None = None,
+    ) -> AccountPrincipal:
+        """
+        Store the principal of a verified token in the cache.
+
+        :param token: The verified token
+        :param account: The account of the token, freshly read from the database
+        :param scopes: The scopes of the token
+        :param expires_at: The expiration timestamp of the token
+
+        :return: The snapshot of the account
+        """
+        principal = AccountPrincipal.model_validate(account).model_copy(update={"password": None})
+        deadline = time.time() + settings.PRINCIPAL_CACHE_TTL
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        self._principals[token] = (deadline, scopes, principal)
+        self._principals.move_to_end(token)
+        while len(self._principals) > settings.PRINCIPAL_CACHE_SIZE:
+            self._principals.popitem(last=False)
+        return principal
+
+    def get_principal(self, token: str) -> tuple[list[str], AccountPrincipal] | None:
+        """
+        Get the cached principal of a token.
+
+        :param token: The token
+
+        :return: The scopes of the token and the snapshot of its account, or None if it is not cached
+        """
+        entry = self._principals.get(token)
+        if entry is None:
+            return None
+
+        deadline, scopes, principal = entry
+        if deadline <= time.time():
+            del self._principals[token]
+            return None
+
+        self._principals.move_to_end(token)
+        return scopes, principal
+
+    def invalidate(self, id: int | None = None) -> None:
+        """
+        Drop the principals of an account from the cache, or the whole cache if no id is given.
+
+        :param id: The id of the account
+        """
+        if id is None:
+            self._principals.clear()
+            return
+
+        for token in [token for token, (_, _, principal) in self._principals.items() if principal.id == id]:
+            del self._principals[token]
 
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Account,
+        obj_in: AccountUpdate | OwnAccountUpdate | dict[str, Any],
+    ) -> Account:
+        account = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        self.invalidate(account.id)
+        return account
 
-class CRUDAccount(CRUDBase[Account, AccountCreate, AccountUpdate]): ...
+    async def delete(self, db: AsyncSession, *, id: int) -> Account | None:
+        account = await super().delete(db, id=id)
+        self.invalidate(id)
+        return account
 
 
 account = CRUDAccount(Account)
@@ -1,6 +1,8 @@
 import logging
+from typing import Sequence
 
 from fastapi import HTTPException, status
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.core.translation import Translator
 from app.core.types import Status, TradeType, TransactionType
@@ -19,39 +21,44 @@ logger = logging.getLogger("app.crud.crud_consumable")
 
 
 class CRUDConsumable(CRUDBase[Consumable, ConsumableCreate, ConsumableUpdate]):
+    event_fields = ("consumable_item_id", "solded")
+
     async def create_v2(
         self,
         db,
         *,
         obj_in: consumable_schemas_v2.ConsumableCreate,
     ) -> Consumable:
-        transaction = await crud_transaction.read(db, id=obj_in.transaction_id_purchase)
-        if not transaction:
-            logger.debug("Transaction %s not found", obj_in.transaction_id_purchase)
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=transaction_translator.ELEMENT_NOT_FOUND,
-            )
-        if transaction.status != Status.PENDING:
-            logger.debug("Transaction %s not pending", obj_in.transaction_id_purchase)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=transaction_translator.TRANSACTION_NOT_PENDING,
-            )
-        if transaction.trade != TradeType.PURCHASE:
-            logger.debug("Transaction %s not purchase", obj_in.transaction_id_purchase)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=transaction_translator.TRANSACTION_NOT_PURCHASE,
-            )
-        if transaction.type != TransactionType.COMMERCE:
-            logger.debug("Transaction %s not commerce", obj_in.transaction_id_purchase)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=transaction_translator.TRANSACTION_NOT_COMMERCE,
-            )
+        await crud_transaction.read_pending_commerce(db, id=obj_in.transaction_id_purchase, trade=TradeType.PURCHASE)
         return await super().create(db, obj_in=obj_in)
 
+    async def create_many_v2(
+        self,
+        db,
+        *,
+        objs_in: Sequence[consumable_schemas_v2.ConsumableCreateBulk],
+        options: Sequence[ORMOption] = (),
+    ) -> list[Consumable]:
+        """
+        Create the consumables of one or several purchases at once.
+
+        Each purchase transaction is checked once, and all the consumables are inserted with a single statement.
+
+        :param db: The database session
+        :param objs_in: The consumables to be created, each one `quantity` times
+        :param options: The loader options of the created consumables, see `loader_profile`
+
+        :return: The created consumables
+        """
+        for transaction_id in {obj_in.transaction_id_purchase for obj_in in objs_in}:
+            await crud_transaction.read_pending_commerce(db, id=transaction_id, trade=TradeType.PURCHASE)
+
+        return await super().create_many(
+            db,
+            objs_in=[obj_in for obj_in in objs_in for _ in range(obj_in.quantity)],
+            options=options,
+        )
+
     async def update_v2(
         self,
         db,
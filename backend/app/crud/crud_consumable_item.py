@@ -5,7 +5,9 @@ from app.schemas.consumable_item import ConsumableItemCreate, ConsumableItemUpda
 
 class CRUDConsumableItem(
     CRUDBase[ConsumableItem, ConsumableItemCreate, ConsumableItemUpdate],
-): ...
+):
+    # The clients fetch the catalog again, the events only tell the other processes it changed
+    event_fields = ()
 
 
 consumable_item = CRUDConsumableItem(ConsumableItem)
@@ -3,7 +3,9 @@ from app.models.drink_item import DrinkItem
 from app.schemas.drink_item import DrinkItemCreate, DrinkItemUpdate
 
 
-class CRUDDrinkItem(CRUDBase[DrinkItem, DrinkItemCreate, DrinkItemUpdate]): ...
+class CRUDDrinkItem(CRUDBase[DrinkItem, DrinkItemCreate, DrinkItemUpdate]):
+    # The clients fetch the catalog again, the events only tell the other processes it changed
+    event_fields = ()
 
 
 drink_item = CRUDDrinkItem(DrinkItem)
@@ -8,7 +8,9 @@ from app.schemas.v2.non_inventoried_item import (
 
 class CRUDNonInventoriedItem(
     CRUDBase[NonInventoriedItem, NonInventoriedItemCreate, NonInventoriedItemUpdate],
-): ...
+):
+    # The clients fetch the catalog again, the events only tell the other processes it changed
+    event_fields = ()
 
 
 non_inventoried_item = CRUDNonInventoriedItem(NonInventoriedItem)
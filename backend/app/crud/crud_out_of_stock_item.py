@@ -5,7 +5,9 @@ from app.schemas.out_of_stock_item import OutOfStockItemCreate, OutOfStockItemUp
 
 class CRUDOutOfStockItem(
     CRUDBase[OutOfStockItem, OutOfStockItemCreate, OutOfStockItemUpdate],
-): ...
+):
+    # The clients fetch the catalog again, the events only tell the other processes it changed
+    event_fields = ()
 
 
 out_of_stock_item = CRUDOutOfStockItem(OutOfStockItem)
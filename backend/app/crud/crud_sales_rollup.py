@@ -0,0 +1,407 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, NamedTuple, Sequence
+
+from sqlalchemy import CompoundSelect, Select, case, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.core.types import PaymentMethod, RollupItemType, Status, TradeType, TransactionType
+from app.crud.base import CRUDBase
+from app.db.databases.sqlite import SqliteDatabase
+from app.db.select_db import select_db
+from app.models.barrel import Barrel
+from app.models.consumable import Consumable
+from app.models.consumable_item import ConsumableItem
+from app.models.drink_item import DrinkItem
+from app.models.glass import Glass
+from app.models.non_inventoried import NonInventoried
+from app.models.non_inventoried_item import NonInventoriedItem
+from app.models.sales_rollup import SalesRollup
+from app.models.transaction import Transaction
+from app.schemas.base import DefaultModel
+from app.schemas.v2.sales_report import NightReport, TopSeller
+
+logger = logging.getLogger("app.crud.crud_sales_rollup")
+
+# Number of transactions whose items are aggregated at once when the rollup is rebuilt
+REBUILD_BATCH_SIZE = 1000
+
+# The columns identifying a row of the rollup, and the columns summed in it
+KEY_COLUMNS = ("day", "trade", "payment_method", "item_type", "item_id")
+TOTAL_COLUMNS = ("quantity", "revenue", "cost", "lydia_fees")
+
+# The names of the items, by item type
+ITEM_NAMES: dict[RollupItemType, type[DrinkItem] | type[ConsumableItem] | type[NonInventoriedItem]] = {
+    RollupItemType.GLASS: DrinkItem,
+    RollupItemType.BARREL: DrinkItem,
+    RollupItemType.CONSUMABLE: ConsumableItem,
+    RollupItemType.NON_INVENTORIED: NonInventoriedItem,
+}
+
+RollupKey = tuple[date, TradeType, PaymentMethod, RollupItemType, int]
+
+
+class RolledUpTransaction(NamedTuple):
+    """
+    The columns of a validated commerce transaction the rollup needs.
+    The amount is the one added to the treasury, the Lydia fees are deduced from it.
+    """
+
+    id: int
+    datetime: datetime
+    payment_method: PaymentMethod
+    trade: TradeType
+    amount: float
+
+
+@dataclass
+class RollupTotals:
+    quantity: int = 0
+    revenue: float = 0
+    cost: float = 0
+    lydia_fees: float = 0
+
+
+def get_night(value: datetime) -> date:
+    """
+    Get the night a datetime belongs to: the date, in the timezone of the bar, the night started.
+    The sales made before `REPORT_NIGHT_END_HOUR` belong to the previous night.
+
+    :param value: The datetime, naive datetimes are considered to be UTC
+    :return: The date of the night
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    local = value.astimezone(ZoneInfo(settings.REPORT_TIMEZONE))
+    return (local - timedelta(hours=settings.REPORT_NIGHT_END_HOUR)).date()
+
+
+def build_contributions_query(transaction_ids: Sequence[int]) -> CompoundSelect:
+    """
+    Build the query aggregating the items of transactions, per transaction and per item.
+    The glasses and the barrels are counted per drink item, the consumables per consumable item
+    and the non inventoried items per non inventoried item.
+
+    :param transaction_ids: The ids of the transactions
+    :return: The query, its rows are (transaction_id, item_type, item_id, quantity, revenue, cost)
+    """
+
+    def contribution(
+        item_type: RollupItemType,
+        transaction_id: Any,
+        item_id: Any,
+        revenue: Any = None,
+        cost: Any = None,
+    ) -> Select:
+        return (
+            select(
+                transaction_id.label("transaction_id"),
+                literal(item_type.value).label("item_type"),
+                item_id.label("item_id"),
+                func.count().label("quantity"),
+                (func.coalesce(func.sum(revenue), 0) if revenue is not None else literal(0.0)).label("revenue"),
+                (func.coalesce(func.sum(cost), 0) if cost is not None else literal(0.0)).label("cost"),
+            )
+            .where(transaction_id.in_(transaction_ids))
+            .group_by(transaction_id, item_id)
+        )
+
+    glasses = contribution(
+        RollupItemType.GLASS,
+        Glass.transaction_id,
+        Barrel.drink_item_id,
+        revenue=Glass.transaction_sell_price,
+    ).join_from(Glass, Barrel, Glass.barrel_id == Barrel.id)
+    queries = [
+        glasses,
+        contribution(
+            RollupItemType.BARREL, Barrel.transaction_id_sale, Barrel.drink_item_id, revenue=Barrel.barrel_sell_price
+        ),
+        contribution(
+            RollupItemType.BARREL, Barrel.transaction_id_purchase, Barrel.drink_item_id, cost=Barrel.buy_price
+        ),
+        contribution(
+            RollupItemType.CONSUMABLE,
+            Consumable.transaction_id_sale,
+            Consumable.consumable_item_id,
+            revenue=Consumable.sell_price,
+        ),
+        contribution(
+            RollupItemType.CONSUMABLE,
+            Consumable.transaction_id_purchase,
+            Consumable.consumable_item_id,
+            cost=Consumable.buy_price,
+        ),
+        contribution(
+            RollupItemType.NON_INVENTORIED,
+            NonInventoried.transaction_id,
+            NonInventoried.non_inventoried_item_id,
+            revenue=NonInventoried.sell_price,
+            cost=NonInventoried.buy_price,
+        ),
+    ]
+    return union_all(*queries)
+
+
+class CRUDSalesRollup(CRUDBase[SalesRollup, DefaultModel, DefaultModel]):
+    """
+    CRUD object for the sales rollup, the totals of the commerce transactions per night, item and payment method.
+
+    The rows are updated along with the transactions they come from: `apply` is called when a transaction
+    is validated and `revert` when a validated transaction is deleted, within the database transaction of
+    the caller. `rebuild` computes the whole rollup again from the transactions.
+    """
+
+    async def compute(
+        self,
+        db: AsyncSession,
+        transactions: Sequence[RolledUpTransaction],
+        totals: dict[RollupKey, RollupTotals] | None = None,
+        sign: int = 1,
+    ) -> dict[RollupKey, RollupTotals]:
+        """
+        Compute the contributions of transactions to the rollup, their items are aggregated by the database.
+        The Lydia fees of a sale are shared between its items, in proportion of their prices.
+
+        :param db: The database session
+        :param transactions: The transactions
+        :param totals: The totals to add the contributions to, new totals if not given
+        :param sign: 1 to add the transactions, -1 to remove them
+
+        :return: The totals, by rollup key
+        """
+        totals = {} if totals is None else totals
+        if not transactions:
+            return totals
+
+        by_id = {transaction.id: transaction for transaction in transactions}
+        items_by_transaction: dict[int, list[Any]] = {}
+        for row in await db.execute(build_contributions_query(list(by_id))):
+            items_by_transaction.setdefault(row.transaction_id, []).append(row)
+
+        for transaction_id, items in items_by_transaction.items():
+            transaction = by_id[transaction_id]
+            night = get_night(transaction.datetime)
+
+            fees_rate = 0.0
+            price_sum = sum(item.revenue for item in items)
+            if transaction.payment_method == PaymentMethod.LYDIA and transaction.trade == TradeType.SALE and price_sum:
+                fees_rate = (price_sum - transaction.amount) / price_sum
+
+            for item in items:
+                key = (
+                    night,
+                    transaction.trade,
+                    transaction.payment_method,
+                    RollupItemType(item.item_type),
+                    item.item_id,
+                )
+                total = totals.setdefault(key, RollupTotals())
+                total.quantity += sign * item.quantity
+                total.revenue += sign * item.revenue
+                total.cost += sign * item.cost
+                total.lydia_fees += sign * item.revenue * fees_rate
+        return totals
+
+    async def upsert(self, db: AsyncSession, totals: dict[RollupKey, RollupTotals]) -> None:
+        """
+        Add totals to the rollup in a single statement, the rows are created if needed.
+        The sums are computed by the database, so concurrent updates can not overwrite each other.
+        The update is not committed, it is part of the database transaction of the caller.
+
+        :param db: The database session
+        :param totals: The totals to add, by rollup key
+        """
+        if not totals:
+            return
+
+        dialect_insert = sqlite.insert if isinstance(select_db(), SqliteDatabase) else postgresql.insert
+        query = dialect_insert(self.model)
+        query = query.on_conflict_do_update(
+            index_elements=KEY_COLUMNS,
+            set_={column: getattr(self.model, column) + getattr(query.excluded, column) for column in TOTAL_COLUMNS},
+        )
+        await db.execute(
+            query,
+            [{**dict(zip(KEY_COLUMNS, key)), **vars(total)} for key, total in totals.items()],
+        )
+
+    async def apply(self, db: AsyncSession, transactions: Sequence[RolledUpTransaction]) -> None:
+        """
+        Add validated transactions to the rollup, along with their items.
+        The update is not committed, it is part of the database transaction of the caller.
+
+        :param db: The database session
+        :param transactions: The transactions, their items must be in the database
+        """
+        await self.upsert(db, await self.compute(db, transactions))
+
+    async def revert(self, db: AsyncSession, transactions: Sequence[RolledUpTransaction]) -> None:
+        """
+        Remove validated transactions from the rollup, before their items are deleted.
+        The rows left empty are deleted. The update is not committed, it is part of the database transaction
+        of the caller.
+
+        :param db: The database session
+        :param transactions: The transactions, their items must still be in the database
+        """
+        totals = await self.compute(db, transactions, sign=-1)
+        await self.upsert(db, totals)
+        await db.execute(
+            delete(self.model).where(
+                self.model.day.in_({key[0] for key in totals}),
+                self.model.quantity == 0,
+            ),
+        )
+
+    async def rebuild(self, db: AsyncSession, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+        """
+        Compute the whole rollup again from the validated commerce transactions, e.g. to backfill it.
+
+        :param db: The database session
+        :param batch_size: The number of transactions whose items are aggregated at once
+
+        :return: The number of rows of the rollup
+        """
+        await db.execute(delete(self.model))
+
+        rows = await db.execute(
+            select(
+                Transaction.id,
+                Transaction.datetime,
+                Transaction.payment_method,
+                Transaction.trade,
+                Transaction.amount,
+            )
+            .where(Transaction.status == Status.VALIDATED, Transaction.type == TransactionType.COMMERCE)
+            .order_by(Transaction.id),
+        )
+        transactions = [RolledUpTransaction(*row) for row in rows]
+        logger.debug("Rebuilding the rollup from %s transactions", len(transactions))
+
+        totals: dict[RollupKey, RollupTotals] = {}
+        for start in range(0, len(transactions), batch_size):
+            await self.compute(db, transactions[start : start + batch_size], totals)
+
+        # The rollup is empty, the rows are inserted without conflict handling
+        values = [{**dict(zip(KEY_COLUMNS, key)), **vars(total)} for key, total in totals.items()]
+        for start in range(0, len(values), batch_size):
+            await db.execute(insert(self.model), values[start : start + batch_size])
+        await db.commit()
+        return len(values)
+
+    async def read_nights(
+        self, db: AsyncSession, start: date | None = None, end: date | None = None
+    ) -> list[NightReport]:
+        """
+        Get the totals of each night, the nights without transactions are left out.
+
+        :param db: The database session
+        :param start: If specified, the first night
+        :param end: If specified, the last night
+
+        :return: The totals of each night, ordered by night
+        """
+        query = (
+            select(
+                self.model.day,
+                func.sum(case((self.model.trade == TradeType.SALE, self.model.quantity), else_=0)).label("quantity"),
+                func.sum(self.model.revenue).label("revenue"),
+                func.sum(self.model.cost).label("cost"),
+                func.sum(self.model.lydia_fees).label("lydia_fees"),
+            )
+            .group_by(self.model.day)
+            .order_by(self.model.day)
+        )
+        query = self.apply_period(query, start, end)
+
+        return [
+            NightReport(
+                day=row.day,
+                quantity=row.quantity,
+                # Cents are two decimals max
+                revenue=round(row.revenue, 2),
+                cost=round(row.cost, 2),
+                lydia_fees=round(row.lydia_fees, 2),
+            )
+            for row in await db.execute(query)
+        ]
+
+    async def read_top_sellers(
+        self,
+        db: AsyncSession,
+        start: date | None = None,
+        end: date | None = None,
+        item_type: RollupItemType | None = None,
+        by_quantity: bool = False,
+        limit: int = 10,
+    ) -> list[TopSeller]:
+        """
+        Get the items which sold the most over a period.
+
+        :param db: The database session
+        :param start: If specified, the first night of the period
+        :param end: If specified, the last night of the period
+        :param item_type: If specified, only the items of this type are ranked
+        :param by_quantity: Whether the items are ranked by quantity sold instead of revenue
+        :param limit: The number of items to return
+
+        :return: The items, the best seller first
+        """
+        quantity = func.sum(self.model.quantity).label("quantity")
+        revenue = func.sum(self.model.revenue).label("revenue")
+        query = (
+            select(self.model.item_type, self.model.item_id, quantity, revenue)
+            .where(self.model.trade == TradeType.SALE)
+            .group_by(self.model.item_type, self.model.item_id)
+            .order_by(
+                quantity.desc() if by_quantity else revenue.desc(),
+                self.model.item_type,
+                self.model.item_id,
+            )
+            .limit(limit)
+        )
+        if item_type is not None:
+            query = query.where(self.model.item_type == item_type)
+        rows = (await db.execute(self.apply_period(query, start, end))).all()
+
+        # The names are read from the items tables, one query per table
+        names: dict[tuple[RollupItemType, int], str] = {}
+        for type_, model in ITEM_NAMES.items():
+            ids = {row.item_id for row in rows if row.item_type == type_}
+            if ids:
+                for id, name in await db.execute(select(model.id, model.name).where(model.id.in_(ids))):
+                    names[type_, id] = name
+
+        return [
+            TopSeller(
+                item_type=row.item_type,
+                item_id=row.item_id,
+                name=names.get((row.item_type, row.item_id), "N/A"),
+                quantity=row.quantity,
+                revenue=round(row.revenue, 2),
+            )
+            for row in rows
+        ]
+
+    def apply_period(self, query: Select, start: date | None, end: date | None) -> Select:
+        """
+        Restrict a query on the rollup to the nights of a period.
+
+        :param query: The query
+        :param start: If specified, the first night
+        :param end: If specified, the last night
+        :return: The restricted query
+        """
+        if start is not None:
+            query = query.where(self.model.day >= start)
+        if end is not None:
+            query = query.where(self.model.day <= end)
+        return query
+
+
+sales_rollup = CRUDSalesRollup(SalesRollup)
@@ -1,14 +1,30 @@
 import logging
+from typing import Any, Sequence
 
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, with_expression
+from sqlalchemy.orm.interfaces import ORMOption
 
+from app.core.events import ChangeEvent, event_bus
 from app.core.translation import Translator
-from app.core.types import PaymentMethod, TradeType
+from app.core.types import PaymentMethod, Status, TradeType, TransactionType
 from app.crud.base import CRUDBase
+from app.crud.crud_sales_rollup import RolledUpTransaction
+from app.crud.crud_sales_rollup import sales_rollup as crud_sales_rollup
 from app.crud.crud_treasury import treasury as crud_treasury
+from app.models.barrel import Barrel
+from app.models.consumable import Consumable
+from app.models.glass import Glass
+from app.models.non_inventoried import NonInventoried
+from app.models.non_inventoried_item import NonInventoriedItem
 from app.models.transaction import Transaction
-from app.schemas.treasury import InternalTreasuryUpdate
+from app.models.treasury import Treasury
 from app.schemas.v2.transaction import (
+    TransactionCartCreate,
+    TransactionCommerceCreate,
     TransactionCreate,
     TransactionTreasuryCreate,
     TransactionUpdate,
@@ -17,9 +33,45 @@ from app.schemas.v2.transaction import (
 logger = logging.getLogger("app.crud.transaction")
 
 translator = Translator()
+transaction_translator = Translator(element="transaction")
+barrel_translator = Translator(element="barrel")
+consumable_translator = Translator(element="consumable")
+non_inventoried_item_translator = Translator(element="non_inventoried_item")
+
+
+def sum_items(price: InstrumentedAttribute[Any], transaction_id: InstrumentedAttribute[Any]) -> ColumnElement[float]:
+    """
+    Build a subquery summing the prices of the items of a transaction, correlated with the enclosing query.
+
+    :param price: The price column of the items
+    :param transaction_id: The column of the items referencing the transaction
+    :return: The sum of the prices, 0 if the transaction has no item
+    """
+    return select(func.coalesce(func.sum(price), 0)).where(transaction_id == Transaction.id).scalar_subquery()
+
+
+# Sum of the prices of the items of a transaction, computed by the database from the items tables.
+# The prices of the items which are not set are not taken into account.
+price_sum_expression: ColumnElement[float] = case(
+    (
+        Transaction.trade == TradeType.PURCHASE,
+        sum_items(Barrel.buy_price, Barrel.transaction_id_purchase)
+        + sum_items(Consumable.buy_price, Consumable.transaction_id_purchase)
+        + sum_items(NonInventoried.buy_price, NonInventoried.transaction_id),
+    ),
+    else_=sum_items(Glass.transaction_sell_price, Glass.transaction_id)
+    + sum_items(Barrel.barrel_sell_price, Barrel.transaction_id_sale)
+    + sum_items(Consumable.sell_price, Consumable.transaction_id_sale)
+    + sum_items(NonInventoried.sell_price, NonInventoried.transaction_id),
+)
+
+# Loader option loading `Transaction.price_sum` along with the transactions
+with_price_sum = with_expression(Transaction.price_sum, price_sum_expression)
 
 
 class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
+    event_fields = ("datetime", "payment_method", "trade", "type", "status", "amount")
+
     async def create_v2(
         self,
         db: AsyncSession,
@@ -34,10 +86,92 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
 
         :return: The created transaction
         """
-        treasury_id = (await crud_treasury.get_last_treasury(db)).id
+        treasury_id = (await crud_treasury.get_cached_treasury(db)).id
         obj_in.treasury_id = treasury_id
         return await super().create(db, obj_in=obj_in)
 
+    async def create_pending(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: TransactionCommerceCreate,
+    ) -> Transaction:
+        """
+        Create a pending commerce transaction, there can be at most one at a time.
+
+        The `ix_transaction_pending` unique index enforces it, so two tills creating a transaction at the same time
+        cannot both succeed. The existence check before the insert only avoids a failed insert in the common case.
+
+        :param db: The database session
+        :param obj_in: The data for the transaction to be created
+
+        :return: The created transaction
+        """
+        if await self.exists(db, status=Status.PENDING):
+            logger.debug("A transaction is already pending")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=transaction_translator.ALREADY_PENDING_TRANSACTION,
+            )
+
+        obj_in.treasury_id = (await crud_treasury.get_cached_treasury(db)).id
+        db_obj = self.model(**obj_in.model_dump())
+        db.add(db_obj)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            # Another transaction was created since the existence check
+            await db.rollback()
+            logger.debug("A transaction was created concurrently: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=transaction_translator.ALREADY_PENDING_TRANSACTION,
+            ) from e
+        await db.refresh(db_obj)
+        await self.publish_changes("created", [db_obj])
+        return db_obj
+
+    async def read_pending_commerce(self, db: AsyncSession, *, id: int, trade: TradeType) -> Transaction:
+        """
+        Get a transaction items can be added to: a pending commerce transaction of the given trade.
+
+        :param db: The database session
+        :param id: The transaction id
+        :param trade: The expected trade of the transaction
+
+        :return: The transaction
+        """
+        transaction = await self.read(db, id=id)
+        if not transaction:
+            logger.debug("Transaction %s not found", id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=transaction_translator.ELEMENT_NOT_FOUND,
+            )
+        if transaction.status != Status.PENDING:
+            logger.debug("Transaction %s not pending", id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=transaction_translator.TRANSACTION_NOT_PENDING,
+            )
+        if transaction.trade != trade:
+            logger.debug("Transaction %s not %s", id, trade.value)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    transaction_translator.TRANSACTION_NOT_SALE
+                    if trade == TradeType.SALE
+                    else transaction_translator.TRANSACTION_NOT_PURCHASE
+                ),
+            )
+        if transaction.type != TransactionType.COMMERCE:
+            logger.debug("Transaction %s not commerce", id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=transaction_translator.TRANSACTION_NOT_COMMERCE,
+            )
+        return transaction
+
     async def create_treasury(
         self,
         db: AsyncSession,
@@ -59,22 +193,28 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
         amount: float,
         sale: bool,
         payment_method: PaymentMethod,
-    ) -> tuple[InternalTreasuryUpdate, float]:
+    ) -> tuple[Treasury, float]:
         """
         Update the treasury when a transaction is validated.
+        The update is committed along with the transaction.
         """
-
-        treasury = await crud_treasury.get_last_treasury(db)
-        # Pre-authorize the transaction
-        tresury_update = await crud_treasury.pre_authorize_transaction(
-            treasury=treasury,
+        return await crud_treasury.apply_transaction(
+            db,
             amount=amount,
             sale=sale,
             payment_method=payment_method,
         )
-        # Update the treasury
-        await crud_treasury.update(db, db_obj=treasury, obj_in=tresury_update[0])
-        return tresury_update
+
+    async def get_price_sum(self, db: AsyncSession, *, id: int) -> float:
+        """
+        Get the sum of the prices of the items of a transaction, without loading the items.
+
+        :param db: The database session
+        :param id: The transaction id
+
+        :return: The sum of the prices
+        """
+        return await db.scalar(select(price_sum_expression).where(self.model.id == id))  # type: ignore[return-value]
 
     async def validate(
         self,
@@ -94,7 +234,7 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
         """
         treasury_update = await self.update_treasury(
             db,
-            amount=db_obj.price_sum,
+            amount=await self.get_price_sum(db, id=db_obj.id),
             sale=db_obj.trade == TradeType.SALE,
             payment_method=db_obj.payment_method,
         )
@@ -102,22 +242,223 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
         # Update the transaction
         obj_in.amount = treasury_update[1]
         logger.debug("Price sum: %s", obj_in.amount)
+
+        # The rollup is committed along with the transaction
+        await crud_sales_rollup.apply(
+            db,
+            [RolledUpTransaction(db_obj.id, db_obj.datetime, db_obj.payment_method, db_obj.trade, obj_in.amount)],
+        )
         return await super().update(db, db_obj=db_obj, obj_in=obj_in)
 
-    async def delete(self, db: AsyncSession, *, id: int) -> Transaction | None:
-        transaction_db = await super().delete(db, id=id)
+    async def create_cart(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: TransactionCartCreate,
+        options: Sequence[ORMOption] = (),
+    ) -> Transaction:
+        """
+        Create a validated sale transaction along with all its items.
 
-        if transaction_db is not None:
-            treasury = await crud_treasury.get_last_treasury(db)
-            tresury_update = await crud_treasury.revert_transaction(
-                treasury=treasury,
-                amount=transaction_db.amount,
-                payment_method=transaction_db.payment_method,
+        The referenced barrels, consumables and non inventoried items are fetched with one query per table,
+        the items are inserted in bulk and the treasury is updated once, everything is committed at once.
+        Only the needed columns are fetched, so no partially loaded object is left in the session.
+
+        :param db: The database session
+        :param obj_in: The cart to be sold
+        :param options: The loader options of the returned transaction, see `loader_profile`
+
+        :return: The created transaction
+        """
+        barrel_ids = {glass.barrel_id for glass in obj_in.glasses}
+        barrels = {
+            row.id: row
+            for row in await db.execute(
+                select(Barrel.id, Barrel.sell_price).where(Barrel.id.in_(barrel_ids)),
+            )
+        }
+        if missing := barrel_ids - barrels.keys():
+            logger.debug("Barrels %s not found", missing)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=barrel_translator.ELEMENT_NOT_FOUND,
             )
-            logger.debug("Treasury amount: %s", tresury_update.total_amount)
-            await crud_treasury.update(db, db_obj=treasury, obj_in=tresury_update)
 
-        return transaction_db
+        consumable_ids = set(obj_in.consumable_ids)
+        consumables = {
+            row.id: row
+            for row in await db.execute(
+                select(Consumable.id, Consumable.sell_price, Consumable.solded, Consumable.consumable_item_id).where(
+                    Consumable.id.in_(consumable_ids),
+                ),
+            )
+        }
+        if missing := consumable_ids - consumables.keys():
+            logger.debug("Consumables %s not found", missing)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=consumable_translator.ELEMENT_NOT_FOUND,
+            )
+        if solded := [row.id for row in consumables.values() if row.solded]:
+            logger.debug("Consumables %s already solded", solded)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=consumable_translator.ELEMENT_NO_LONGER_IN_STOCK,
+            )
+
+        non_inventoried_item_ids = {item.non_inventoried_item_id for item in obj_in.non_inventorieds}
+        non_inventoried_items = {
+            row.id: row
+            for row in await db.execute(
+                select(NonInventoriedItem.id, NonInventoriedItem.sell_price, NonInventoriedItem.trade).where(
+                    NonInventoriedItem.id.in_(non_inventoried_item_ids),
+                ),
+            )
+        }
+        if missing := non_inventoried_item_ids - non_inventoried_items.keys():
+            logger.debug("NonInventoriedItems %s not found", missing)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=non_inventoried_item_translator.ELEMENT_NOT_FOUND,
+            )
+        if not_sale := [row.id for row in non_inventoried_items.values() if row.trade != TradeType.SALE]:
+            logger.debug("NonInventoriedItems %s not sale", not_sale)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=non_inventoried_item_translator.INTEGRITY_ERROR,
+            )
+
+        # The prices are frozen at the time of the transaction
+        glass_prices = [barrels[glass.barrel_id].sell_price for glass in obj_in.glasses for _ in range(glass.quantity)]
+        non_inventoried_prices = [
+            non_inventoried_items[item.non_inventoried_item_id].sell_price
+            for item in obj_in.non_inventorieds
+            for _ in range(item.quantity)
+        ]
+        price_sum = (
+            sum(glass_prices)
+            + sum(row.sell_price for row in consumables.values())
+            + sum(price for price in non_inventoried_prices if price is not None)
+        )
+
+        treasury, real_amount = await crud_treasury.apply_transaction(
+            db,
+            amount=price_sum,
+            sale=True,
+            payment_method=obj_in.payment_method,
+        )
+        logger.debug("Price sum: %s", real_amount)
+
+        transaction_id = (
+            await db.execute(
+                insert(self.model)
+                .values(
+                    datetime=obj_in.datetime,
+                    payment_method=obj_in.payment_method,
+                    trade=obj_in.trade,
+                    type=obj_in.type,
+                    status=obj_in.status,
+                    amount=real_amount,
+                    treasury_id=treasury.id,
+                )
+                .returning(self.model.id),
+            )
+        ).scalar_one()
+
+        if obj_in.glasses:
+            await db.execute(
+                insert(Glass),
+                [
+                    {"barrel_id": glass.barrel_id, "transaction_id": transaction_id, "transaction_sell_price": price}
+                    for glass, price in zip(
+                        (glass for glass in obj_in.glasses for _ in range(glass.quantity)),
+                        glass_prices,
+                    )
+                ],
+            )
+
+        if obj_in.non_inventorieds:
+            await db.execute(
+                insert(NonInventoried),
+                [
+                    {
+                        "non_inventoried_item_id": item.non_inventoried_item_id,
+                        "transaction_id": transaction_id,
+                        "sell_price": price,
+                    }
+                    for item, price in zip(
+                        (item for item in obj_in.non_inventorieds for _ in range(item.quantity)),
+                        non_inventoried_prices,
+                    )
+                ],
+            )
+
+        if consumable_ids:
+            # The consumables could have been sold since they were fetched, only the unsold ones are updated
+            result = await db.execute(
+                update(Consumable)
+                .where(Consumable.id.in_(consumable_ids), Consumable.solded.is_(False))
+                .values(transaction_id_sale=transaction_id, solded=True)
+                .execution_options(synchronize_session=False),
+            )
+            if result.rowcount != len(consumable_ids):  # type: ignore[attr-defined]
+                logger.debug("Consumables %s sold concurrently", consumable_ids)
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=consumable_translator.ELEMENT_NO_LONGER_IN_STOCK,
+                )
+
+        await crud_sales_rollup.apply(
+            db,
+            [RolledUpTransaction(transaction_id, obj_in.datetime, obj_in.payment_method, obj_in.trade, real_amount)],
+        )
+        await db.commit()
+        transaction: Transaction = await self.read(db, transaction_id, options=options)  # type: ignore[assignment]
+
+        await event_bus.publish(
+            [
+                *self.change_events("created", [transaction]),
+                *(
+                    ChangeEvent(
+                        Consumable.__tablename__,
+                        "updated",
+                        row.id,
+                        {"consumable_item_id": row.consumable_item_id, "solded": True},
+                    )
+                    for row in consumables.values()
+                ),
+            ],
+        )
+        return transaction
+
+    async def delete(self, db: AsyncSession, *, id: int) -> Transaction | None:
+        transaction_db = await self.read(db, id)
+        if transaction_db is None:
+            return None
+
+        # Revert the transaction first, the treasury update is committed along with the deletion
+        treasury = await crud_treasury.apply_revert(
+            db,
+            amount=transaction_db.amount,
+            payment_method=transaction_db.payment_method,
+        )
+        logger.debug("Treasury amount: %s", treasury.total_amount)
+
+        # The items are deleted along with the transaction, it is removed from the rollup before
+        if transaction_db.status == Status.VALIDATED:
+            await crud_sales_rollup.revert(
+                db,
+                [
+                    RolledUpTransaction(
+                        transaction_db.id,
+                        transaction_db.datetime,
+                        transaction_db.payment_method,
+                        transaction_db.trade,
+                        transaction_db.amount,
+                    ),
+                ],
+            )
+        return await super().delete(db, id=id)
 
 
 transaction = CRUDTransaction(Transaction)
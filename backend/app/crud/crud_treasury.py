@@ -1,15 +1,23 @@
 import logging
+from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Numeric, cast, event, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.core.translation import Translator
 from app.core.types import PaymentMethod
 from app.crud.base import CRUDBase
 from app.models.treasury import Treasury
 from app.schemas.transaction import TransactionCreate
-from app.schemas.treasury import InternalTreasuryUpdate, TreasuryCreate, TreasuryUpdate
+from app.schemas.treasury import (
+    InternalTreasuryUpdate,
+    TreasuryCreate,
+    TreasurySnapshot,
+    TreasuryUpdate,
+)
 
 translator = Translator(element="treasury")
 
@@ -19,6 +27,271 @@ logger = logging.getLogger("app.crud.crud_treasury")
 class CRUDTreasury(
     CRUDBase[Treasury, TreasuryCreate, TreasuryUpdate | InternalTreasuryUpdate],
 ):
+    def __init__(self, model: type[Treasury]):
+        """
+        CRUD object for the treasuries, with an in-process write-through cache.
+
+        The cache holds a snapshot of each treasury read or written by this process, keyed by id,
+        along with the id of the last treasury. It spares the transaction hot path the lookup of the
+        last treasury, while the balance updates still lock the row by primary key.
+        The snapshots are replaced whenever the row is read again with a different `version`.
+        The snapshots of uncommitted updates are kept in the session, and only cached once it is committed.
+
+        :param model: The Treasury model class
+        """
+        super().__init__(model)
+        self._cache: dict[int, TreasurySnapshot] = {}
+        self._last_treasury_id: int | None = None
+        event.listen(Session, "after_commit", self._remember_pending)
+        event.listen(Session, "after_transaction_end", self._forget_pending)
+
+    def remember(self, treasury: Treasury) -> TreasurySnapshot:
+        """
+        Store a snapshot of the treasury in the cache.
+
+        :param treasury: The treasury, freshly read from or written to the database
+
+        :return: The snapshot of the treasury
+        """
+        return self._store(TreasurySnapshot.model_validate(treasury))
+
+    def _store(self, snapshot: TreasurySnapshot) -> TreasurySnapshot:
+        cached = self._cache.get(snapshot.id)
+        if cached is not None and cached.version != snapshot.version:
+            logger.debug("Treasury %s changed, version %s -> %s", snapshot.id, cached.version, snapshot.version)
+
+        self._cache[snapshot.id] = snapshot
+        if self._last_treasury_id is None or snapshot.id > self._last_treasury_id:
+            self._last_treasury_id = snapshot.id
+        return snapshot
+
+    def remember_on_commit(self, db: AsyncSession, treasury: Treasury) -> None:
+        """
+        Store a snapshot of the treasury in the cache once the database transaction is committed.
+        The snapshot is dropped if the transaction is rolled back.
+
+        :param db: The database session
+        :param treasury: The treasury, written to the database by the current transaction
+        """
+        db.info.setdefault(self, {})[treasury.id] = TreasurySnapshot.model_validate(treasury)
+
+    def _remember_pending(self, session: Session) -> None:
+        for snapshot in session.info.pop(self, {}).values():
+            self._store(snapshot)
+
+    def _forget_pending(self, session: Session, transaction: SessionTransaction) -> None:
+        if transaction.parent is None:
+            session.info.pop(self, None)
+
+    def invalidate(self, id: int | None = None) -> None:
+        """
+        Drop a treasury from the cache, or the whole cache if no id is given.
+
+        :param id: The id of the treasury to drop
+        """
+        if id is None:
+            self._cache.clear()
+            self._last_treasury_id = None
+            return
+
+        self._cache.pop(id, None)
+        if id == self._last_treasury_id:
+            self._last_treasury_id = None
+
+    async def get_cached_treasury(self, db: AsyncSession) -> TreasurySnapshot:
+        """
+        Get the snapshot of the last treasury, the database is only read if it is not cached yet.
+
+        :param db: The database session
+
+        :return: The snapshot of the last treasury.
+        """
+        if self._last_treasury_id is None or self._last_treasury_id not in self._cache:
+            return self.remember(await self.get_last_treasury(db))
+        return self._cache[self._last_treasury_id]
+
+    async def get_current_treasury(self, db: AsyncSession) -> Treasury:
+        """
+        Get the last treasury, locked for update until the end of the database transaction.
+        The row is read by primary key thanks to the cache, and the cache is refreshed with it.
+
+        :param db: The database session
+
+        :return: The last treasury.
+        """
+        snapshot = await self.get_cached_treasury(db)
+        treasury = await db.get(self.model, snapshot.id, with_for_update=True, populate_existing=True)
+        if treasury is None:
+            # The cached treasury has been deleted by another process, look for the last one again
+            logger.debug("Cached treasury %s not found", snapshot.id)
+            self.invalidate()
+            snapshot = await self.get_cached_treasury(db)
+            treasury = await db.get(self.model, snapshot.id, with_for_update=True, populate_existing=True)
+
+        self.remember(treasury)
+        return treasury
+
+    async def create(self, db: AsyncSession, *, obj_in: TreasuryCreate) -> Treasury:
+        treasury = await super().create(db, obj_in=obj_in)
+        self.remember(treasury)
+        return treasury
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Treasury,
+        obj_in: TreasuryUpdate | InternalTreasuryUpdate | dict[str, Any],
+    ) -> Treasury:
+        id = db_obj.id
+        try:
+            treasury = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        except StaleDataError:
+            # A transaction changed the amounts since the treasury was read, the version guard rejected the update
+            await db.rollback()
+            self.invalidate(id)
+            logger.debug("Treasury %s updated concurrently", id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=translator.CONCURRENT_UPDATE,
+            ) from None
+        self.remember(treasury)
+        return treasury
+
+    async def delete(self, db: AsyncSession, *, id: int) -> Treasury | None:
+        treasury = await super().delete(db, id=id)
+        self.invalidate(id)
+        return treasury
+
+    async def apply_delta(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        total_delta: float,
+        cash_delta: float = 0,
+        lydia_rate: float | None = None,
+    ) -> Treasury | None:
+        """
+        Add amounts of money to a treasury in a single statement.
+
+        The new amounts are computed by the database, so concurrent updates can not overwrite each other,
+        and the treasury is only updated if its cash amount stays positive when cash is taken out.
+        The update is not committed, it is part of the database transaction of the caller.
+
+        :param db: The database session
+        :param id: The treasury id
+        :param total_delta: The amount to add to the total amount
+        :param cash_delta: The amount to add to the cash amount
+        :param lydia_rate: If set, the treasury is only updated if its Lydia rate is still this one
+
+        :return: The updated treasury, or None if it was not updated.
+        """
+        # Cents are two decimals max
+        total_amount = func.round(cast(self.model.total_amount + total_delta, Numeric), 2)
+        cash_amount = func.round(cast(self.model.cash_amount + cash_delta, Numeric), 2)
+
+        query = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(total_amount=total_amount, cash_amount=cash_amount, version=self.model.version + 1)
+            .returning(self.model)
+        )
+        if cash_delta < 0:
+            # Only taking cash out can make it negative, the other payments go through whatever the cash amount
+            query = query.where(cash_amount >= 0)
+        if lydia_rate is not None:
+            query = query.where(self.model.lydia_rate == lydia_rate)
+
+        treasury = (await db.execute(query)).scalar_one_or_none()
+        if treasury is not None:
+            self.remember_on_commit(db, treasury)
+        return treasury
+
+    async def apply_transaction(
+        self,
+        db: AsyncSession,
+        *,
+        amount: float,
+        sale: bool,
+        payment_method: PaymentMethod,
+    ) -> tuple[Treasury, float]:
+        """
+        Apply a transaction to the last treasury.
+
+        The Lydia rate used to compute the amount is the one of the cached treasury, the update is guarded
+        on it so a stale cache is detected, refreshed and the update retried.
+
+        :param db: The database session
+        :param amount: The amount of the transaction
+        :param sale: Whether the transaction is a sale or a purchase.
+        :param payment_method: The payment method of the transaction.
+
+        :return: The updated treasury, and the amount actually added to it.
+        """
+        current: TreasurySnapshot | Treasury = await self.get_cached_treasury(db)
+        while True:
+            real_amount = self.get_real_amount(
+                amount=amount,
+                sale=sale,
+                payment_method=payment_method,
+                lydia_rate=current.lydia_rate,
+            )
+            treasury = await self.apply_delta(
+                db,
+                id=current.id,
+                total_delta=real_amount,
+                cash_delta=real_amount if payment_method == PaymentMethod.CASH else 0,
+                lydia_rate=current.lydia_rate,
+            )
+            if treasury is not None:
+                return treasury, real_amount
+
+            # Either the cached treasury is stale or there is not enough cash, the locked row tells which
+            treasury = await self.get_current_treasury(db)
+            if treasury.id == current.id and treasury.lydia_rate == current.lydia_rate:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=translator.NEGATIVE_CASH_AMOUNT,
+                )
+            current = treasury
+
+    async def apply_revert(
+        self,
+        db: AsyncSession,
+        *,
+        amount: float,
+        payment_method: PaymentMethod,
+    ) -> Treasury:
+        """
+        Revert a transaction from the last treasury, see `revert_transaction`.
+
+        :param db: The database session
+        :param amount: The amount of the transaction to be reverted
+        :param payment_method: The payment method of the transaction to be reverted.
+
+        :return: The updated treasury.
+        """
+        current: TreasurySnapshot | Treasury = await self.get_cached_treasury(db)
+        while True:
+            treasury = await self.apply_delta(
+                db,
+                id=current.id,
+                total_delta=-amount,
+                cash_delta=-amount if payment_method == PaymentMethod.CASH else 0,
+            )
+            if treasury is not None:
+                return treasury
+
+            # Either the cached treasury has been deleted or there is not enough cash, the locked row tells which
+            treasury = await self.get_current_treasury(db)
+            if treasury.id == current.id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=translator.NEGATIVE_CASH_AMOUNT,
+                )
+            current = treasury
+
     async def add_transaction(
         self,
         db: AsyncSession,
@@ -83,18 +356,12 @@ class CRUDTreasury(
         """
         treasury_created = InternalTreasuryUpdate.model_validate(treasury)
 
-        # Update the total amount of the treasury based on the transaction amount and whether it is a sale or a purchase
-        real_amount: float = amount
-        is_sale = sale
-        is_lydia_payment = payment_method == PaymentMethod.LYDIA
-
-        if is_lydia_payment and is_sale:
-            # Subtract the Lydia fee
-            real_amount *= 1 - treasury_created.lydia_rate
-        elif not is_sale:
-            real_amount *= -1
-
-        real_amount = round(real_amount, 2)
+        real_amount = self.get_real_amount(
+            amount=amount,
+            sale=sale,
+            payment_method=payment_method,
+            lydia_rate=treasury_created.lydia_rate,
+        )
 
         treasury_created.total_amount += real_amount
         # Cents are two decimals max
@@ -113,6 +380,30 @@ class CRUDTreasury(
 
         return treasury_created, real_amount
 
+    @staticmethod
+    def get_real_amount(*, amount: float, sale: bool, payment_method: PaymentMethod, lydia_rate: float) -> float:
+        """
+        Get the amount actually added to a treasury by a transaction.
+
+        :param amount: The amount of the transaction.
+        :param sale: Whether the transaction is a sale or a purchase.
+        :param payment_method: The payment method of the transaction.
+        :param lydia_rate: The rate taken by Lydia on each payment.
+
+        :return: The amount to add to the treasury, negative for a purchase.
+        """
+        # Update the total amount of the treasury based on the transaction amount and whether it is a sale or a purchase
+        real_amount: float = amount
+
+        if payment_method == PaymentMethod.LYDIA and sale:
+            # Subtract the Lydia fee
+            real_amount *= 1 - lydia_rate
+        elif not sale:
+            real_amount *= -1
+
+        # Cents are two decimals max
+        return round(real_amount, 2)
+
     async def revert_transaction(
         self,
         *,
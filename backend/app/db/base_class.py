@@ -1,13 +1,44 @@
-from datetime import datetime
-from typing import Annotated
+from datetime import datetime, timezone
+from typing import Annotated, Any
 
-from sqlalchemy import DateTime, ForeignKey, String, UnicodeText, inspect
+from sqlalchemy import ColumnElement, DateTime, Dialect, ForeignKey, Index, String, TypeDecorator, UnicodeText, inspect
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
+
+class UTCDateTime(TypeDecorator[datetime]):
+    """
+    Timezone aware datetime, normalized to UTC when it is sent to and read from the database.
+
+    SQLite does not store the timezone: the datetimes are stored in UTC and the naive datetimes it returns are UTC.
+    Naive datetimes given to the database are considered to be UTC as well.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    @property
+    def python_type(self) -> type[datetime]:
+        return datetime
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> datetime | None:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def process_result_value(self, value: datetime | None, dialect: Dialect) -> datetime | None:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+
 PrimaryKey = Annotated[int, mapped_column(primary_key=True, nullable=False)]
 Str256 = Annotated[str, mapped_column(String(256), nullable=False)]
 Str512 = Annotated[str, mapped_column(String(512), nullable=False)]
-Datetime = Annotated[datetime, mapped_column(DateTime(timezone=True), nullable=False)]
+Datetime = Annotated[datetime, mapped_column(UTCDateTime, nullable=False)]
 Text = Annotated[str, mapped_column(UnicodeText, nullable=True)]
 
 
@@ -65,7 +96,23 @@ def build_fk_annotation(class_name: str):
     """
     Build a foreign key annotation for a given class name.
 
+    The foreign key is indexed, since the relationships are loaded and the records filtered by it.
+
     :param class_name: The name of the class to build the foreign key for.
     :return: The foreign key annotation.
     """
-    return Annotated[int, mapped_column(ForeignKey(f"{class_name}.id"))]
+    return Annotated[int, mapped_column(ForeignKey(f"{class_name}.id"), index=True)]
+
+
+def build_partial_index(name: str, *columns: Any, where: ColumnElement[bool], unique: bool = False) -> Index:
+    """
+    Build an index restricted to the rows matching a condition, on PostgreSQL as well as on SQLite.
+    It is smaller than a full index, and the queries filtering on the same condition can use it.
+
+    :param name: The name of the index.
+    :param columns: The indexed columns.
+    :param where: The condition of the rows to index.
+    :param unique: Whether the indexed columns are unique among the rows matching the condition.
+    :return: The index, to be declared after the model class or in its `__table_args__`.
+    """
+    return Index(name, *columns, unique=unique, postgresql_where=where, sqlite_where=where)
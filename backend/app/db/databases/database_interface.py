@@ -3,6 +3,8 @@ from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.db.databases.pool import get_pool_status
+
 
 class DatabaseInterface(ABC):
     def __init__(self):
@@ -49,3 +51,13 @@ class DatabaseInterface(ABC):
             raise RuntimeError(msg)
 
         return self.async_sessionmaker()
+
+    def pool_status(self) -> dict[str, Any]:
+        """
+        Return the statistics of the connection pool of the engine.
+        """
+        if not self.async_engine:
+            msg = "Database not initialized"
+            raise RuntimeError(msg)
+
+        return get_pool_status(self.async_engine.pool)
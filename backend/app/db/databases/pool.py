@@ -0,0 +1,96 @@
+import time
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (in seconds) of the checkout wait time histogram buckets, the last bucket is unbounded
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class WaitTimeHistogram:
+    """
+    Histogram of the time spent waiting for a connection to be checked out of the pool.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record a checkout wait time.
+
+        :param seconds: The time spent waiting for the connection
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        Return the buckets of the histogram, the last one has no upper bound.
+        """
+        bounds: list[float | None] = [*self.buckets, None]
+        return [{"le": le, "count": count} for le, count in zip(bounds, self.counts)]
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool recording how long each checkout waited for a connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_time = WaitTimeHistogram()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.wait_time.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+def get_pool_status(pool: Pool) -> dict[str, Any]:
+    """
+    Return the statistics of a connection pool.
+    Sizes are only reported by queue pools, and wait times by instrumented pools.
+
+    :param pool: The pool to inspect
+
+    :return: The statistics of the pool
+    """
+    status: dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "size": None,
+        "checked_in": None,
+        "checked_out": None,
+        "overflow": None,
+        "wait_count": 0,
+        "wait_time_total": 0.0,
+        "timeouts": 0,
+        "wait_time_histogram": [],
+    }
+    if isinstance(pool, QueuePool):
+        status |= {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        status |= {
+            "wait_count": pool.wait_time.count,
+            "wait_time_total": pool.wait_time.total,
+            "timeouts": pool.wait_time.timeouts,
+            "wait_time_histogram": pool.wait_time.snapshot(),
+        }
+    return status
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.config import settings
 from app.db.databases.database_interface import DatabaseInterface
+from app.db.databases.pool import InstrumentedAsyncQueuePool
 
 
 class PostgresDatabase(DatabaseInterface):
@@ -24,8 +25,14 @@ class PostgresDatabase(DatabaseInterface):
                 host=settings.POSTGRES_HOST,
                 port=settings.POSTGRES_PORT,
                 database=settings.POSTGRES_DB,
+                query={"prepared_statement_cache_size": str(settings.POSTGRES_STATEMENT_CACHE_SIZE)},
             ),
-            pool_pre_ping=True,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+            pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+            pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
         )
         self.async_sessionmaker = async_sessionmaker(
             self.async_engine,
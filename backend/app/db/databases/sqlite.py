@@ -1,6 +1,7 @@
 import os
 from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -13,20 +14,74 @@ from app.core.config import settings
 from app.db.base_class import Base
 from app.db.databases.database_interface import DatabaseInterface
 
+# Pragmas applied to each new connection, by profile
+SQLITE_PRAGMA_PROFILES: dict[str, dict[str, str | int]] = {
+    # The SQLite defaults: rollback journal and synchronous FULL, the writers block the readers
+    "default": {},
+    # Write-ahead log: the readers do not block the writer, and a commit only appends to the log.
+    # With synchronous NORMAL, a power loss can lose the last commits but never corrupts the database.
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # In KiB when negative
+        "busy_timeout": 5000,  # In milliseconds
+    },
+}
+
+
+def set_pragmas(pragmas: dict[str, str | int]) -> Any:
+    """
+    Build a `connect` event listener applying pragmas to each new connection.
+
+    :param pragmas: The pragmas to apply, name -> value
+    :return: The event listener
+    """
+
+    def on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return on_connect
+
+
+def begin_immediate(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    `connect` event listener starting the write transactions with BEGIN IMMEDIATE instead of BEGIN DEFERRED.
+
+    A deferred transaction takes its read snapshot before the write lock, so its first write fails at once with
+    `database is locked` if another connection committed in the meantime, the busy timeout does not apply.
+    An immediate transaction takes the write lock first, so the concurrent writers wait for each other instead.
+    The driver only begins a transaction before the first write, the reads outside of it take no write lock.
+    """
+    dbapi_connection.isolation_level = "IMMEDIATE"
+
 
 class SqliteDatabase(DatabaseInterface):
     def setup(
         self,
         path: str = settings.DATABASE_URI,
+        profile: str = settings.SQLITE_PRAGMA_PROFILE,
+        foreign_keys: bool = settings.SQLITE_FOREIGN_KEYS,
     ) -> async_sessionmaker[AsyncSession]:
         """
         Create a new SQLAlchemy engine and sessionmaker.
+
+        :param path: The URI of the database
+        :param profile: The pragmas applied to each connection, see `SQLITE_PRAGMA_PROFILES`
+        :param foreign_keys: Whether the foreign keys are enforced, as they are by PostgreSQL
         """
         if settings.ENVIRONMENT == "production":
             msg = "Use migrations in production"
             raise ValueError(msg)
 
         self.async_engine: AsyncEngine = create_async_engine(path)
+        pragmas = SQLITE_PRAGMA_PROFILES[profile] | ({"foreign_keys": "ON"} if foreign_keys else {})
+        if pragmas:
+            event.listen(self.async_engine.sync_engine, "connect", set_pragmas(pragmas))
+        event.listen(self.async_engine.sync_engine, "connect", begin_immediate)
         self.async_sessionmaker = async_sessionmaker(
             self.async_engine,
             class_=AsyncSession,
@@ -11,8 +11,8 @@ from app.core.config import settings
 from app.core.translation import Translator
 from app.crud.crud_account import account as accounts
 from app.db.select_db import select_db
-from app.models.account import Account
 from app.schemas import token as token_schema
+from app.schemas.account import AccountPrincipal
 
 translator = Translator()
 logger = logging.getLogger("app.dependencies")
@@ -28,7 +28,7 @@ async def get_current_account(
     security_scopes: SecurityScopes,
     db: DBDependency,
     token: str = Depends(oauth2_scheme),
-) -> Account:
+) -> AccountPrincipal:
     """
     Get the current account associated with the JWT token in the authorization header.
 
@@ -47,40 +47,52 @@ async def get_current_account(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        # Decode the JWT token to get the payload
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-        # Get the id from the payload
-        sub: str | None = payload.get("sub")
-        if sub is None:
-            # Raise an exception if the id is not in the payload
-            logger.debug("Id not in payload")
+    cached = accounts.get_principal(token)
+    if cached is not None:
+        token_scopes, account = cached
+    else:
+        try:
+            # Decode the JWT token to get the payload
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+            )
+            # Get the id from the payload
+            sub: str | None = payload.get("sub")
+            if sub is None:
+                # Raise an exception if the id is not in the payload
+                logger.debug("Id not in payload")
+                raise credentials_exception
+
+            # Get the scopes from the payload
+            token_scopes = payload.get("scopes", [])
+            # Create a `TokenData`` object from the id
+            token_data = token_schema.TokenData(scopes=token_scopes, id=int(sub))
+
+        except JWTError as e:
+            # Raise an exception if the token cannot be decoded
+            logger.debug("Token could not be parsed, %s", e)
+            raise credentials_exception from e
+
+        # Get the account associated with the username
+        async with db.begin():
+            db_account = await accounts.read(db, id=token_data.id)
+
+        if db_account is None:
+            # Raise an exception if the account does not exist
+            logger.debug("Account does not exist")
             raise credentials_exception
 
-        # Get the scopes from the payload
-        token_scopes = payload.get("scopes", [])
-        # Create a `TokenData`` object from the id
-        token_data = token_schema.TokenData(scopes=token_scopes, id=int(sub))
-
-    except JWTError as e:
-        # Raise an exception if the token cannot be decoded
-        logger.debug("Token could not be parsed, %s", e)
-        raise credentials_exception from e
-
-    # Get the account associated with the username
-    async with db.begin():
-        account = await accounts.read(db, id=token_data.id)
-
-    if account is None:
-        # Raise an exception if the account does not exist
-        logger.debug("Account does not exist")
-        raise credentials_exception
+        # The token is verified, the next requests with it only need a cache lookup
+        account = accounts.remember_principal(
+            token,
+            account=db_account,
+            scopes=token_scopes,
+            expires_at=payload.get("exp"),
+        )
 
-    if not token_scopes or not check_scopes(security_scopes, token_data.scopes):
+    if not token_scopes or not check_scopes(security_scopes, token_scopes):
         if not token_scopes:
             logger.debug("Token has no scopes")
         else:
@@ -96,8 +108,8 @@ async def get_current_account(
 
 
 async def get_current_active_account(
-    current_account: Account = Security(get_current_account, scopes=["staff"]),
-) -> Account:
+    current_account: AccountPrincipal = Security(get_current_account, scopes=["staff"]),
+) -> AccountPrincipal:
     """
     Get the current active account associated with the JWT token in the authorization header.
 
@@ -13,8 +13,10 @@ from app.api.utils.endpoints import base_router
 from app.api.v1.api import api_v1_router
 from app.api.v2.api import api_v2_router
 from app.core.config import settings
+from app.core.events import event_bus
 from app.core.middleware import ExceptionMonitorMiddleware
 from app.core.utils.backend.alert_backend import alert_backend
+from app.core.utils.backend.alert_dispatcher import AlertDispatcher
 from app.db.pre_start import pre_start
 from app.dependencies import get_db
 from app.schemas.base import HTTPError
@@ -51,10 +53,16 @@ async def lifespan(_app: FastAPI):  # pragma: no cover
     get_db.setup()
     await pre_start()
     logger.info("Database connection established.")
+    # Receive the changes of the other processes before serving, the entity tags of the catalogs depend on them
+    await event_bus.listen()
     yield
     logger.info("Closing database connection...")
     await get_db.shutdown()
     logger.info("Database connection closed.")
+    await event_bus.close()
+    if isinstance(alert, AlertDispatcher):
+        # Send the alerts still queued
+        await alert.close()
 
 
 responses: Dict[int | str, Dict[str, Any]] | None = None
@@ -71,6 +79,8 @@ responses = {
 }
 
 
+alert = alert_backend()
+
 app = FastAPI(
     title="Clochette API",
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
@@ -80,7 +90,7 @@ app = FastAPI(
     generate_unique_id_function=custom_generate_unique_id,
 )
 
-app.add_middleware(ExceptionMonitorMiddleware, alert_backend=alert_backend())
+app.add_middleware(ExceptionMonitorMiddleware, alert_backend=alert)
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 app.add_middleware(
     CORSMiddleware,
@@ -88,6 +98,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
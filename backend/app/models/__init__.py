@@ -9,6 +9,7 @@ from .non_inventoried import *  # noqa
 from .non_inventoried_item import *  # noqa
 from .out_of_stock import *  # noqa
 from .out_of_stock_item import *  # noqa
+from .sales_rollup import *  # noqa
 from .transaction import *  # noqa
 from .transaction_v1 import *  # noqa
 from .treasury import *  # noqa
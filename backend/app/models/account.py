@@ -1,11 +1,11 @@
-from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.types import SecurityScopes
 from app.db.base_class import Base, Str256, Str512
 
 
 class Account(Base):
-    username: Mapped[Str256]
+    username: Mapped[Str256] = mapped_column(index=True)
     password: Mapped[Str512]
     scope: Mapped[SecurityScopes]
     is_active: Mapped[bool]
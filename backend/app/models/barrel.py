@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING, List
 
 from sqlalchemy.orm import Mapped, relationship, validates
 
-from app.db.base_class import Base, build_fk_annotation
+from app.db.base_class import Base, build_fk_annotation, build_partial_index
 
 if TYPE_CHECKING:  # pragma: no cover
     from .drink_item import DrinkItem
@@ -58,3 +58,12 @@ class Barrel(Base):
             self.empty_or_solded = False
 
         return transaction_id_sale
+
+
+# The barrels still in the bar, grouped by drink item for the distinct barrels
+build_partial_index(
+    "ix_barrel_in_stock",
+    Barrel.drink_item_id,
+    Barrel.is_mounted,
+    where=Barrel.empty_or_solded == False,  # noqa: E712
+)
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, relationship, validates
 
-from app.db.base_class import Base, build_fk_annotation
+from app.db.base_class import Base, build_fk_annotation, build_partial_index
 
 if TYPE_CHECKING:  # pragma: no cover
     from .consumable_item import ConsumableItem
@@ -44,3 +44,11 @@ class Consumable(Base):
             self.solded = False
 
         return transaction_id_sale
+
+
+# The consumables still in the bar, grouped by consumable item for the distinct consumables
+build_partial_index(
+    "ix_consumable_in_stock",
+    Consumable.consumable_item_id,
+    where=Consumable.solded == False,  # noqa: E712
+)
@@ -0,0 +1,41 @@
+from datetime import date
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped
+
+from app.core.types import PaymentMethod, RollupItemType, TradeType
+from app.db.base_class import Base
+
+
+class SalesRollup(Base):
+    """
+    Represents the totals of the commerce transactions of a night, for an item and a payment method.
+    The rows are maintained along with the validated transactions, the reports are read from them.
+
+    Attributes:
+        - `day` is the date the night started, see `get_night` of `app.crud.crud_sales_rollup`.
+        - `trade` is the trade type of the transactions.
+        - `payment_method` is the payment method of the transactions.
+        - `item_type` is the kind of item, it tells which table `item_id` refers to:
+            drink items for the glasses and the barrels, consumable items, non inventoried items.
+        - `item_id` is the id of the item.
+        - `quantity` is the number of items sold or bought.
+        - `revenue` is the sum of the sell prices of the items sold.
+        - `cost` is the sum of the buy prices of the items bought.
+        - `lydia_fees` is the part of the revenue taken by Lydia.
+    """
+
+    day: Mapped[date]
+    trade: Mapped[TradeType]
+    payment_method: Mapped[PaymentMethod]
+    item_type: Mapped[RollupItemType]
+    item_id: Mapped[int]
+    quantity: Mapped[int]
+    revenue: Mapped[float]
+    cost: Mapped[float]
+    lydia_fees: Mapped[float]
+
+    # The key of the rows, the upserts rely on it and the reports read it by day
+    __table_args__ = (
+        UniqueConstraint("day", "trade", "payment_method", "item_type", "item_id", name="uq_salesrollup_key"),
+    )
@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, query_expression, relationship
 
 from app.core.types import PaymentMethod, Status, TradeType, TransactionType
-from app.db.base_class import Base, Datetime, Text, build_fk_annotation
+from app.db.base_class import Base, Datetime, Text, build_fk_annotation, build_partial_index
 
 if TYPE_CHECKING:  # pragma: no cover
     from .barrel import Barrel
@@ -39,7 +40,8 @@ class Transaction(Base):
         - `non_inventorieds` is the list of non-inventoried items sold in the transaction.
 
     Calculated attributes:
-        - `price_sum` is the sum of the price of all the items in the transaction.
+        - `price_sum` is the sum of the price of all the items in the transaction, computed by the database.
+            It is only loaded with the `with_price_sum` loader option of `app.crud.crud_transaction`.
     """
 
     datetime: Mapped[Datetime]
@@ -83,26 +85,15 @@ class Transaction(Base):
         cascade="all, delete-orphan",
     )
 
-    @property
-    def price_sum(self) -> float:
-        if self.trade == TradeType.PURCHASE:
-            return (
-                sum(barrel.buy_price for barrel in self.barrels_purchase)
-                + sum(consumable.buy_price for consumable in self.consumables_purchase)
-                + sum(
-                    non_inventoried.buy_price
-                    for non_inventoried in self.non_inventorieds
-                    if non_inventoried.buy_price is not None
-                )
-            )
-
-        return (
-            sum(glass.transaction_sell_price for glass in self.glasses if glass.transaction_sell_price is not None)
-            + sum(barrel.barrel_sell_price for barrel in self.barrels_sale if barrel.barrel_sell_price is not None)
-            + sum(consumable.sell_price for consumable in self.consumables_sale)
-            + sum(
-                non_inventoried.sell_price
-                for non_inventoried in self.non_inventorieds
-                if non_inventoried.sell_price is not None
-            )
-        )
+    price_sum: Mapped[float | None] = query_expression()
+
+
+# The keyset of the transactions pagination
+Index("ix_transaction_datetime_id", Transaction.datetime, Transaction.id)
+# The pending transaction, the database enforces that there is at most one at a time
+build_partial_index(
+    "ix_transaction_pending",
+    Transaction.status,
+    where=Transaction.status == Status.PENDING,
+    unique=True,
+)
@@ -1,9 +1,22 @@
-from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_class import Base
 
 
 class Treasury(Base):
+    """This model represents a treasury in the database.
+
+    Attributes:
+        - `total_amount`: The total amount of money of the treasury.
+        - `cash_amount`: The amount of cash of the treasury.
+        - `lydia_rate`: The rate taken by Lydia on each payment.
+        - `version`: The version of the row, incremented on each update.
+            It is used to detect concurrent updates, and to check whether a cached treasury is up to date.
+    """
+
     total_amount: Mapped[float]
     cash_amount: Mapped[float]
     lydia_rate: Mapped[float]
+    version: Mapped[int] = mapped_column(nullable=False)
+
+    __mapper_args__ = {"version_id_col": version}
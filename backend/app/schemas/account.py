@@ -1,16 +1,19 @@
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, TypeVar
 
+from fastapi.exceptions import RequestValidationError
 from pydantic import (
     AfterValidator,
     ConfigDict,
     Field,
+    ValidationError,
     ValidationInfo,
     computed_field,
 )
+from pydantic_core import ErrorDetails
 from zxcvbn import zxcvbn
 
-from app.core.security import get_password_hash, is_hashed_password
+from app.core.security import get_password_hash, is_hashed_password, run_password_work
 from app.core.types import SecurityScopes
 from app.schemas.base import DefaultModel, ExcludedField
 
@@ -102,6 +105,67 @@ class OwnAccountUpdate(AccountBase):
     model_config = ConfigDict(extra="forbid")
 
 
+class AccountCreateBody(AccountCreate):
+    """Request body of the account creation, the password is checked by `validate_account_body`.
+
+    Args:
+        AccountCreate: The base model to use.
+    """
+
+    password: str
+
+
+class AccountUpdateBody(AccountUpdate):
+    """Request body of the account update, the password is checked by `validate_account_body`.
+
+    Args:
+        AccountUpdate: The base model to use.
+    """
+
+    password: str | None = None
+
+
+class OwnAccountUpdateBody(OwnAccountUpdate):
+    """Request body of the own account update, the password is checked by `validate_account_body`.
+
+    Args:
+        OwnAccountUpdate: The base model to use.
+    """
+
+    password: str | None = None
+
+
+AccountSchemaT = TypeVar("AccountSchemaT", AccountCreate, AccountUpdate, OwnAccountUpdate)
+
+
+async def validate_account_body(
+    schema: type[AccountSchemaT],
+    body: AccountCreateBody | AccountUpdateBody | OwnAccountUpdateBody,
+) -> AccountSchemaT:
+    """Validate a request body against its schema in the password pool,
+    since checking the strength of the password and hashing it would block the event loop.
+
+    Args:
+        schema (type[AccountSchemaT]): The schema hashing the password.
+        body (AccountCreateBody | AccountUpdateBody | OwnAccountUpdateBody): The request body.
+
+    Raises:
+        RequestValidationError: If the body is not valid, e.g. the password is too weak.
+
+    Returns:
+        AccountSchemaT: The validated schema, with the hashed password.
+    """
+    try:
+        return await run_password_work(schema.model_validate, body.model_dump(exclude_unset=True))
+    except ValidationError as e:
+        # Same errors as if the body had been validated by FastAPI
+        error: ErrorDetails
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("body", *error["loc"])
+        raise RequestValidationError(errors) from e
+
+
 class Account(AccountBase):
     """This this the account model that is linked to the database and used by the API.
 
@@ -115,3 +179,13 @@ class Account(AccountBase):
     is_active: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AccountPrincipal(Account):
+    """Snapshot of an authenticated account, cached between requests without its password.
+
+    Args:
+        Account: The base model to use.
+    """
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -25,3 +25,12 @@ class Treasury(TreasuryBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Immutable copy of a treasury row, as kept in the in-process treasury cache
+class TreasurySnapshot(Treasury):
+    # The row as it is, the cash amount of legacy data can be negative
+    cash_amount: float
+    version: int
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -11,5 +11,22 @@ class HealthResponse(DefaultModel):
     status: str = Field(..., description="OK")
 
 
+class PoolWaitTimeBucket(DefaultModel):
+    le: float | None = Field(..., description="Upper bound of the bucket in seconds, null for the last one.")
+    count: int = Field(..., description="Number of checkouts in the bucket.")
+
+
+class PoolStatusResponse(DefaultModel):
+    pool_class: str = Field(..., description="Class of the connection pool.")
+    size: int | None = Field(..., description="Number of connections kept open in the pool.")
+    checked_in: int | None = Field(..., description="Number of idle connections in the pool.")
+    checked_out: int | None = Field(..., description="Number of connections in use.")
+    overflow: int | None = Field(..., description="Number of connections opened beyond the pool size.")
+    wait_count: int = Field(..., description="Number of checkouts since the pool was created.")
+    wait_time_total: float = Field(..., description="Total time spent waiting for a connection in seconds.")
+    timeouts: int = Field(..., description="Number of checkouts which timed out.")
+    wait_time_histogram: list[PoolWaitTimeBucket] = Field(..., description="Histogram of the checkout wait times.")
+
+
 class VersionResponse(DefaultModel):
     version: str = Field(..., description="Version of the API.")
@@ -25,6 +25,11 @@ class BarrelCreate(BarrelBase):
         return False
 
 
+class BarrelCreateBulk(BarrelCreate):
+    # The barrel is created `quantity` times, this is not a column
+    quantity: int = Field(default=1, gt=0, le=100, exclude=True)
+
+
 class BarrelUpdate(BarrelBase):
     pass
 
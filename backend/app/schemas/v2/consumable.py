@@ -23,6 +23,11 @@ class ConsumableCreate(ConsumableBase):
         return False
 
 
+class ConsumableCreateBulk(ConsumableCreate):
+    # The consumable is created `quantity` times, this is not a column
+    quantity: int = Field(default=1, gt=0, le=100, exclude=True)
+
+
 class ConsumableUpdate(ConsumableBase):
     pass
 
@@ -0,0 +1,45 @@
+from datetime import date
+
+from pydantic import ConfigDict, Field, computed_field
+
+from app.core.types import RollupItemType
+from app.schemas.base import DefaultModel
+
+
+class NightReport(DefaultModel):
+    day: date
+    quantity: int
+    revenue: float
+    cost: float
+    lydia_fees: float
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def net(self) -> float:
+        """What the night brought in, once the purchases and the Lydia fees are paid."""
+        return round(self.revenue - self.cost - self.lydia_fees, 2)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TopSeller(DefaultModel):
+    item_type: RollupItemType
+    item_id: int
+    name: str
+    quantity: int
+    revenue: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReportQuery(DefaultModel):
+    start: date | None = None
+    end: date | None = None
+
+    model_config = ConfigDict(alias_generator=None)
+
+
+class TopSellerQuery(ReportQuery):
+    item_type: RollupItemType | None = None
+    by_quantity: bool = False
+    limit: int = Field(default=10, gt=0, le=100)
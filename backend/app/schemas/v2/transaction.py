@@ -3,10 +3,12 @@ from datetime import datetime as _datetime
 
 from pydantic import (
     ConfigDict,
+    Field,
     FieldValidationInfo,
     PrivateAttr,
     computed_field,
     field_validator,
+    model_validator,
 )
 
 from app.core.types import PaymentMethod, Status, TradeType, TransactionType
@@ -95,6 +97,51 @@ class TransactionCommerceCreate(TransactionCreate):
         return 0
 
 
+class CartGlass(DefaultModel):
+    barrel_id: int
+    # A single cart can not expand into an unbounded number of rows
+    quantity: int = Field(default=1, gt=0, le=100)
+
+
+class CartNonInventoried(DefaultModel):
+    non_inventoried_item_id: int
+    quantity: int = Field(default=1, gt=0, le=100)
+
+
+class TransactionCartCreate(TransactionCommerceCreate):
+    """A whole sale, its items are created and the transaction is validated at once."""
+
+    glasses: list[CartGlass] = Field(default_factory=list)
+    consumable_ids: list[int] = Field(default_factory=list)
+    non_inventorieds: list[CartNonInventoried] = Field(default_factory=list)
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def status(self) -> Status:
+        """A cart is VALIDATED as soon as it is created."""
+        return Status.VALIDATED
+
+    @field_validator("trade", mode="after")
+    @classmethod
+    def trade_must_be_sale(cls, v):
+        if v != TradeType.SALE:
+            raise ValueError("A cart is always a sale")
+        return v
+
+    @field_validator("consumable_ids", mode="after")
+    @classmethod
+    def consumables_must_be_unique(cls, v):
+        if len(set(v)) != len(v):
+            raise ValueError("A consumable can only be sold once")
+        return v
+
+    @model_validator(mode="after")
+    def cart_must_not_be_empty(self):
+        if not (self.glasses or self.consumable_ids or self.non_inventorieds):
+            raise ValueError("The cart is empty")
+        return self
+
+
 class TransactionUpdate(DefaultModel):
     _amount: float = PrivateAttr(default=0)
 
@@ -126,6 +173,9 @@ class Transaction(TransactionBase):
     amount: float | None
     description: str | None
 
+    # Only computed when reading transactions, not when they are written
+    price_sum: float | None = None
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -148,4 +198,8 @@ class TransactionQuery(DefaultModel):
     type: TransactionType | None = None
     status: Status | None = None
 
+    # Pagination fields, they are not filters
+    cursor: str | None = None
+    limit: int | None = Field(default=None, gt=0)
+
     model_config = ConfigDict(alias_generator=None)
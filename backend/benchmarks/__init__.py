@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks of the hot paths of the application.
+
+Each benchmark is a module which can be run with `python -m benchmarks.<module> -h`,
+from the backend folder. They run against a temporary SQLite database.
+"""
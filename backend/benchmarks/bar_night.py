@@ -0,0 +1,391 @@
+"""
+Load test of a bar night against the whole application.
+
+Concurrent tills drive `app.main.app` through an in-process ASGI client, each one sending a random mix of requests:
+sales of whole carts, barrel mounts, transaction listings and reports by the treasurer, and logins.
+The throughput, the latency percentiles and the number of SQL statements per request are reported by scenario.
+
+The results can be saved as a JSON baseline, and a later run compared with it: the run fails when the number
+of SQL statements per request or the median latency of a scenario grew beyond the tolerance, or when a request failed.
+
+The run uses a temporary SQLite database. With `DB_TYPE=POSTGRES`, it uses the PostgreSQL database of the
+development settings instead, which is dropped first and thus requires `--reset-postgres`.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import datetime
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import event, insert
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.core.types import IconName, PaymentMethod, SecurityScopes, TradeType
+from app.db.base import Base
+from app.db.databases.postgres import PostgresDatabase
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_db
+from app.main import app
+from app.models.account import Account
+from app.models.barrel import Barrel
+from app.models.consumable import Consumable
+from app.models.consumable_item import ConsumableItem
+from app.models.drink_item import DrinkItem
+from app.models.non_inventoried_item import NonInventoriedItem
+from app.models.treasury import Treasury
+
+PASSWORD = "benchmark-password*45"
+DRINKS = 10
+MOUNTED_BARRELS = 10
+ITEMS = 5
+
+logger = logging.getLogger("benchmarks.bar_night")
+
+# Scenario -> weight in the mix of requests of a till
+SCENARIOS = {"cart": 70, "mount": 10, "listing": 10, "report": 5, "login": 5}
+
+# Number of SQL statements sent for the request being processed, the app runs in the task of the client
+statements_counter: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar("statements", default=None)
+
+
+@dataclass
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    statements: list[int] = field(default_factory=list)
+    errors: int = 0
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    statements: float
+
+
+@dataclass
+class BarNight:
+    """
+    The shared state of the tills: the tokens, the stock, and the samples of each scenario.
+    """
+
+    client: AsyncClient
+    staff_token: str = ""
+    treasurer_token: str = ""
+    mounted_barrels: list[int] = field(default_factory=list)
+    cellar_barrels: list[int] = field(default_factory=list)
+    consumables: list[int] = field(default_factory=list)
+    non_inventoried_items: list[int] = field(default_factory=list)
+    samples: dict[str, Samples] = field(default_factory=lambda: defaultdict(Samples))
+
+    async def request(self, scenario: str, send: Callable[[], Awaitable[Response]]) -> Response:
+        counter = [0]
+        token = statements_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await send()
+        finally:
+            statements_counter.reset(token)
+        samples = self.samples[scenario]
+        samples.latencies.append(time.perf_counter() - start)
+        samples.statements.append(counter[0])
+        if response.status_code >= 400:
+            samples.errors += 1
+            logger.warning("%s: %s %s", scenario, response.status_code, response.text)
+        return response
+
+    async def login(self, username: str) -> Response:
+        # A failed login is counted as an error, the response is only read by the setup
+        return await self.request(
+            "login",
+            lambda: self.client.post("/api/v1/auth/login/", data={"username": username, "password": PASSWORD}),
+        )
+
+    async def cart(self, rng: random.Random) -> None:
+        cart: dict[str, Any] = {
+            "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "paymentMethod": rng.choice([PaymentMethod.CASH, PaymentMethod.CARD, PaymentMethod.LYDIA]).value,
+            "trade": TradeType.SALE.value,
+            "glasses": [{"barrelId": rng.choice(self.mounted_barrels), "quantity": rng.randint(1, 4)}],
+            "nonInventorieds": [{"nonInventoriedItemId": rng.choice(self.non_inventoried_items), "quantity": 1}],
+            "consumableIds": [self.consumables.pop()] if self.consumables and rng.random() < 0.3 else [],
+        }
+        await self.request(
+            "cart",
+            lambda: self.client.post("/api/v2/transaction/cart/", json=cart, headers=self.headers(self.staff_token)),
+        )
+
+    async def mount(self, rng: random.Random) -> None:
+        barrel_id = rng.choice(self.cellar_barrels)
+        await self.request(
+            "mount",
+            lambda: self.client.patch(
+                f"/api/v2/barrel/{barrel_id}",
+                json={"isMounted": rng.random() < 0.5},
+                headers=self.headers(self.staff_token),
+            ),
+        )
+
+    async def listing(self, _rng: random.Random) -> None:
+        await self.request(
+            "listing",
+            lambda: self.client.get("/api/v2/transaction/?limit=50", headers=self.headers(self.treasurer_token)),
+        )
+
+    async def report(self, _rng: random.Random) -> None:
+        await self.request(
+            "report",
+            lambda: self.client.get("/api/v2/report/nights/", headers=self.headers(self.treasurer_token)),
+        )
+
+    @staticmethod
+    def headers(token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+
+def count_statement(*_args: Any) -> None:
+    counter = statements_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+async def populate(tills: int, requests: int) -> BarNight:
+    """
+    Insert the accounts, the treasury and enough stock for the whole night.
+    """
+    consumables = tills * requests
+    async with get_db.get_session() as session:
+        await session.execute(insert(Treasury).values(total_amount=0, cash_amount=0, lydia_rate=0.015, version=1))
+        await session.execute(
+            insert(Account),
+            [
+                {
+                    "username": scope.value,
+                    "password": get_password_hash(PASSWORD),
+                    "scope": scope,
+                    "is_active": True,
+                    "last_name": "Benchmark",
+                    "first_name": scope.value,
+                    "promotion_year": 2024,
+                }
+                for scope in (SecurityScopes.STAFF, SecurityScopes.TREASURER)
+            ],
+        )
+        await session.execute(insert(DrinkItem), [{"name": f"drink {i}"} for i in range(DRINKS)])
+        barrel_ids = (
+            await session.scalars(
+                insert(Barrel).returning(Barrel.id),
+                [
+                    {
+                        "drink_item_id": 1 + i % DRINKS,
+                        "buy_price": 50,
+                        "sell_price": 2,
+                        "is_mounted": i < MOUNTED_BARRELS,
+                        "empty_or_solded": False,
+                    }
+                    for i in range(2 * MOUNTED_BARRELS)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(ConsumableItem), [{"name": f"item {i}", "icon": IconName.FOOD} for i in range(ITEMS)]
+        )
+        consumable_ids = (
+            await session.scalars(
+                insert(Consumable).returning(Consumable.id),
+                [
+                    {"consumable_item_id": 1 + i % ITEMS, "buy_price": 1, "sell_price": 2, "solded": False}
+                    for i in range(consumables)
+                ],
+            )
+        ).all()
+        non_inventoried_item_ids = (
+            await session.scalars(
+                insert(NonInventoriedItem).returning(NonInventoriedItem.id),
+                [
+                    {"name": f"item {i}", "trade": TradeType.SALE, "icon": IconName.MISC, "sell_price": 1}
+                    for i in range(ITEMS)
+                ],
+            )
+        ).all()
+        await session.commit()
+
+    night = BarNight(
+        client=AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark"),
+        mounted_barrels=sorted(barrel_ids)[:MOUNTED_BARRELS],
+        cellar_barrels=sorted(barrel_ids)[MOUNTED_BARRELS:],
+        consumables=list(consumable_ids),
+        non_inventoried_items=list(non_inventoried_item_ids),
+    )
+    night.staff_token = (await night.login(SecurityScopes.STAFF.value)).json()["access_token"]
+    night.treasurer_token = (await night.login(SecurityScopes.TREASURER.value)).json()["access_token"]
+    # The setup is not part of the measures
+    night.samples.clear()
+    return night
+
+
+async def till(night: BarNight, seed: int, requests: int) -> None:
+    rng = random.Random(seed)
+    actions = {
+        "cart": night.cart,
+        "mount": night.mount,
+        "listing": night.listing,
+        "report": night.report,
+        "login": lambda rng: night.login(rng.choice([SecurityScopes.STAFF.value, SecurityScopes.TREASURER.value])),
+    }
+    for scenario in rng.choices(list(SCENARIOS), weights=list(SCENARIOS.values()), k=requests):
+        await actions[scenario](rng)
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """
+    :return: The nearest-rank percentile of the values
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples: Samples, duration: float) -> Result:
+    return Result(
+        requests=len(samples.latencies),
+        errors=samples.errors,
+        throughput=len(samples.latencies) / duration,
+        p50=percentile(samples.latencies, 50) * 1000,
+        p95=percentile(samples.latencies, 95) * 1000,
+        p99=percentile(samples.latencies, 99) * 1000,
+        statements=sum(samples.statements) / len(samples.statements),
+    )
+
+
+def compare(results: dict[str, Result], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    :return: The regressions of the results compared with the baseline
+    """
+    regressions = []
+    for scenario, result in results.items():
+        if result.errors:
+            regressions.append(f"{scenario}: {result.errors} failed requests")
+        reference = baseline["scenarios"].get(scenario)
+        if reference is None:
+            continue
+        # The statements do not depend on the machine, only the cache hits make them vary between runs
+        if result.statements > reference["statements"] * 1.05:
+            regressions.append(
+                f"{scenario}: {result.statements:.1f} SQL statements per request, {reference['statements']:.1f} before"
+            )
+        # The tail latencies of the rare scenarios are too noisy to be compared
+        if result.p50 > reference["p50"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p50 of {result.p50:.1f} ms, {reference['p50']:.1f} ms before")
+    return regressions
+
+
+async def setup_database(directory: str, reset_postgres: bool) -> str:
+    """
+    :return: The name of the database used
+    """
+    database = get_db
+    if isinstance(database, SqliteDatabase):
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        return "sqlite"
+
+    assert isinstance(database, PostgresDatabase)
+    if not reset_postgres:
+        sys.exit(f"The {settings.POSTGRES_DB} database would be dropped, run again with --reset-postgres")
+    await database.drop()
+    database.setup()
+    async with database.async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return "postgresql"
+
+
+async def run(arguments: argparse.Namespace) -> None:
+    # The debug logs of the requests would be the bottleneck
+    logging.getLogger("app").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        database_name = await setup_database(directory, arguments.reset_postgres)
+        night = await populate(arguments.tills, arguments.requests)
+        event.listen(get_db.async_engine.sync_engine, "before_cursor_execute", count_statement)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(till(night, seed, arguments.requests) for seed in range(arguments.tills)))
+        duration = time.perf_counter() - start
+
+        event.remove(get_db.async_engine.sync_engine, "before_cursor_execute", count_statement)
+        await night.client.aclose()
+        await get_db.shutdown()
+
+    results = {scenario: summarize(night.samples[scenario], duration) for scenario in SCENARIOS}
+    results["total"] = summarize(
+        Samples(
+            latencies=[latency for samples in night.samples.values() for latency in samples.latencies],
+            statements=[count for samples in night.samples.values() for count in samples.statements],
+            errors=sum(samples.errors for samples in night.samples.values()),
+        ),
+        duration,
+    )
+
+    print(f"{arguments.tills} tills, {arguments.requests} requests each, on {database_name}, in {duration:.1f} s")
+    print(
+        f"{'scenario':>9} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} SQL/req"
+    )
+    for scenario, result in results.items():
+        print(
+            f"{scenario:>9} {result.requests:>8} {result.errors:>6} {result.throughput:>8.1f} "
+            f"{result.p50:>7.1f} {result.p95:>7.1f} {result.p99:>7.1f} {result.statements:>7.1f}"
+        )
+
+    if arguments.save_baseline:
+        baseline = {
+            "database": database_name,
+            "tills": arguments.tills,
+            "requests": arguments.requests,
+            "duration": duration,
+            "scenarios": {scenario: asdict(result) for scenario, result in results.items()},
+        }
+        arguments.save_baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline saved to {arguments.save_baseline}")
+
+    if arguments.baseline:
+        regressions = compare(results, json.loads(arguments.baseline.read_text()), arguments.tolerance)
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join(f"- {regression}" for regression in regressions))
+        print(f"No regression compared with {arguments.baseline}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        prog="python -m benchmarks.bar_night",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--tills", type=int, default=4, help="Number of concurrent tills")
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests of each till")
+    parser.add_argument("--save-baseline", type=Path, help="Save the results as a JSON baseline to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare the results with the JSON baseline of this file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Relative growth of the median latency of a scenario tolerated by the comparison with the baseline",
+    )
+    parser.add_argument("--reset-postgres", action="store_true", help="Allow dropping the PostgreSQL database")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments))
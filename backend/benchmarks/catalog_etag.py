@@ -0,0 +1,66 @@
+"""
+Benchmark of the repeated loads of the drink catalog.
+
+The catalog used to be read from the database and serialized on each request, it is now cached by table version
+and a request with a matching `If-None-Match` header is answered with a 304, see `CatalogCache`.
+The "before" run clears the cache before each request, the "cached" run repeats the same request
+and the "not modified" run sends the `ETag` of the first response back.
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.core.responses import catalog_cache
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_current_active_account, get_db
+from app.main import app
+from app.models.drink_item import DrinkItem
+
+
+async def run(drinks: int, requests: int) -> None:
+    # The debug logs of the requests would be the bottleneck
+    logging.getLogger("app").setLevel(logging.INFO)
+    app.dependency_overrides[get_current_active_account] = lambda: None
+    with tempfile.TemporaryDirectory() as directory:
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        async with database.get_session() as session:
+            await session.execute(insert(DrinkItem), [{"name": f"drink {i}"} for i in range(drinks)])
+            await session.commit()
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+            etag = (await client.get("/api/v1/drink/")).headers["ETag"]
+            for name, headers, clear in (
+                ("before", {}, True),
+                ("cached", {}, False),
+                ("not modified", {"If-None-Match": etag}, False),
+            ):
+                start = time.perf_counter()
+                for _ in range(requests):
+                    if clear:
+                        catalog_cache.clear()
+                    response = await client.get("/api/v1/drink/", headers=headers)
+                    assert response.status_code == (304 if headers else 200)
+                duration = time.perf_counter() - start
+                print(f"{name:>12}: {duration / requests * 1000:6.2f} ms per request, {len(response.content)} bytes")
+
+        await database.shutdown()
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.catalog_etag")
+    parser.add_argument("--drinks", type=int, default=100, help="Number of drink items in the catalog")
+    parser.add_argument("--requests", type=int, default=1_000, help="Number of requests of each run")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.drinks, arguments.requests))
@@ -0,0 +1,90 @@
+"""
+Benchmark of the normalization of the datetimes read from the database.
+
+The datetimes used to be patched after each query by a reflection pass over every attribute of every row,
+they are now normalized by the `UTCDateTime` column type when the rows are read.
+The "before" timing is the query followed by the former reflection pass, the "after" timing is the query alone.
+"""
+
+import argparse
+import asyncio
+import datetime
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.core.types import PaymentMethod, Status, TradeType, TransactionType
+from app.crud.base import loader_profile
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.db.databases.sqlite import SqliteDatabase
+from app.models.transaction import Transaction
+
+
+def reflection_pass(obj: Any) -> Any:
+    """
+    The former `patch_timezone_sqlite`, run on each row returned by the CRUD methods.
+    """
+    for attr in dir(obj):
+        if not attr.startswith("_"):
+            value = getattr(obj, attr)
+            if isinstance(value, datetime.datetime):
+                setattr(obj, attr, value.replace(tzinfo=datetime.timezone.utc))
+    return obj
+
+
+async def run(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database = SqliteDatabase()
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        async with database.get_session() as session:
+            await session.execute(
+                insert(Transaction),
+                [
+                    {
+                        "datetime": now - datetime.timedelta(minutes=i),
+                        "payment_method": PaymentMethod.CARD,
+                        "trade": TradeType.SALE,
+                        "type": TransactionType.COMMERCE,
+                        "status": Status.VALIDATED,
+                        "amount": 1,
+                        "treasury_id": 1,
+                    }
+                    for i in range(rows)
+                ],
+            )
+            await session.commit()
+
+        options = loader_profile()
+        timings: dict[str, float] = {"before": float("inf"), "after": float("inf")}
+        for _ in range(repeat):
+            for name in timings:
+                # A new session for each run, so the rows are not taken from the identity map
+                async with database.get_session() as session:
+                    start = time.perf_counter()
+                    transactions = await crud_transaction.query(session, limit=None, options=options)
+                    if name == "before":
+                        transactions = [reflection_pass(transaction) for transaction in transactions]
+                    timings[name] = min(timings[name], time.perf_counter() - start)
+
+                assert len(transactions) == rows
+                assert transactions[0].datetime.tzinfo is not None
+
+        await database.async_engine.dispose()
+
+    for name, timing in timings.items():
+        print(f"{name:>6}: {timing * 1000:8.1f} ms for {rows} rows, {timing / rows * 1e6:6.2f} us per row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.datetime_column")
+    parser.add_argument("--rows", type=int, default=10_000, help="Number of rows to read")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the best one is kept")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.rows, arguments.repeat))
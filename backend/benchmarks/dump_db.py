@@ -0,0 +1,126 @@
+"""
+Benchmark of the database dump on a generated multi-year dataset.
+
+The dump used to load every table in memory and to write a single indented JSON file, it can now be streamed
+to one NDJSON file per table, read from the database by batches.
+The "before" run is the JSON dump, the "after" runs are the streamed dumps, uncompressed and gzipped.
+Each dump is run twice: once to time it, once under tracemalloc to measure its peak memory.
+"""
+
+import argparse
+import asyncio
+import datetime
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert
+
+from app.commands.dump_db import dump_db, dump_db_stream
+from app.core.types import PaymentMethod, Status, TradeType, TransactionType
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_db
+from app.models.barrel import Barrel
+from app.models.drink_item import DrinkItem
+from app.models.glass import Glass
+from app.models.transaction import Transaction
+from app.models.treasury import Treasury
+
+
+async def populate(database: SqliteDatabase, years: int, transactions_per_day: int, glasses: int) -> int:
+    """
+    Insert `years` years of sales, each sale with `glasses` glasses from the same barrel.
+
+    :return: The number of rows inserted
+    """
+    start = datetime.datetime(2020, 1, 1, 18, tzinfo=datetime.timezone.utc)
+    days = 365 * years
+    async with database.get_session() as session:
+        await session.execute(insert(Treasury).values(total_amount=0, cash_amount=0, lydia_rate=0.015, version=1))
+        await session.execute(insert(DrinkItem).values(name="benchmark"))
+        await session.execute(
+            insert(Barrel).values(drink_item_id=1, buy_price=50, sell_price=2, is_mounted=True, empty_or_solded=False)
+        )
+        for day in range(days):
+            transaction_ids = (
+                await session.scalars(
+                    insert(Transaction).returning(Transaction.id),
+                    [
+                        {
+                            "datetime": start + datetime.timedelta(days=day, seconds=i),
+                            "payment_method": PaymentMethod.CARD,
+                            "trade": TradeType.SALE,
+                            "type": TransactionType.COMMERCE,
+                            "status": Status.VALIDATED,
+                            "amount": 2 * glasses,
+                            "treasury_id": 1,
+                        }
+                        for i in range(transactions_per_day)
+                    ],
+                )
+            ).all()
+            await session.execute(
+                insert(Glass),
+                [
+                    {"barrel_id": 1, "transaction_id": transaction_id, "transaction_sell_price": 2}
+                    for transaction_id in transaction_ids
+                    for _ in range(glasses)
+                ],
+            )
+        await session.commit()
+    return 3 + days * transactions_per_day * (1 + glasses)
+
+
+async def measure(dump: Callable[[], Awaitable[object]]) -> tuple[float, int]:
+    """
+    :return: The duration of the dump, and its peak memory allocated by Python
+    """
+    start = time.perf_counter()
+    await dump()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    await dump()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.iterdir()) if path.is_dir() else path.stat().st_size
+
+
+async def run(years: int, transactions_per_day: int, glasses: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory)
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(output / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        rows = await populate(database, years, transactions_per_day, glasses)
+
+        runs: dict[str, tuple[Path, Callable[[], Awaitable[object]]]] = {
+            "before": (output / "dump.json", lambda: dump_db(str(output / "dump.json"))),
+            "after": (output / "dump", lambda: dump_db_stream(str(output / "dump"))),
+            "gzip": (output / "dump_gz", lambda: dump_db_stream(str(output / "dump_gz"), compression="gzip")),
+        }
+        for name, (path, dump) in runs.items():
+            duration, peak = await measure(dump)
+            print(
+                f"{name:>6}: {rows} rows in {duration:6.2f} s, {rows / duration:9.0f} rows/s,"
+                f" peak memory {peak / 2**20:7.1f} MiB, output {size(path) / 2**20:7.1f} MiB"
+            )
+
+        await database.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.dump_db")
+    parser.add_argument("--years", type=int, default=3, help="Number of years of sales")
+    parser.add_argument("--transactions-per-day", type=int, default=100, help="Number of sales per day")
+    parser.add_argument("--glasses", type=int, default=2, help="Number of glasses per sale")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.years, arguments.transactions_per_day, arguments.glasses))
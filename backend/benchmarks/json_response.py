@@ -0,0 +1,136 @@
+"""
+Benchmark of the JSON responses of the listing endpoints.
+
+The ORM objects returned by the endpoints used to be validated against the response model by FastAPI, dumped to
+Python objects and encoded by `json`, they are now validated and serialized to bytes by pydantic, see
+`ModelResponse`. The "before" endpoint returns the ORM objects, the "after" endpoint returns a `ModelResponse`,
+both list the same rows with the same loader options.
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.api.v2.endpoints.barrel import barrel_loader
+from app.api.v2.endpoints.transaction import transaction_loader
+from app.core.responses import ModelResponse
+from app.core.types import PaymentMethod, Status, TradeType, TransactionType
+from app.crud.crud_barrel import barrel as crud_barrel
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import DBDependency, get_db
+from app.models.barrel import Barrel
+from app.models.drink_item import DrinkItem
+from app.models.transaction import Transaction
+from app.models.treasury import Treasury
+from app.schemas.v2 import barrel as barrel_schema
+from app.schemas.v2 import transaction as transaction_schema
+
+app = FastAPI()
+
+
+@app.get("/before/barrel/", response_model=list[barrel_schema.Barrel])
+async def barrels_before(db: DBDependency) -> Any:
+    return await crud_barrel.query(db, limit=None, options=barrel_loader)
+
+
+@app.get("/after/barrel/", response_model=list[barrel_schema.Barrel])
+async def barrels_after(db: DBDependency) -> Any:
+    return ModelResponse(list[barrel_schema.Barrel], await crud_barrel.query(db, limit=None, options=barrel_loader))
+
+
+@app.get("/before/transaction/", response_model=list[transaction_schema.Transaction])
+async def transactions_before(db: DBDependency) -> Any:
+    return await crud_transaction.query(db, limit=None, options=transaction_loader)
+
+
+@app.get("/after/transaction/", response_model=list[transaction_schema.Transaction])
+async def transactions_after(db: DBDependency) -> Any:
+    return ModelResponse(
+        list[transaction_schema.Transaction],
+        await crud_transaction.query(db, limit=None, options=transaction_loader),
+    )
+
+
+async def populate(database: SqliteDatabase, rows: int) -> None:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with database.get_session() as session:
+        await session.execute(insert(Treasury).values(total_amount=0, cash_amount=0, lydia_rate=0.015, version=1))
+        await session.execute(insert(DrinkItem), [{"name": f"drink {i}"} for i in range(10)])
+        await session.execute(
+            insert(Barrel),
+            [
+                {
+                    "drink_item_id": 1 + i % 10,
+                    "buy_price": 50,
+                    "sell_price": 2,
+                    "is_mounted": False,
+                    "empty_or_solded": False,
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.execute(
+            insert(Transaction),
+            [
+                {
+                    "datetime": now - datetime.timedelta(minutes=i),
+                    "payment_method": PaymentMethod.CARD,
+                    "trade": TradeType.SALE,
+                    "type": TransactionType.COMMERCE,
+                    "status": Status.VALIDATED,
+                    "amount": 2,
+                    "treasury_id": 1,
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+
+
+async def run(rows: int, repeat: int) -> None:
+    # The debug logs of the requests would be the bottleneck
+    logging.getLogger("app").setLevel(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        await populate(database, rows)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+            for resource in ("barrel", "transaction"):
+                timings: dict[str, float] = {"before": float("inf"), "after": float("inf")}
+                bodies: dict[str, Any] = {}
+                for _ in range(repeat):
+                    for name in timings:
+                        start = time.perf_counter()
+                        response = await client.get(f"/{name}/{resource}/")
+                        timings[name] = min(timings[name], time.perf_counter() - start)
+                        assert response.status_code == 200
+                        bodies[name] = response.json()
+
+                assert len(bodies["after"]) == rows
+                assert bodies["before"] == bodies["after"]
+                for name, timing in timings.items():
+                    print(f"{resource:>11} {name:>6}: {timing * 1000:8.1f} ms for {rows} rows")
+
+        await database.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.json_response")
+    parser.add_argument("--rows", type=int, default=5_000, help="Number of rows listed")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the best one is kept")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.rows, arguments.repeat))
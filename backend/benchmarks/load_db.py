@@ -0,0 +1,80 @@
+"""
+Benchmark of the database load on a generated dataset.
+
+The dump used to be loaded one row at a time, with the datetimes parsed per row and per column,
+it is now loaded by batches with converters built once per table.
+The "before" run is the former row by row load, the "after" runs are the bulk loads of the JSON dump
+and of the streamed dump.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.commands.dump_db import dump_db, dump_db_stream
+from app.commands.load_db import load_db
+from app.db.base_class import Base
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_db
+from benchmarks.dump_db import populate
+
+
+async def load_row_by_row(input_file: str) -> None:
+    """
+    The former `load_db`, without the checks of the dump columns.
+    """
+    with open(input_file, encoding="utf-8") as f:
+        data = json.load(f)
+
+    async with get_db.get_session() as session:
+        tables = Base.metadata.sorted_tables
+        for table in reversed(tables):
+            await session.execute(table.delete())
+
+        for table in tables:
+            for row in data[table.name]["data"]:
+                for column in table.columns:
+                    if isinstance(row[column.name], str) and column.type.python_type == datetime.datetime:
+                        row[column.name] = datetime.datetime.fromisoformat(row[column.name])
+                await session.execute(table.insert().values(**row))
+
+        await session.commit()
+
+
+async def run(years: int, transactions_per_day: int, glasses: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory)
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(output / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        rows = await populate(database, years, transactions_per_day, glasses)
+        await dump_db(str(output / "dump.json"))
+        await dump_db_stream(str(output / "dump"))
+
+        runs = {
+            "before": lambda: load_row_by_row(str(output / "dump.json")),
+            "json": lambda: load_db(str(output / "dump.json")),
+            "ndjson": lambda: load_db(str(output / "dump")),
+        }
+        for name, load in runs.items():
+            start = time.perf_counter()
+            await load()
+            duration = time.perf_counter() - start
+            print(f"{name:>6}: {rows} rows in {duration:6.2f} s, {rows / duration:9.0f} rows/s")
+
+        await database.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.load_db")
+    parser.add_argument("--years", type=int, default=1, help="Number of years of sales")
+    parser.add_argument("--transactions-per-day", type=int, default=100, help="Number of sales per day")
+    parser.add_argument("--glasses", type=int, default=2, help="Number of glasses per sale")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.years, arguments.transactions_per_day, arguments.glasses))
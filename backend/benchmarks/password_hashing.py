@@ -0,0 +1,111 @@
+"""
+Benchmark of the latency of unrelated requests during a burst of logins.
+
+The passwords used to be checked by bcrypt on the event loop, they are now checked in the password pool.
+The "before" run checks them inline on the event loop, the "after" run uses the password pool.
+During each run, a burst of concurrent logins is sent while `/health` is polled, the latencies of the
+health requests are reported.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any, Callable
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core import security
+from app.core.config import settings
+from app.crud.crud_account import account as crud_account
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_db
+from app.main import app
+from app.schemas.account import AccountCreate
+
+
+class InlineExecutor(Executor):
+    """
+    Executor running the functions right away in the calling thread, i.e. on the event loop.
+    """
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+async def poll_health(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    latencies: list[float] = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/v1/health")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        await asyncio.sleep(0.001)
+    return latencies
+
+
+async def login(client: AsyncClient, password: str) -> None:
+    response = await client.post("/api/v1/auth/login/", data={"username": "benchmark", "password": password})
+    assert response.status_code == 200
+
+
+async def burst(client: AsyncClient, logins: int) -> tuple[list[float], float]:
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll_health(client, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login(client, settings.BASE_ACCOUNT_PASSWORD) for _ in range(logins)))
+    duration = time.perf_counter() - start
+    stop.set()
+    return await poller, duration
+
+
+async def run(logins: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+
+        async with database.get_session() as session:
+            await crud_account.create(
+                session,
+                obj_in=AccountCreate(
+                    username="benchmark",
+                    last_name="bench",
+                    first_name="mark",
+                    promotion_year=2021,
+                    password=settings.BASE_ACCOUNT_PASSWORD,
+                ),
+            )
+            await crud_account.update(
+                session, db_obj=(await crud_account.query(session))[0], obj_in={"is_active": True}
+            )
+
+        pool_executor = security.password_executor
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+            for name, executor in (("before", InlineExecutor()), ("after", pool_executor)):
+                security.password_executor = executor
+                latencies, duration = await burst(client, logins)
+                latencies.sort()
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                print(
+                    f"{name:>6}: {logins} logins in {duration * 1000:7.1f} ms, {len(latencies):4} health requests,"
+                    f" p50 {statistics.median(latencies) * 1000:6.1f} ms, p99 {p99 * 1000:6.1f} ms,"
+                    f" max {latencies[-1] * 1000:6.1f} ms"
+                )
+        security.password_executor = pool_executor
+
+        await database.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.password_hashing")
+    parser.add_argument("--logins", type=int, default=16, help="Number of concurrent logins")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.logins))
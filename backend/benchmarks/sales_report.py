@@ -0,0 +1,70 @@
+"""
+Benchmark of the revenue by night on a generated dataset.
+
+The revenue by night used to be computed by the client from the whole list of transactions,
+it is now read from the sales rollup, which is rebuilt once before the "after" run.
+The "before" run lists the transactions and sums them by night, the "after" run reads the report.
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+
+from app.crud.crud_sales_rollup import get_night, sales_rollup
+from app.db.databases.sqlite import SqliteDatabase
+from app.dependencies import get_current_active_account, get_db
+from app.main import app
+from benchmarks.dump_db import populate
+
+
+def report(name: str, nights: int, duration: float, size: int) -> None:
+    print(f"{name}: {nights} nights in {duration * 1000:8.1f} ms, response of {size / 2**10:8.1f} KiB")
+
+
+async def run(years: int, transactions_per_day: int, glasses: int) -> None:
+    # The debug logs of the requests would be the bottleneck
+    logging.getLogger("app").setLevel(logging.INFO)
+    app.dependency_overrides[get_current_active_account] = lambda: None
+    with tempfile.TemporaryDirectory() as directory:
+        database = get_db
+        assert isinstance(database, SqliteDatabase)
+        database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"))
+        await database.create_all(no_drop=True)
+        rows = await populate(database, years, transactions_per_day, glasses)
+
+        start = time.perf_counter()
+        async with database.get_session() as session:
+            rollup_rows = await sales_rollup.rebuild(session)
+        print(f"rebuild: {rows} rows rolled up into {rollup_rows} rows in {time.perf_counter() - start:6.2f} s")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+            start = time.perf_counter()
+            response = await client.get("/api/v2/transaction/")
+            nights: dict[str, float] = defaultdict(float)
+            for transaction in response.json():
+                nights[get_night(datetime.fromisoformat(transaction["datetime"])).isoformat()] += transaction["amount"]
+            report(" before", len(nights), time.perf_counter() - start, len(response.content))
+
+            start = time.perf_counter()
+            response = await client.get("/api/v2/report/nights/")
+            report("  after", len(response.json()), time.perf_counter() - start, len(response.content))
+
+        await database.shutdown()
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.sales_report")
+    parser.add_argument("--years", type=int, default=1, help="Number of years of sales")
+    parser.add_argument("--transactions-per-day", type=int, default=100, help="Number of sales per day")
+    parser.add_argument("--glasses", type=int, default=2, help="Number of glasses per sale")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.years, arguments.transactions_per_day, arguments.glasses))
@@ -0,0 +1,135 @@
+"""
+Benchmark of the v2 sale flow on SQLite under each pragma profile.
+
+Several tills sell carts concurrently through the API while the transactions are listed in a loop,
+the number of sales per second and the latency of the listings are reported for each profile of
+`SQLITE_PRAGMA_PROFILES`, with the foreign keys enforced.
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.types import IconName, PaymentMethod, TradeType
+from app.crud.crud_account import account as crud_account
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.db.databases.sqlite import SQLITE_PRAGMA_PROFILES, SqliteDatabase
+from app.dependencies import get_db
+from app.main import app
+from app.models.barrel import Barrel
+from app.models.drink_item import DrinkItem
+from app.models.non_inventoried_item import NonInventoriedItem
+from app.models.treasury import Treasury
+from app.schemas.account import AccountCreate
+
+
+async def populate(database: SqliteDatabase) -> None:
+    async with database.get_session() as session:
+        await session.execute(insert(Treasury).values(total_amount=0, cash_amount=0, lydia_rate=0.015, version=1))
+        await session.execute(insert(DrinkItem).values(name="benchmark"))
+        await session.execute(
+            insert(Barrel).values(drink_item_id=1, buy_price=50, sell_price=2, is_mounted=True, empty_or_solded=False)
+        )
+        await session.execute(
+            insert(NonInventoriedItem).values(name="benchmark", icon=IconName.MISC, trade=TradeType.SALE, sell_price=1)
+        )
+        await session.commit()
+
+        await crud_account.create(
+            session,
+            obj_in=AccountCreate(
+                username="benchmark",
+                last_name="bench",
+                first_name="mark",
+                promotion_year=2021,
+                password=settings.BASE_ACCOUNT_PASSWORD,
+            ),
+        )
+        await crud_account.update(session, db_obj=(await crud_account.query(session))[0], obj_in={"is_active": True})
+
+
+async def till(client: AsyncClient, stop: asyncio.Event) -> tuple[int, int]:
+    sales = errors = 0
+    while not stop.is_set():
+        response = await client.post(
+            "/api/v2/transaction/cart/",
+            json={
+                "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "paymentMethod": PaymentMethod.CASH.value,
+                "trade": TradeType.SALE.value,
+                "glasses": [{"barrelId": 1, "quantity": 2}],
+                "nonInventorieds": [{"nonInventoriedItemId": 1, "quantity": 1}],
+            },
+        )
+        if response.status_code == 200:
+            sales += 1
+        else:
+            errors += 1
+    return sales, errors
+
+
+async def reader(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    latencies: list[float] = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/v2/transaction/", params={"limit": 50})
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return latencies
+
+
+async def run(tills: int, duration: float) -> None:
+    # The debug logs of the requests would be the bottleneck
+    logging.getLogger("app").setLevel(logging.INFO)
+    for profile in SQLITE_PRAGMA_PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            database = get_db
+            assert isinstance(database, SqliteDatabase)
+            database.setup("sqlite+aiosqlite:///" + str(Path(directory) / "benchmark.db"), profile=profile)
+            await database.create_all(no_drop=True)
+            crud_treasury.invalidate()
+            crud_account.invalidate()
+            await populate(database)
+
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+                response = await client.post(
+                    "/api/v1/auth/login/",
+                    data={"username": "benchmark", "password": settings.BASE_ACCOUNT_PASSWORD},
+                )
+                client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+                stop = asyncio.Event()
+                tasks = [asyncio.create_task(till(client, stop)) for _ in range(tills)]
+                listing = asyncio.create_task(reader(client, stop))
+                await asyncio.sleep(duration)
+                stop.set()
+                results = await asyncio.gather(*tasks)
+                latencies = sorted(await listing)
+
+            await database.shutdown()
+
+        sales = sum(sales for sales, _ in results)
+        errors = sum(errors for _, errors in results)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"{profile:>8}: {sales / duration:7.1f} sales/s, {errors} errors,"
+            f" listing p50 {statistics.median(latencies) * 1000:6.1f} ms, p99 {p99 * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, prog="python -m benchmarks.sqlite_pragmas")
+    parser.add_argument("--tills", type=int, default=4, help="Number of tills selling concurrently")
+    parser.add_argument("--duration", type=float, default=10, help="Number of seconds of sales per profile")
+    arguments = parser.parse_args()
+
+    asyncio.run(run(arguments.tills, arguments.duration))
@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 
+from app.dependencies import get_current_active_account, get_db
+
 
 def test_root(client: TestClient):
     response = client.get("/api/v1/")
@@ -13,6 +15,25 @@ def test_health(client: TestClient):
     assert response.json() == {"status": "OK"}
 
 
+def test_pool(client: TestClient):
+    get_db.setup()
+    client.app.dependency_overrides[get_current_active_account] = lambda: None  # type: ignore
+
+    response = client.get("/api/v1/pool")
+    client.app.dependency_overrides.clear()  # type: ignore
+    assert response.status_code == 200
+    assert response.json()["poolClass"] == "AsyncAdaptedQueuePool"
+    assert response.json()["checkedOut"] == 0
+
+
+def test_pool_unauthenticated(client: TestClient):
+    get_db.setup()
+    client.app.dependency_overrides.clear()  # type: ignore
+
+    response = client.get("/api/v1/pool")
+    assert response.status_code == 401
+
+
 def test_error(client: TestClient):
     response = client.get("/api/v1/error")
     assert response.status_code == 500
@@ -81,6 +81,23 @@ class TestAccount(BaseTest):
         assert account_in_db is not None
         assert account_in_db.username == new_account_create.username
 
+    def test_create_account_weak_password(self):
+        # Act
+        response = self._client.post(
+            "/api/v1/account/",
+            json={
+                "username": "testuser2",
+                "lastName": "test",
+                "firstName": "user",
+                "promotionYear": 2021,
+                "password": "password",
+            },
+        )
+
+        # Assert
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "password"]
+
     async def test_create_account_username_already_exists(self):
         # Arrange
         new_account_create = AccountCreate(
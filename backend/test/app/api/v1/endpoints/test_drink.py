@@ -32,6 +32,45 @@ class TestDrink(BaseTest):
         assert response.status_code == 200
         assert response.json() == [self.drink_db.model_dump(by_alias=True)]
 
+    def test_read_drinks_not_modified(self):
+        # Arrange
+        etag = self._client.get("/api/v1/drink/").headers["ETag"]
+
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v1/drink/", headers={"If-None-Match": etag})
+
+        # Assert
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert statements == []
+
+    def test_read_drinks_cached(self):
+        # Arrange
+        first = self._client.get("/api/v1/drink/")
+
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v1/drink/")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.content == first.content
+        assert statements == []
+
+    def test_read_drinks_modified(self):
+        # Arrange
+        etag = self._client.get("/api/v1/drink/").headers["ETag"]
+        self._client.post("/api/v1/drink/", json=DrinkItemCreate(name="test_name2").model_dump(by_alias=True))
+
+        # Act
+        response = self._client.get("/api/v1/drink/", headers={"If-None-Match": etag})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert [drink["name"] for drink in response.json()] == ["test_name", "test_name2"]
+
     def test_read_drink(self):
         # Arrange
         # Act
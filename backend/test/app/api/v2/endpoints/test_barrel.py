@@ -12,6 +12,7 @@ from app.schemas.treasury import TreasuryCreate
 from app.schemas.v2.barrel import (
     Barrel,
     BarrelCreate,
+    BarrelCreateBulk,
     BarrelUpdateModify,
     BarrelUpdateSale,
 )
@@ -88,6 +89,48 @@ class TestBarrel(BaseTest):
         assert response.status_code == 200
         assert response.json() == [{**self.barrel_db.model_dump(by_alias=True), "quantity": 2}]
 
+    async def test_read_distinct_barrels_several_drinks(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            other_drink_db = DrinkItem.model_validate(
+                await crud_drink.create(session, obj_in=DrinkItemCreate(name="other"))
+            )
+            other_barrel_create = self.barrel_create.model_copy(update={"drink_item_id": other_drink_db.id})
+            other_barrel_db = Barrel.model_validate(await crud_barrel.create(session, obj_in=other_barrel_create))
+            await crud_barrel.create(session, obj_in=other_barrel_create)
+            await crud_barrel.create(session, obj_in=self.barrel_create)
+            await crud_barrel.create(session, obj_in=other_barrel_create)
+
+        # Act
+        response = self._client.get("/api/v2/barrel/distincts/")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [
+            {**self.barrel_db.model_dump(by_alias=True), "quantity": 2},
+            {**other_barrel_db.model_dump(by_alias=True), "quantity": 3},
+        ]
+
+    def test_read_barrels_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v2/barrel/")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(statements) == 1
+
+    def test_read_distinct_barrels_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v2/barrel/distincts/")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(statements) == 1
+
     async def test_read_distinct_barrels_mounted(self):
         # Arrange
         async with get_db.get_session() as session:
@@ -247,3 +290,62 @@ class TestBarrel(BaseTest):
 
         # Assert
         assert response.status_code == 400
+
+    async def test_create_barrels(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            transaction = TransactionCommerceCreate(
+                trade=TradeType.PURCHASE,
+                payment_method=PaymentMethod.CARD,
+                datetime=datetime.datetime.now(),
+            )
+            transaction_db = await crud_transaction.create_v2(session, obj_in=transaction)
+
+        barrels_create = [
+            BarrelCreateBulk(
+                drink_item_id=self.drink_db.id, buy_price=10, sell_price=2, transactionId=transaction_db.id, quantity=3
+            ),
+            BarrelCreateBulk(
+                drink_item_id=self.drink_db.id, buy_price=20, sell_price=4, transactionId=transaction_db.id
+            ),
+        ]
+
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.post(
+                "/api/v2/barrel/bulk/",
+                json=[
+                    # The quantity is not dumped, as it is not a column of the barrels
+                    barrels_create[0].model_dump(by_alias=True) | {"quantity": barrels_create[0].quantity},
+                    barrels_create[1].model_dump(by_alias=True),
+                ],
+            )
+
+        # Assert
+        assert response.status_code == 200
+        assert [barrel["buyPrice"] for barrel in response.json()] == [10, 10, 10, 20]
+        assert all(barrel["name"] == self.drink_create.name for barrel in response.json())
+        assert len([statement for statement in statements if statement.startswith("INSERT")]) == 1
+        async with get_db.get_session() as session:
+            barrels_in_db = await crud_barrel.query(session, transaction_id_purchase=transaction_db.id)
+        assert len(barrels_in_db) == 4
+
+    async def test_create_barrels_transaction_not_purchase(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            transaction = TransactionCommerceCreate(
+                trade=TradeType.SALE,
+                payment_method=PaymentMethod.CARD,
+                datetime=datetime.datetime.now(),
+            )
+            transaction_db = await crud_transaction.create_v2(session, obj_in=transaction)
+
+        barrel_create = BarrelCreateBulk(
+            drink_item_id=self.drink_db.id, buy_price=10, sell_price=2, transactionId=transaction_db.id
+        )
+
+        # Act
+        response = self._client.post("/api/v2/barrel/bulk/", json=[barrel_create.model_dump(by_alias=True)])
+
+        # Assert
+        assert response.status_code == 400
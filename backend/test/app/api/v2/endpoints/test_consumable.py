@@ -12,6 +12,7 @@ from app.schemas.treasury import TreasuryCreate
 from app.schemas.v2.consumable import (
     Consumable,
     ConsumableCreate,
+    ConsumableCreateBulk,
     ConsumableUpdateModify,
     ConsumableUpdateSale,
 )
@@ -263,3 +264,69 @@ class TestConsumable(BaseTest):
             consumable_in_db = Consumable.model_validate(await crud_consumable.read(session, id=response.json()["id"]))
         assert consumable_in_db.name == self.consumable_item_create.name
         assert response.json() == consumable_in_db.model_dump(by_alias=True)
+
+    async def test_create_consumables(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            transaction = TransactionCommerceCreate(
+                trade=TradeType.PURCHASE,
+                payment_method=PaymentMethod.CARD,
+                datetime=datetime.datetime.now(),
+            )
+            transaction_db = await crud_transaction.create_v2(session, obj_in=transaction)
+
+        consumables_create = [
+            ConsumableCreateBulk(
+                consumable_item_id=self.consumable_item_db.id,
+                buy_price=10,
+                sell_price=2,
+                transactionId=transaction_db.id,
+                quantity=3,
+            ),
+            ConsumableCreateBulk(
+                consumable_item_id=self.consumable_item_db.id,
+                buy_price=20,
+                sell_price=4,
+                transactionId=transaction_db.id,
+            ),
+        ]
+
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.post(
+                "/api/v2/consumable/bulk/",
+                json=[
+                    # The quantity is not dumped, as it is not a column of the consumables
+                    consumables_create[0].model_dump(by_alias=True) | {"quantity": consumables_create[0].quantity},
+                    consumables_create[1].model_dump(by_alias=True),
+                ],
+            )
+
+        # Assert
+        assert response.status_code == 200
+        assert [consumable["buyPrice"] for consumable in response.json()] == [10, 10, 10, 20]
+        assert all(consumable["name"] == self.consumable_item_create.name for consumable in response.json())
+        assert len([statement for statement in statements if statement.startswith("INSERT")]) == 1
+        async with get_db.get_session() as session:
+            consumables_in_db = await crud_consumable.query(session, transaction_id_purchase=transaction_db.id)
+        assert len(consumables_in_db) == 4
+
+    async def test_create_consumables_transaction_not_purchase(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            transaction = TransactionCommerceCreate(
+                trade=TradeType.SALE,
+                payment_method=PaymentMethod.CARD,
+                datetime=datetime.datetime.now(),
+            )
+            transaction_db = await crud_transaction.create_v2(session, obj_in=transaction)
+
+        consumable_create = ConsumableCreateBulk(
+            consumable_item_id=self.consumable_item_db.id, buy_price=10, sell_price=2, transactionId=transaction_db.id
+        )
+
+        # Act
+        response = self._client.post("/api/v2/consumable/bulk/", json=[consumable_create.model_dump(by_alias=True)])
+
+        # Assert
+        assert response.status_code == 400
@@ -0,0 +1,41 @@
+import json
+from test.base_test import BaseTest
+
+from app.api.v2.endpoints.event import stream_events
+from app.core.events import ChangeEvent, event_bus
+
+
+class TestEvent(BaseTest):
+    async def test_stream_events(self):
+        # Arrange
+        stream = stream_events(keepalive=0.01)
+
+        # Act
+        # Assert
+        # The client is asked to fetch the state once it is subscribed
+        assert await anext(stream) == "event: resync\ndata: {}\n\n"
+        assert await anext(stream) == ": keepalive\n\n"
+
+        await event_bus.publish([ChangeEvent("barrel", "updated", 1, {"is_mounted": True})])
+        message = await anext(stream)
+        assert message.startswith("event: change\ndata: ")
+        assert json.loads(message.removeprefix("event: change\ndata: ")) == [
+            {"table": "barrel", "action": "updated", "id": 1, "data": {"isMounted": True}},
+        ]
+
+        # Changes were lost
+        event_bus._receive(None)
+        assert await anext(stream) == "event: resync\ndata: {}\n\n"
+
+        await stream.aclose()
+        assert not event_bus._subscribers
+
+    def test_read_events_unauthenticated(self):
+        # Arrange
+        self.wipe_dependencies_overrides()
+
+        # Act
+        response = self._client.get("/api/v2/event/")
+
+        # Assert
+        assert response.status_code == 401
@@ -69,6 +69,16 @@ class TestGlass(BaseTest):
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_read_glasses_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v2/glass/")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(statements) == 1
+
     def test_read_glass(self):
         # Arrange
         # Act
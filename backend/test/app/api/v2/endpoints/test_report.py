@@ -0,0 +1,97 @@
+import datetime
+from test.base_test import BaseTest
+
+from app.core.types import PaymentMethod, RollupItemType, TradeType
+from app.crud.crud_barrel import barrel as crud_barrel
+from app.crud.crud_drink_item import drink_item as crud_drink
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.dependencies import get_db
+from app.schemas.drink_item import DrinkItemCreate
+from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.barrel import BarrelCreate
+from app.schemas.v2.transaction import CartGlass, TransactionCartCreate, TransactionCommerceCreate
+
+
+class TestReport(BaseTest):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            await crud_treasury.create(
+                session,
+                obj_in=TreasuryCreate(total_amount=0, cash_amount=0, lydia_rate=0.015),
+            )
+            drink_item = await crud_drink.create(session, obj_in=DrinkItemCreate(name="beer"))
+            purchase = await crud_transaction.create_v2(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.PURCHASE,
+                ),
+            )
+            barrel = await crud_barrel.create_v2(
+                session,
+                obj_in=BarrelCreate(
+                    drink_item_id=drink_item.id,
+                    buy_price=50,
+                    sell_price=2,
+                    transactionId=purchase.id,
+                ),
+            )
+
+            # Two nights of sales
+            for day in (17, 18):
+                await crud_transaction.create_cart(
+                    session,
+                    obj_in=TransactionCartCreate(
+                        datetime=datetime.datetime(2026, 10, day, 20, 0, tzinfo=datetime.timezone.utc),
+                        payment_method=PaymentMethod.LYDIA,
+                        trade=TradeType.SALE,
+                        glasses=[CartGlass(barrel_id=barrel.id, quantity=day - 15)],
+                    ),
+                )
+
+    def test_read_nights(self):
+        # Arrange
+        # Act
+        response = self._client.get("/api/v2/report/nights/")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [
+            {"day": "2026-10-17", "quantity": 2, "revenue": 4, "cost": 0, "lydiaFees": 0.06, "net": 3.94},
+            {"day": "2026-10-18", "quantity": 3, "revenue": 6, "cost": 0, "lydiaFees": 0.09, "net": 5.91},
+        ]
+
+    def test_read_nights_period(self):
+        # Arrange
+        # Act
+        response = self._client.get("/api/v2/report/nights/?start=2026-10-18&end=2026-10-18")
+
+        # Assert
+        assert response.status_code == 200
+        assert [night["day"] for night in response.json()] == ["2026-10-18"]
+
+    def test_read_top_sellers(self):
+        # Arrange
+        # Act
+        response = self._client.get("/api/v2/report/top-sellers/?item_type=glass&by_quantity=true")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [
+            {"itemType": RollupItemType.GLASS.value, "itemId": 1, "name": "beer", "quantity": 5, "revenue": 10},
+        ]
+
+    def test_read_top_sellers_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v2/report/top-sellers/")
+
+        # Assert
+        assert response.status_code == 200
+        # One statement for the ranking, and one for the names of the drink items
+        assert len(statements) == 2
@@ -1,13 +1,27 @@
 import datetime
+import json
 from test.base_test import BaseTest
 
-from app.core.types import PaymentMethod, Status, TradeType, TransactionType
+from app.core.types import IconName, PaymentMethod, Status, TradeType, TransactionType
+from app.crud.crud_barrel import barrel as crud_barrel
+from app.crud.crud_consumable import consumable as crud_consumable
+from app.crud.crud_consumable_item import consumable_item as crud_consumable_item
+from app.crud.crud_drink_item import drink_item as crud_drink
+from app.crud.crud_non_inventoried_item import non_inventoried_item as crud_non_inventoried_item
 from app.crud.crud_transaction import transaction as crud_transaction
 from app.crud.crud_treasury import treasury as crud_treasury
 from app.dependencies import get_db
+from app.schemas.consumable_item import ConsumableItemCreate
+from app.schemas.drink_item import DrinkItemCreate
 from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.barrel import BarrelCreate
+from app.schemas.v2.consumable import ConsumableCreate
+from app.schemas.v2.non_inventoried_item import NonInventoriedItemCreate
 from app.schemas.v2.transaction import (
+    CartGlass,
+    CartNonInventoried,
     Transaction,
+    TransactionCartCreate,
     TransactionCommerceCreate,
     TransactionTreasuryCreate,
 )
@@ -44,7 +58,7 @@ class TestTransaction(BaseTest):
 
         # Assert
         assert response.status_code == 200
-        assert response.json() == [self.transaction_db.model_dump(by_alias=True, mode="json")]
+        assert response.json() == [self.transaction_db.model_dump(by_alias=True, mode="json") | {"priceSum": 0}]
 
     def test_read_transaction(self):
         # Arrange
@@ -57,6 +71,73 @@ class TestTransaction(BaseTest):
         assert response.json()["type"] == TransactionType.TRESORERY.value
         assert response.json()["status"] == Status.VALIDATED.value
 
+    def test_read_transactions_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get("/api/v2/transaction/")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(statements) == 1
+
+    def test_read_transaction_statements(self):
+        # Arrange
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.get(f"/api/v2/transaction/{self.transaction_db.id}")
+
+        # Assert
+        assert response.status_code == 200
+        # One statement for the transaction, and one for each of its six item lists
+        assert len(statements) == 7
+
+    async def test_read_transactions_pagination(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            for days in (1, 2, 3):
+                await crud_transaction.create_v2(
+                    session,
+                    obj_in=TransactionTreasuryCreate(
+                        datetime=self.transaction_db.datetime + datetime.timedelta(days=days),
+                        payment_method=PaymentMethod.CARD,
+                        trade=TradeType.SALE,
+                        amount=days,
+                        description="test",
+                    ),
+                )
+
+        # Act
+        first_page = self._client.get("/api/v2/transaction/?limit=3")
+        second_page = self._client.get(f"/api/v2/transaction/?limit=3&cursor={first_page.headers['X-Next-Cursor']}")
+
+        # Assert
+        assert first_page.status_code == 200
+        assert [transaction["id"] for transaction in first_page.json()] == [1, 2, 3]
+        assert second_page.status_code == 200
+        assert [transaction["id"] for transaction in second_page.json()] == [4]
+        assert "X-Next-Cursor" not in second_page.headers
+
+    def test_read_transactions_invalid_cursor(self):
+        # Arrange
+        # Act
+        response = self._client.get("/api/v2/transaction/?cursor=invalid")
+
+        # Assert
+        assert response.status_code == 400
+
+    def test_read_transactions_stream(self):
+        # Arrange
+        # Act
+        response = self._client.get("/api/v2/transaction/?stream=true")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            self.transaction_db.model_dump(by_alias=True, mode="json") | {"priceSum": 0}
+        ]
+
     def test_read_transaction_not_found(self):
         # Arrange
         # Act
@@ -213,3 +294,132 @@ class TestTransaction(BaseTest):
 
         # Assert
         assert response.status_code == 404
+
+    async def create_cart(self) -> TransactionCartCreate:
+        async with get_db.get_session() as session:
+            drink_db = await crud_drink.create(session, obj_in=DrinkItemCreate(name="test_drink"))
+            barrel_db = await crud_barrel.create(
+                session,
+                obj_in=BarrelCreate(drink_item_id=drink_db.id, buy_price=10, sell_price=2, transactionId=0),
+            )
+            consumable_item_db = await crud_consumable_item.create(
+                session,
+                obj_in=ConsumableItemCreate(name="test_consumable", icon=IconName.BEER),
+            )
+            consumable_db = await crud_consumable.create(
+                session,
+                obj_in=ConsumableCreate(
+                    consumable_item_id=consumable_item_db.id,
+                    buy_price=1,
+                    sell_price=3,
+                    transactionId=0,
+                ),
+            )
+            non_inventoried_item_db = await crud_non_inventoried_item.create(
+                session,
+                obj_in=NonInventoriedItemCreate(name="test_non_inventoried", icon=IconName.MISC, sell_price=1.5),
+            )
+
+        return TransactionCartCreate(
+            datetime=datetime.datetime.now(),
+            payment_method=PaymentMethod.CASH,
+            trade=TradeType.SALE,
+            glasses=[CartGlass(barrel_id=barrel_db.id, quantity=2)],
+            consumable_ids=[consumable_db.id],
+            non_inventorieds=[CartNonInventoried(non_inventoried_item_id=non_inventoried_item_db.id, quantity=2)],
+        )
+
+    async def test_create_cart_transaction(self):
+        # Arrange
+        cart = await self.create_cart()
+
+        # Act
+        response = self._client.post(
+            "/api/v2/transaction/cart/",
+            json=cart.model_dump(by_alias=True, mode="json"),
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["status"] == Status.VALIDATED.value
+        assert response.json()["amount"] == 10
+        assert [glass["sellPrice"] for glass in response.json()["glasses"]] == [2, 2]
+        assert [consumable["solded"] for consumable in response.json()["consumablesSale"]] == [True]
+        assert [item["sellPrice"] for item in response.json()["nonInventorieds"]] == [1.5, 1.5]
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.get_last_treasury(session)
+            assert treasury.cash_amount == 10
+            assert treasury.total_amount == 10
+
+    async def test_create_cart_transaction_statements(self):
+        # Arrange
+        cart = await self.create_cart()
+        cart.glasses[0].quantity = 20
+
+        # Act
+        with self.record_statements() as statements:
+            response = self._client.post(
+                "/api/v2/transaction/cart/",
+                json=cart.model_dump(by_alias=True, mode="json"),
+            )
+
+        # Assert
+        assert response.status_code == 200
+        assert len(response.json()["glasses"]) == 20
+        assert len([statement for statement in statements if statement.startswith("INSERT INTO glass")]) == 1
+
+    async def test_create_cart_transaction_barrel_not_found(self):
+        # Arrange
+        cart = await self.create_cart()
+        cart.glasses[0].barrel_id = 0
+
+        # Act
+        response = self._client.post(
+            "/api/v2/transaction/cart/",
+            json=cart.model_dump(by_alias=True, mode="json"),
+        )
+
+        # Assert
+        assert response.status_code == 404
+        async with get_db.get_session() as session:
+            assert len(await crud_transaction.query(session)) == 1
+
+    async def test_create_cart_transaction_consumable_solded(self):
+        # Arrange
+        cart = await self.create_cart()
+        self._client.post("/api/v2/transaction/cart/", json=cart.model_dump(by_alias=True, mode="json"))
+
+        # Act
+        response = self._client.post(
+            "/api/v2/transaction/cart/",
+            json=cart.model_dump(by_alias=True, mode="json"),
+        )
+
+        # Assert
+        assert response.status_code == 400
+        async with get_db.get_session() as session:
+            assert (await crud_treasury.get_last_treasury(session)).cash_amount == 10
+
+    def test_create_cart_transaction_empty(self):
+        # Arrange
+        # Act
+        response = self._client.post(
+            "/api/v2/transaction/cart/",
+            json={"datetime": datetime.datetime.now().isoformat(), "paymentMethod": "CB", "trade": "sale"},
+        )
+
+        # Assert
+        assert response.status_code == 422
+
+    async def test_create_cart_transaction_purchase(self):
+        # Arrange
+        cart = await self.create_cart()
+
+        # Act
+        response = self._client.post(
+            "/api/v2/transaction/cart/",
+            json=cart.model_dump(by_alias=True, mode="json") | {"trade": TradeType.PURCHASE.value},
+        )
+
+        # Assert
+        assert response.status_code == 422
@@ -0,0 +1,68 @@
+import datetime
+import gzip
+import hashlib
+import json
+from test.base_test import BaseTest
+
+from app.commands.dump_db import MANIFEST_FILE, dump_db_stream
+from app.core.types import PaymentMethod, TradeType
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.db.base_class import Base
+from app.dependencies import get_db
+from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.transaction import TransactionTreasuryCreate
+
+
+class TestDumpDb(BaseTest):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            await crud_treasury.create(session, obj_in=TreasuryCreate(total_amount=0, cash_amount=0, lydia_rate=0.015))
+            for amount in range(1, 6):
+                await crud_transaction.create_treasury(
+                    session,
+                    obj_in=TransactionTreasuryCreate(
+                        datetime=datetime.datetime.now(),
+                        description="test",
+                        amount=amount,
+                        trade=TradeType.SALE,
+                        payment_method=PaymentMethod.CASH,
+                    ),
+                )
+
+    async def test_dump_db_stream(self):
+        # Act
+        # The batches are smaller than the tables, the rows are read in several batches
+        manifest = await dump_db_stream(str(self._tmp_path / "dump"), batch_size=2)
+
+        # Assert
+        directory = self._tmp_path / "dump"
+        assert json.loads((directory / MANIFEST_FILE).read_text()) == manifest
+        assert [table["name"] for table in manifest["tables"]] == [table.name for table in Base.metadata.sorted_tables]
+
+        tables = {table["name"]: table for table in manifest["tables"]}
+        transaction = tables["transaction"]
+        assert transaction["file"] == "transaction.ndjson"
+        assert transaction["rows"] == 5
+        content = (directory / transaction["file"]).read_bytes()
+        assert hashlib.sha256(content).hexdigest() == transaction["sha256"]
+
+        rows = [dict(zip(transaction["columns"], json.loads(line))) for line in content.splitlines()]
+        assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+        assert [row["amount"] for row in rows] == [1, 2, 3, 4, 5]
+        assert tables["treasury"]["rows"] == 1
+        assert tables["glass"]["rows"] == 0
+
+    async def test_dump_db_stream_gzip(self):
+        # Act
+        manifest = await dump_db_stream(str(self._tmp_path / "dump"), compression="gzip", batch_size=2)
+
+        # Assert
+        transaction = next(table for table in manifest["tables"] if table["name"] == "transaction")
+        assert transaction["file"] == "transaction.ndjson.gz"
+        # The checksum is the one of the uncompressed content
+        content = gzip.decompress((self._tmp_path / "dump" / transaction["file"]).read_bytes())
+        assert hashlib.sha256(content).hexdigest() == transaction["sha256"]
+        assert len(content.splitlines()) == 5
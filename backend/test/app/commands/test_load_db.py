@@ -0,0 +1,122 @@
+import datetime
+from test.base_test import BaseTest
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.commands.dump_db import MANIFEST_FILE, dump_db, dump_db_stream
+from app.commands.load_db import DumpChecksumError, load_db
+from app.core.types import PaymentMethod, RollupItemType, Status, TradeType
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.dependencies import get_db
+from app.models.sales_rollup import SalesRollup
+from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.transaction import TransactionCommerceCreate, TransactionTreasuryCreate
+
+
+class TestLoadDb(BaseTest):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            await crud_treasury.create(session, obj_in=TreasuryCreate(total_amount=0, cash_amount=0, lydia_rate=0.015))
+            for amount in range(1, 6):
+                await crud_transaction.create_treasury(
+                    session,
+                    obj_in=TransactionTreasuryCreate(
+                        datetime=datetime.datetime(2024, 1, amount, 18, tzinfo=datetime.timezone.utc),
+                        description="test",
+                        amount=amount,
+                        trade=TradeType.SALE,
+                        payment_method=PaymentMethod.CASH,
+                    ),
+                )
+
+    async def read_transactions(self) -> list[tuple]:
+        async with get_db.get_session() as session:
+            return [
+                (transaction.id, transaction.datetime, transaction.status, transaction.amount)
+                for transaction in await crud_transaction.query(session, limit=None)
+            ]
+
+    async def add_pending_transaction(self) -> None:
+        async with get_db.get_session() as session:
+            await crud_transaction.create_pending(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.SALE,
+                ),
+            )
+
+    async def test_load_db_json(self):
+        # Arrange
+        expected = await self.read_transactions()
+        await dump_db(str(self._tmp_path / "dump.json"))
+        await self.add_pending_transaction()
+
+        # Act
+        # The batches are smaller than the tables, the rows are inserted in several batches
+        await load_db(str(self._tmp_path / "dump.json"), batch_size=2)
+
+        # Assert
+        transactions = await self.read_transactions()
+        assert transactions == expected
+        assert transactions[0][1] == datetime.datetime(2024, 1, 1, 18, tzinfo=datetime.timezone.utc)
+        assert transactions[0][2] == Status.VALIDATED
+
+    async def test_load_db_json_dates(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            await session.execute(
+                insert(SalesRollup).values(
+                    day=datetime.date(2024, 1, 1),
+                    trade=TradeType.SALE,
+                    payment_method=PaymentMethod.CASH,
+                    item_type=RollupItemType.GLASS,
+                    item_id=1,
+                    quantity=1,
+                    revenue=2,
+                    cost=0,
+                    lydia_fees=0,
+                ),
+            )
+            await session.commit()
+        await dump_db(str(self._tmp_path / "dump.json"))
+
+        # Act
+        await load_db(str(self._tmp_path / "dump.json"))
+
+        # Assert
+        async with get_db.get_session() as session:
+            assert await session.scalar(select(SalesRollup.day)) == datetime.date(2024, 1, 1)
+
+    async def test_load_db_stream(self):
+        # Arrange
+        expected = await self.read_transactions()
+        await dump_db_stream(str(self._tmp_path / "dump"), compression="gzip")
+        await self.add_pending_transaction()
+
+        # Act
+        await load_db(str(self._tmp_path / "dump" / MANIFEST_FILE), batch_size=2)
+
+        # Assert
+        assert await self.read_transactions() == expected
+
+    async def test_load_db_stream_checksum_mismatch(self):
+        # Arrange
+        await dump_db_stream(str(self._tmp_path / "dump"))
+        table_file = self._tmp_path / "dump" / "transaction.ndjson"
+        table_file.write_text(table_file.read_text().replace('"test"', '"tampered"', 1))
+        await self.add_pending_transaction()
+        expected = await self.read_transactions()
+
+        # Act
+        with pytest.raises(DumpChecksumError):
+            await load_db(str(self._tmp_path / "dump"))
+
+        # Assert
+        # Nothing is committed
+        assert await self.read_transactions() == expected
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from app.core.events import ChangeEvent, EventBus
+from app.core.utils.backend.event_broker import InProcessEventBroker
+from app.core.versions import table_versions
+
+
+class FailingBroker(InProcessEventBroker):
+    async def publish(self, message: str) -> None:
+        raise ConnectionError("broker down")
+
+
+class SmallBroker(InProcessEventBroker):
+    max_message_size = 120
+
+
+def make_event(id: int) -> ChangeEvent:
+    return ChangeEvent("barrel", "updated", id, {"is_mounted": True})
+
+
+def test_change_event_camelized():
+    assert make_event(1).data == {"isMounted": True}
+
+
+@pytest.mark.asyncio
+async def test_publish_fan_out():
+    # Arrange
+    bus = EventBus(InProcessEventBroker(), queue_size=10)
+
+    # Act
+    async with bus.subscribe() as first, bus.subscribe() as second:
+        await bus.publish([make_event(1), make_event(2)])
+
+        # Assert
+        for messages in (first, second):
+            assert json.loads(messages.get_nowait()) == [
+                {"table": "barrel", "action": "updated", "id": 1, "data": {"isMounted": True}},
+                {"table": "barrel", "action": "updated", "id": 2, "data": {"isMounted": True}},
+            ]
+            assert messages.empty()
+
+    # The subscribers are gone once their context is left
+    await bus.publish([make_event(3)])
+    assert first.empty()
+
+
+@pytest.mark.asyncio
+async def test_publish_split_messages():
+    # Arrange
+    bus = EventBus(SmallBroker(), queue_size=10)
+
+    # Act
+    async with bus.subscribe() as messages:
+        await bus.publish([make_event(id) for id in range(5)])
+
+        # Assert
+        payloads = [messages.get_nowait() for _ in range(messages.qsize())]
+        assert len(payloads) > 1
+        assert all(len(payload.encode()) <= SmallBroker.max_message_size for payload in payloads)
+        assert [event["id"] for payload in payloads for event in json.loads(payload)] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_resync():
+    # Arrange
+    bus = EventBus(InProcessEventBroker(), queue_size=2)
+
+    # Act
+    async with bus.subscribe() as messages:
+        for id in range(3):
+            await bus.publish([make_event(id)])
+
+        # Assert
+        assert messages.get_nowait() is None
+        assert messages.empty()
+
+
+@pytest.mark.asyncio
+async def test_publish_failure(caplog):
+    # Arrange
+    bus = EventBus(FailingBroker(), queue_size=10)
+
+    # Act
+    await bus.publish([make_event(1)])
+
+    # Assert
+    assert "Failed to publish 1 change events" in caplog.text
+
+
+def test_receive_bump_versions():
+    # Arrange
+    bus = EventBus(InProcessEventBroker(), queue_size=10)
+    version = table_versions.get("drinkitem")[0]
+    other_version = table_versions.get("consumableitem")
+
+    # Act
+    # A catalog written by another process
+    bus._receive(json.dumps([{"table": "drinkitem", "action": "updated", "id": 1, "data": {}}]))
+
+    # Assert
+    assert table_versions.get("drinkitem")[0] > version
+    assert table_versions.get("consumableitem") == other_version
+
+
+def test_receive_lost_bump_all_versions():
+    # Arrange
+    bus = EventBus(InProcessEventBroker(), queue_size=10)
+    version = table_versions.get("drinkitem", "consumableitem")[0]
+
+    # Act
+    bus._receive(None)
+
+    # Assert
+    assert table_versions.get("drinkitem")[0] > version
+    assert table_versions.get("consumableitem")[0] > version
+
+
+def test_receive_handlers():
+    # Arrange
+    bus = EventBus(InProcessEventBroker(), queue_size=10)
+    changed: list[int | None] = []
+    bus.add_handler("account", changed.append)
+
+    # Act
+    bus._receive(
+        json.dumps(
+            [
+                {"table": "account", "action": "updated", "id": 1, "data": {}},
+                {"table": "barrel", "action": "updated", "id": 2, "data": {}},
+            ],
+        ),
+    )
+    bus._receive(None)
+
+    # Assert
+    assert changed == [1, None]
@@ -1,10 +1,10 @@
 import asyncio
 
 import pytest
-from fastapi import FastAPI, status
+from fastapi import FastAPI, Request, status
 from fastapi.testclient import TestClient
 
-from app.core.middleware import ExceptionMonitorMiddleware
+from app.core.middleware import TRUNCATED_BODY_MARKER, BodyTee, ExceptionMonitorMiddleware
 
 side_effect_queue: asyncio.Queue[dict] = asyncio.Queue()
 
@@ -55,3 +55,74 @@ async def test_exception_monitor_middleware():
     assert side_effect_data["kwargs"]["url"] == "http://testserver/test"
     assert side_effect_data["kwargs"]["body"] == b'{"test": "test"}'
     assert side_effect_data["kwargs"]["headers"].get("test") == "test"
+
+
+@pytest.mark.asyncio
+async def test_exception_monitor_middleware_body_not_read():
+    app = FastAPI()
+    app.add_middleware(ExceptionMonitorMiddleware, alert_backend=alert_backend)
+    client = TestClient(app)
+
+    # The exception is raised before the body is read by the route
+    @app.post("/test")
+    async def test_route():
+        raise Exception("Test exception")
+
+    response = client.post("/test", content=b"not read")
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    side_effect_data = await side_effect_queue.get()
+    assert side_effect_data["kwargs"]["body"] == b"not read"
+
+
+@pytest.mark.asyncio
+async def test_exception_monitor_middleware_body_truncated():
+    app = FastAPI()
+    app.add_middleware(ExceptionMonitorMiddleware, alert_backend=alert_backend, max_body_size=4)
+    client = TestClient(app)
+
+    @app.post("/test")
+    async def test_route(request: Request):
+        await request.body()
+        raise Exception("Test exception")
+
+    response = client.post("/test", content=b"0123456789")
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    side_effect_data = await side_effect_queue.get()
+    assert side_effect_data["kwargs"]["body"] == TRUNCATED_BODY_MARKER + b"6789"
+
+
+@pytest.mark.asyncio
+async def test_exception_monitor_middleware_response_started():
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        raise Exception("Test exception")
+
+    client = TestClient(ExceptionMonitorMiddleware(streaming_app, alert_backend=alert_backend))
+
+    # The response can not be replaced anymore, the exception is raised to the server
+    with pytest.raises(Exception, match="Test exception"):
+        client.get("/test")
+
+    side_effect_data = await side_effect_queue.get()
+    assert side_effect_data["kwargs"]["method"] == "GET"
+    assert side_effect_data["kwargs"]["body"] == b""
+
+
+def test_body_tee():
+    body = BodyTee(max_size=4)
+    body.write({"type": "http.request", "body": b"01", "more_body": True})
+    assert body.getvalue() == b"01"
+    assert not body.complete
+
+    body.write({"type": "http.request", "body": b"2345", "more_body": False})
+    assert body.getvalue() == TRUNCATED_BODY_MARKER + b"2345"
+    assert body.complete
+
+
+def test_body_tee_disconnect():
+    body = BodyTee(max_size=4)
+    body.write({"type": "http.disconnect"})
+    assert body.getvalue() == b""
+    assert body.complete
@@ -0,0 +1,159 @@
+import json
+from dataclasses import dataclass
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+from pydantic import ValidationError
+
+from app.core.events import event_bus
+from app.core.responses import CatalogCache, ModelResponse, etag_matches, get_type_adapter
+from app.core.utils.backend.event_broker import InProcessEventBroker
+from app.core.versions import table_versions
+from app.schemas.drink_item import DrinkItem
+
+
+@dataclass
+class DrinkItemRow:
+    """Stands for an ORM object: the response model is validated from its attributes."""
+
+    id: int
+    name: str
+
+
+def test_model_response():
+    # Act
+    response = ModelResponse(
+        list[DrinkItem],
+        [DrinkItemRow(id=1, name="beer"), DrinkItemRow(id=2, name="cider")],
+        headers={"X-Test": "test"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+    assert response.headers["X-Test"] == "test"
+    assert json.loads(response.body) == [
+        DrinkItem(id=1, name="beer").model_dump(by_alias=True, mode="json"),
+        DrinkItem(id=2, name="cider").model_dump(by_alias=True, mode="json"),
+    ]
+
+
+def test_model_response_invalid():
+    with pytest.raises(ValidationError):
+        ModelResponse(list[DrinkItem], [DrinkItemRow(id=1, name=None)])  # type: ignore[arg-type]
+
+
+def test_get_type_adapter_cached():
+    assert get_type_adapter(list[DrinkItem]) is get_type_adapter(list[DrinkItem])
+
+
+def build_request(path: str = "/drink/", if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
+
+
+def test_etag_matches():
+    assert etag_matches('"a-1"', '"a-1"')
+    assert etag_matches('W/"a-1"', '"a-1"')
+    assert etag_matches('"a-0", "a-1"', '"a-1"')
+    assert etag_matches("*", '"a-1"')
+    assert not etag_matches('"a-0"', '"a-1"')
+    assert not etag_matches(None, '"a-1"')
+
+
+@pytest.mark.asyncio
+async def test_catalog_cache():
+    # Arrange
+    cache = CatalogCache()
+    loads: list[int] = []
+
+    async def load():
+        loads.append(1)
+        return [DrinkItemRow(id=1, name=f"beer {len(loads)}")]
+
+    # Act
+    first = await cache.respond(build_request(), list[DrinkItem], ["drinkitem"], load)
+    cached = await cache.respond(build_request(), list[DrinkItem], ["drinkitem"], load)
+    not_modified = await cache.respond(
+        build_request(if_none_match=first.headers["ETag"]), list[DrinkItem], ["drinkitem"], load
+    )
+    table_versions.bump("drinkitem")
+    changed = await cache.respond(
+        build_request(if_none_match=first.headers["ETag"]), list[DrinkItem], ["drinkitem"], load
+    )
+
+    # Assert
+    assert first.status_code == 200
+    assert json.loads(first.body) == [{"id": 1, "name": "beer 1"}]
+    assert "Last-Modified" in first.headers
+    assert cached.body == first.body
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
+    assert json.loads(changed.body) == [{"id": 1, "name": "beer 2"}]
+    assert len(loads) == 2
+
+
+class RemoteBroker(InProcessEventBroker):
+    """
+    Broker shared with another process, its messages are only received once this process listens.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.listening = False
+
+    async def listen(self) -> None:
+        self.listening = True
+
+    def deliver(self, message: str) -> None:
+        if self.listening:
+            self.receiver(message)
+
+
+@pytest.mark.asyncio
+async def test_catalog_cache_remote_change():
+    # Arrange
+    cache = CatalogCache()
+    broker = RemoteBroker()
+    broker.receiver = event_bus._receive
+
+    async def load():
+        return []
+
+    with patch.object(event_bus, "broker", broker):
+        first = await cache.respond(build_request(), list[DrinkItem], ["drinkitem"], load)
+
+        # Act
+        # Another process writes the catalog, this one never published anything
+        broker.deliver(json.dumps([{"table": "drinkitem", "action": "updated", "id": 1, "data": {}}]))
+        response = await cache.respond(
+            build_request(if_none_match=first.headers["ETag"]), list[DrinkItem], ["drinkitem"], load
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_cache_size():
+    # Arrange
+    cache = CatalogCache(size=1)
+    loads: list[str] = []
+
+    async def load():
+        loads.append("load")
+        return []
+
+    # Act
+    await cache.respond(build_request("/drink/"), list[DrinkItem], ["drinkitem"], load)
+    await cache.respond(build_request("/consumable_item/"), list[DrinkItem], ["drinkitem"], load)
+    await cache.respond(build_request("/drink/"), list[DrinkItem], ["drinkitem"], load)
+
+    # Assert
+    # The first response was dropped to make room for the second one
+    assert len(loads) == 3
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 
+import pytest
 from jose import jwt
 from passlib.context import CryptContext
 
@@ -9,6 +10,7 @@ from app.core.security import (
     get_password_hash,
     is_hashed_password,
     verify_password,
+    verify_password_async,
 )
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -21,6 +23,14 @@ def test_verify_password():
     assert not verify_password("wrong_password", hashed_password)
 
 
+@pytest.mark.asyncio
+async def test_verify_password_async():
+    plain_password = "password"
+    hashed_password = pwd_context.hash(plain_password)
+    assert await verify_password_async(plain_password, hashed_password)
+    assert not await verify_password_async("wrong_password", hashed_password)
+
+
 def test_is_hashed_password():
     plain_password = "password"
     hashed_password = pwd_context.hash(plain_password)
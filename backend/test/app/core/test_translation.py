@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
-from app.core.translation import Translator
+import pytest
+
+from app.core.translation import Translator, compile_catalog
 
 
 @patch("app.core.translation.settings.LOCALE", "fr")
@@ -19,3 +21,33 @@ def test_translator_en():
 def test_translated_string_element():
     translator = Translator(element="test")
     assert str(translator.ELEMENT_NOT_FOUND) == "Test not found"
+
+
+@patch("app.core.translation.settings.LOCALE", "en")
+def test_translator_plain_attributes():
+    translator = Translator(element="consumable_item")
+    other_translator = Translator(element="barrel")
+
+    # The messages are rendered strings, one translator does not change the messages of another one
+    assert isinstance(translator.ELEMENT_NOT_FOUND, str)
+    assert translator.ELEMENT_NOT_FOUND == "Consumable item not found"
+    assert other_translator.ELEMENT_NOT_FOUND == "Barrel not found"
+    assert translator.ELEMENT_NOT_FOUND == "Consumable item not found"
+    assert translator.INVALID_CURSOR == "Invalid pagination cursor"
+
+
+def test_compile_catalog():
+    catalog = compile_catalog("fr", "barrel")
+
+    assert catalog["ELEMENT_NOT_FOUND"] == "Barrel introuvable"
+    assert catalog["INTEGRITY_ERROR"] == "Erreur d'intégrité des données"
+    # Compiled only once
+    assert compile_catalog("fr", "barrel") is catalog
+    # Read-only
+    with pytest.raises(TypeError):
+        catalog["ELEMENT_NOT_FOUND"] = "Modified"  # type: ignore
+
+
+@patch("app.core.translation.settings.LOCALE", "fr")
+def test_translated_string_str():
+    assert str(Translator.ELEMENT_NOT_FOUND) == "Élément introuvable"
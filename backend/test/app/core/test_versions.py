@@ -0,0 +1,46 @@
+from app.core.versions import TableVersions
+
+
+def test_bump():
+    # Arrange
+    versions = TableVersions()
+    initial_version, started_at = versions.get("drinkitem")
+
+    # Act
+    version = versions.bump("drinkitem")
+
+    # Assert
+    assert initial_version == 0
+    assert versions.get("drinkitem") == (version, versions.get("drinkitem")[1])
+    assert versions.get("drinkitem")[1] >= started_at
+    assert versions.get("consumableitem") == (0, started_at)
+
+
+def test_get_several_tables():
+    # Arrange
+    versions = TableVersions()
+    versions.bump("drinkitem")
+    last_version = versions.bump("consumableitem")
+
+    # Act
+    # Assert
+    assert versions.get("drinkitem", "consumableitem")[0] == last_version
+    assert versions.get("drinkitem")[0] < last_version
+
+
+def test_epoch():
+    assert TableVersions().epoch != TableVersions().epoch
+
+
+def test_bump_all():
+    # Arrange
+    versions = TableVersions()
+    versions.bump("drinkitem")
+
+    # Act
+    version = versions.bump_all()
+
+    # Assert
+    assert versions.get("drinkitem")[0] == version
+    assert versions.get("consumableitem")[0] == version
+    assert versions.bump("drinkitem") > version
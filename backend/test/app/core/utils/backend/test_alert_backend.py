@@ -1,10 +1,74 @@
 import json
-from unittest.mock import MagicMock, patch
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Generator
+from unittest.mock import patch
 
+import pytest
 from fastapi.datastructures import URL, Headers
 
 from app.core.config import settings
-from app.core.utils.backend.alert_backend import alert_backend, alert_to_terminal
+from app.core.utils.backend.alert_backend import GithubIssueSink, alert_backend, alert_to_terminal
+from app.core.utils.backend.alert_dispatcher import AlertDispatcher, AlertEvent
+
+issues_path = f"/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues"
+
+
+class StubGithubHandler(BaseHTTPRequestHandler):
+    server: "StubGithubServer"
+
+    def handle_request(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.requests.append((self.command, self.path, body, self.headers.get("Authorization")))
+
+        status, payload = self.server.responses.popleft() if self.server.responses else (500, {})
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = handle_request
+    do_POST = handle_request
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class StubGithubServer(ThreadingHTTPServer):
+    """Local HTTP server answering the scripted responses, and recording the requests."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubGithubHandler)
+        self.requests: list[tuple[str, str, Any, str | None]] = []
+        self.responses: deque[tuple[int, Any]] = deque()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def github() -> Generator[StubGithubServer, None, None]:
+    server = StubGithubServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_event(message: str = "Test exception") -> AlertEvent:
+    return AlertEvent(
+        ValueError(message),
+        "GET",
+        URL("https://example.com"),
+        Headers({"Content-Type": "application/json", "Authorization": "Bearer secret"}),
+        b'{"test": "data"}',
+    )
 
 
 @patch("app.core.config.settings.ALERT_BACKEND", "error")
@@ -33,115 +97,125 @@ def test_alert_to_terminal(caplog):
 
 
 @patch("app.core.config.settings.ALERT_BACKEND", "github")
-def test_alert_to_github_issues_existing():
-    exception = ValueError("Test exception")
-    method = "GET"
-    url = URL("https://example.com")
-    headers = Headers({"Content-Type": "application/json"})
-    body = b'{"test": "data"}'
-
+def test_get_alert_backend_github():
     alert = alert_backend()
 
-    with patch("requests.Session") as mock_session:
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {
-                "title": f"{exception.__class__.__name__}: {str(exception)}",
-                "html_url": "https://example.com",
-            }
+    assert isinstance(alert, AlertDispatcher)
+    assert isinstance(alert.sink, GithubIssueSink)
+
+
+@pytest.mark.asyncio
+async def test_github_issue_sink_new(github: StubGithubServer):
+    event = make_event()
+    github.responses.extend(
+        [
+            (200, []),
+            (201, {"html_url": "https://example.com/1", "comments_url": f"{github.url}{issues_path}/1/comments"}),
+            (201, {"html_url": "https://example.com/1#comment"}),
         ]
-        mock_session.return_value.get.return_value = mock_response
+    )
+    sink = GithubIssueSink(api_url=github.url, retry_wait=0)
 
-        alert(exception, method, url, headers, body)
+    await sink(event, 3)
 
-        mock_session.assert_called_once_with()
-        assert mock_session.return_value.auth == (
-            settings.GITHUB_USER,
-            settings.GITHUB_TOKEN,
-        )
-        mock_session.return_value.get.assert_called_once_with(
-            f"https://api.github.com/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues"
-        )
-        mock_session.return_value.post.assert_not_called()
+    (get, post) = github.requests
+    assert get[:2] == ("GET", f"{issues_path}?state=open")
+    assert get[3] is not None and get[3].startswith("Basic ")
+    assert post[:2] == ("POST", issues_path)
+    assert post[2]["title"] == "ValueError: Test exception"
+    assert post[2]["labels"] == [label for label in settings.ISSUE_LABELS.split(",") if label]
+    assert "Occurrences: 3" in post[2]["body"]
+    assert '{"test": "data"}' in post[2]["body"]
+    assert "Bearer secret" not in post[2]["body"]
 
+    # The open issues are not fetched again, the issue is now known
+    await sink(event, 1)
 
-@patch("app.core.config.settings.ALERT_BACKEND", "github")
-def test_alert_to_github_issues_existing_error(caplog):
-    exception = ValueError("Test exception")
-    method = "GET"
-    url = URL("https://example.com")
-    headers = Headers({"Content-Type": "application/json"})
-    body = b'{"test": "data"}'
+    assert github.requests[2][:2] == ("POST", f"{issues_path}/1/comments")
 
-    alert = alert_backend()
 
-    with patch("requests.Session") as mock_session:
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.json.return_value = {}
-        mock_session.return_value.get.return_value = mock_response
+@pytest.mark.asyncio
+async def test_github_issue_sink_existing(github: StubGithubServer):
+    github.responses.extend(
+        [
+            (200, [{"title": "ValueError: Test exception", "comments_url": f"{github.url}{issues_path}/1/comments"}]),
+            (201, {"html_url": "https://example.com/1#comment"}),
+        ]
+    )
+    sink = GithubIssueSink(api_url=github.url, retry_wait=0)
 
-        alert(exception, method, url, headers, body)
+    await sink(make_event(), 2)
 
-        assert "Failed to get issues from github" in caplog.text
+    assert [request[:2] for request in github.requests] == [
+        ("GET", f"{issues_path}?state=open"),
+        ("POST", f"{issues_path}/1/comments"),
+    ]
+    assert "Occurrences: 2" in github.requests[1][2]["body"]
 
 
-@patch("app.core.config.settings.ALERT_BACKEND", "github")
-def test_alert_to_github_issues_new():
-    exception = ValueError("Test exception")
-    method = "GET"
-    url = URL("https://example.com")
-    headers = Headers({"Content-Type": "application/json"})
-    body = b'{"test": "data"}'
+@pytest.mark.asyncio
+async def test_github_issue_sink_retry(github: StubGithubServer):
+    github.responses.extend(
+        [
+            (502, {}),
+            (200, []),
+            (201, {"html_url": "https://example.com/1", "comments_url": f"{github.url}{issues_path}/1/comments"}),
+        ]
+    )
+    sink = GithubIssueSink(api_url=github.url, retry_wait=0)
 
-    alert = alert_backend()
+    await sink(make_event(), 1)
 
-    with patch("requests.Session") as mock_session:
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = []
-        mock_session.return_value.get.return_value = mock_response
-        mock_session.return_value.post.return_value.status_code = 201
-        mock_session.return_value.post.return_value.json.return_value = {"html_url": "https://example.com"}
-
-        alert(exception, method, url, headers, body)
-
-        mock_session.assert_called_once_with()
-        assert mock_session.return_value.auth == ((settings.GITHUB_USER, settings.GITHUB_TOKEN))
-        mock_session.return_value.get.assert_called_once_with(
-            f"https://api.github.com/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues"
-        )
-        mock_session.return_value.post.assert_called_once_with(
-            f"https://api.github.com/repos/{settings.REPOSITORY_OWNER}/{settings.REPOSITORY_NAME}/issues",
-            data=json.dumps(
-                {
-                    "title": f"{exception.__class__.__name__}: {str(exception)}",
-                    "body": body.decode(),
-                    "labels": [label for label in settings.ISSUE_LABELS.split(",") if label],
-                }
-            ),
-        )
+    assert [request[:2] for request in github.requests] == [
+        ("GET", f"{issues_path}?state=open"),
+        ("GET", f"{issues_path}?state=open"),
+        ("POST", issues_path),
+    ]
 
 
-@patch("app.core.config.settings.ALERT_BACKEND", "github")
-def test_alert_to_github_issues_new_error(caplog):
-    exception = ValueError("Test exception")
-    method = "GET"
-    url = URL("https://example.com")
-    headers = Headers({"Content-Type": "application/json"})
-    body = b'{"test": "data"}'
+@pytest.mark.asyncio
+async def test_github_issue_sink_error(github: StubGithubServer, caplog):
+    sink = GithubIssueSink(api_url=github.url, max_attempts=2, retry_wait=0)
 
-    alert = alert_backend()
+    await sink(make_event(), 1)
 
-    with patch("requests.Session") as mock_session:
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = []
-        mock_session.return_value.get.return_value = mock_response
-        mock_session.return_value.post.return_value.status_code = 500
-        mock_session.return_value.post.return_value.json.return_value = {}
+    assert len(github.requests) == 2
+    assert "Failed to send alert to github" in caplog.text
+    assert "An exception has been raised!" in caplog.text
 
-        alert(exception, method, url, headers, body)
 
-        assert "Failed to create issue on github" in caplog.text
+@pytest.mark.asyncio
+async def test_github_issue_sink_client_error(github: StubGithubServer, caplog):
+    github.responses.append((401, {"message": "Bad credentials"}))
+    sink = GithubIssueSink(api_url=github.url, retry_wait=0)
+
+    await sink(make_event(), 1)
+
+    # Client errors are not retried
+    assert len(github.requests) == 1
+    assert "Failed to send alert to github" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_github_dispatcher_storm(github: StubGithubServer):
+    github.responses.extend(
+        [
+            (200, []),
+            (201, {"html_url": "https://example.com/1", "comments_url": f"{github.url}{issues_path}/1/comments"}),
+        ]
+    )
+    dispatcher = AlertDispatcher(
+        GithubIssueSink(api_url=github.url, retry_wait=0),
+        dedup_ttl=60,
+        flush_interval=0.05,
+        max_queue_size=1000,
+    )
+
+    for _ in range(100):
+        event = make_event()
+        await dispatcher(event.exception, event.method, event.url, event.headers, event.body)
+    await dispatcher.close()
+
+    # A single issue for the whole storm
+    assert [request[0] for request in github.requests] == ["GET", "POST"]
+    assert "Occurrences: 100" in github.requests[1][2]["body"]
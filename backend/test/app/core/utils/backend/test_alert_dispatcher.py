@@ -0,0 +1,135 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.datastructures import URL, Headers
+
+from app.core.utils.backend.alert_dispatcher import AlertDispatcher, AlertEvent
+
+
+class RecordingSink:
+    def __init__(self):
+        self.alerts: list[tuple[AlertEvent, int]] = []
+
+    async def __call__(self, event: AlertEvent, count: int) -> None:
+        self.alerts.append((event, count))
+
+
+def raise_exception(message: str) -> Exception:
+    try:
+        raise ValueError(message)
+    except ValueError as e:
+        return e
+
+
+def make_dispatcher(sink, **kwargs) -> AlertDispatcher:
+    return AlertDispatcher(sink, **{"dedup_ttl": 60, "flush_interval": 0, "max_queue_size": 10} | kwargs)
+
+
+async def alert(dispatcher: AlertDispatcher, exception: Exception) -> None:
+    await dispatcher(exception, "GET", URL("https://example.com"), Headers({}), b"")
+
+
+def test_alert_event_signature():
+    first = AlertEvent(raise_exception("first"), "GET", URL("https://example.com"), Headers({}), b"")
+    same = AlertEvent(raise_exception("first"), "POST", URL("https://example.com/other"), Headers({}), b"body")
+    other = AlertEvent(raise_exception("other"), "GET", URL("https://example.com"), Headers({}), b"")
+    not_raised = AlertEvent(ValueError("first"), "GET", URL("https://example.com"), Headers({}), b"")
+
+    assert first.signature == same.signature
+    assert first.signature != other.signature
+    assert not_raised.signature == ("ValueError", "first", "")
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesce():
+    sink = RecordingSink()
+    dispatcher = make_dispatcher(sink)
+
+    for _ in range(3):
+        await alert(dispatcher, raise_exception("first"))
+    await alert(dispatcher, raise_exception("other"))
+    await dispatcher.close()
+
+    assert [(event.exception.args[0], count) for event, count in sink.alerts] == [("first", 3), ("other", 1)]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_deduplicate():
+    sink = RecordingSink()
+    dispatcher = make_dispatcher(sink)
+
+    with patch("app.core.utils.backend.alert_dispatcher.time.monotonic") as mock_monotonic:
+        mock_monotonic.return_value = 1000
+        await alert(dispatcher, raise_exception("first"))
+        await dispatcher.join()
+        # Deduplicated, the occurrences are counted for the next alert
+        await alert(dispatcher, raise_exception("first"))
+        await alert(dispatcher, raise_exception("first"))
+        await dispatcher.join()
+        assert [count for _, count in sink.alerts] == [1]
+
+        mock_monotonic.return_value = 1000 + 60
+        await alert(dispatcher, raise_exception("first"))
+        await dispatcher.close()
+
+    assert [count for _, count in sink.alerts] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_queue_full():
+    sink = RecordingSink()
+    dispatcher = make_dispatcher(sink, max_queue_size=2)
+
+    for _ in range(5):
+        await alert(dispatcher, raise_exception("first"))
+    await dispatcher.close()
+
+    assert dispatcher.dropped == 3
+    assert [count for _, count in sink.alerts] == [2]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sink_error(caplog):
+    calls: list[int] = []
+
+    async def failing_sink(event: AlertEvent, count: int) -> None:
+        calls.append(count)
+        raise RuntimeError("Sink error")
+
+    dispatcher = make_dispatcher(failing_sink)
+
+    await alert(dispatcher, raise_exception("first"))
+    await dispatcher.join()
+    await alert(dispatcher, raise_exception("other"))
+    await dispatcher.close()
+
+    # The worker keeps running after an error of the sink
+    assert calls == [1, 1]
+    assert "Failed to send alert" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_returns_immediately():
+    sink_started = asyncio.Event()
+
+    async def slow_sink(event: AlertEvent, count: int) -> None:
+        sink_started.set()
+        await asyncio.sleep(60)
+
+    dispatcher = make_dispatcher(slow_sink)
+
+    await asyncio.wait_for(alert(dispatcher, raise_exception("first")), timeout=1)
+    await asyncio.wait_for(sink_started.wait(), timeout=1)
+    # Still queued while the sink is busy
+    await asyncio.wait_for(alert(dispatcher, raise_exception("other")), timeout=1)
+
+    dispatcher._worker.cancel()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_close_not_started():
+    dispatcher = make_dispatcher(RecordingSink())
+
+    await dispatcher.close()
+    await dispatcher.join()
@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.utils.backend.event_broker import InProcessEventBroker, PostgresEventBroker, event_broker
+
+
+@pytest.mark.parametrize(
+    ("backend", "expected"),
+    [("memory", InProcessEventBroker), ("postgres", PostgresEventBroker), ("invalid", InProcessEventBroker)],
+)
+def test_event_broker(backend, expected):
+    with patch.object(settings, "EVENT_BROKER", backend):
+        assert isinstance(event_broker(), expected)
+
+
+@pytest.mark.asyncio
+async def test_in_process_publish():
+    # Arrange
+    broker = InProcessEventBroker()
+    received: list[str | None] = []
+    broker.receiver = received.append
+
+    # Act
+    await broker.publish("[]")
+
+    # Assert
+    assert received == ["[]"]
+
+
+def make_connection() -> MagicMock:
+    connection = MagicMock()
+    connection.is_closed.return_value = False
+    connection.add_listener = AsyncMock()
+    connection.remove_listener = AsyncMock()
+    connection.execute = AsyncMock()
+    connection.close = AsyncMock()
+    return connection
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.backend.event_broker.asyncpg.connect")
+async def test_postgres_publish(mock_connect):
+    # Arrange
+    connection = make_connection()
+    mock_connect.return_value = connection
+    broker = PostgresEventBroker("test_channel")
+    received: list[str | None] = []
+    broker.receiver = received.append
+
+    # Act
+    await broker.listen()
+    await broker.publish("[]")
+    connection.add_listener.call_args.args[1](connection, 1, "test_channel", "[]")
+
+    # Assert
+    mock_connect.assert_called_once_with(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database=settings.POSTGRES_DB,
+    )
+    connection.execute.assert_called_once_with("SELECT pg_notify($1, $2)", "test_channel", "[]")
+    # The messages sent before listening are lost
+    assert received == [None, "[]"]
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.backend.event_broker.asyncpg.connect")
+async def test_postgres_connection_lost(mock_connect):
+    # Arrange
+    lost_connection, connection = make_connection(), make_connection()
+    mock_connect.side_effect = [lost_connection, connection]
+    broker = PostgresEventBroker("test_channel")
+    received: list[str | None] = []
+    broker.receiver = received.append
+    await broker.listen()
+
+    # Act
+    lost_connection.add_termination_listener.call_args.args[0](lost_connection)
+    # Opened again without waiting for the next use
+    await asyncio.sleep(0)
+    await broker.listen()
+    await broker.close()
+
+    # Assert
+    assert received == [None, None, None]
+    assert mock_connect.call_count == 2
+    connection.remove_listener.assert_called_once()
+    connection.close.assert_called_once()
+    lost_connection.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.backend.event_broker.asyncpg.connect")
+async def test_postgres_reconnect_retry(mock_connect):
+    # Arrange
+    lost_connection, connection = make_connection(), make_connection()
+    mock_connect.side_effect = [lost_connection, OSError("Connection refused"), connection]
+    broker = PostgresEventBroker("test_channel", reconnect_delay=0)
+    await broker.listen()
+
+    # Act
+    lost_connection.add_termination_listener.call_args.args[0](lost_connection)
+    await broker._reconnect_task
+
+    # Assert
+    assert mock_connect.call_count == 3
+    connection.add_listener.assert_called_once()
+    await broker.close()
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.backend.event_broker.asyncpg.connect")
+async def test_postgres_close_reconnecting(mock_connect):
+    # Arrange
+    lost_connection = make_connection()
+    mock_connect.side_effect = [lost_connection, OSError("Connection refused")]
+    broker = PostgresEventBroker("test_channel", reconnect_delay=60)
+    await broker.listen()
+    lost_connection.add_termination_listener.call_args.args[0](lost_connection)
+    await asyncio.sleep(0)
+
+    # Act
+    await broker.close()
+
+    # Assert
+    assert broker._reconnect_task is None
+    assert mock_connect.call_count == 2
@@ -8,6 +8,8 @@ from pydantic import Field, computed_field, field_validator
 
 from app.core.utils.misc import (
     create_hierarchy_dict,
+    decode_cursor,
+    encode_cursor,
     process_query_parameters,
     to_query_parameters,
 )
@@ -109,6 +111,35 @@ def test_process_query_parameters():
     }
 
 
+def test_process_query_parameters_exclude():
+    query_parameters = {
+        "id__gt": 1,
+        "name": "john",
+        "created_at__gt": "2022-01-01T00:00:00",
+        "amount__lt": 100.0,
+    }
+    processed_query_parameters = process_query_parameters(
+        QueryModelTest(**query_parameters),
+        exclude={"name", "amount__lt"},
+    )
+    assert processed_query_parameters == {
+        "id": {gt: 1},
+        "created_at": {gt: datetime(2022, 1, 1, 0, 0)},
+    }
+
+
+def test_cursor():
+    cursor = encode_cursor(datetime(2022, 1, 1, 0, 0), 42)
+    assert decode_cursor(cursor) == ["2022-01-01 00:00:00", 42]
+
+
+def test_decode_cursor_malformed():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor()[:-1])
+
+
 def test_create_hierarchy_dict() -> None:
     expected_result: Dict[str, List[str]] = {
         "A": ["A"],
@@ -0,0 +1,82 @@
+import json
+from test.base_test import BaseTest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.events import event_bus
+from app.crud.crud_account import account as crud_account
+from app.dependencies import get_db
+from app.schemas.account import AccountCreate
+
+
+class TestCRUDAccount(BaseTest):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            self.account = await crud_account.create(
+                session,
+                obj_in=AccountCreate(
+                    username="testuser",
+                    last_name="test",
+                    first_name="user",
+                    promotion_year=2021,
+                    password=settings.BASE_ACCOUNT_PASSWORD,
+                ),
+            )
+
+    async def test_remember_principal(self):
+        principal = crud_account.remember_principal("token", account=self.account, scopes=["staff"])
+
+        assert principal.id == self.account.id
+        assert principal.password is None
+        assert crud_account.get_principal("token") == (["staff"], principal)
+        assert crud_account.get_principal("other") is None
+
+    async def test_principal_expired(self):
+        crud_account.remember_principal("token", account=self.account, scopes=["staff"], expires_at=0)
+
+        assert crud_account.get_principal("token") is None
+
+    @patch("app.crud.crud_account.time.time")
+    async def test_principal_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        crud_account.remember_principal("token", account=self.account, scopes=["staff"])
+
+        mock_time.return_value = 1000 + settings.PRINCIPAL_CACHE_TTL
+        assert crud_account.get_principal("token") is None
+
+    @patch.object(settings, "PRINCIPAL_CACHE_SIZE", 2)
+    async def test_principal_lru(self):
+        crud_account.remember_principal("first", account=self.account, scopes=["staff"])
+        crud_account.remember_principal("second", account=self.account, scopes=["staff"])
+        # Using the first token makes the second one the least recently used
+        crud_account.get_principal("first")
+        crud_account.remember_principal("third", account=self.account, scopes=["staff"])
+
+        assert crud_account.get_principal("first") is not None
+        assert crud_account.get_principal("second") is None
+        assert crud_account.get_principal("third") is not None
+
+    async def test_invalidate(self):
+        crud_account.remember_principal("token", account=self.account, scopes=["staff"])
+        crud_account.invalidate(self.account.id + 1)
+        assert crud_account.get_principal("token") is not None
+
+        crud_account.invalidate(self.account.id)
+        assert crud_account.get_principal("token") is None
+
+    async def test_invalidate_other_process(self):
+        crud_account.remember_principal("token", account=self.account, scopes=["staff"])
+
+        # The account is deactivated by another process
+        event_bus._receive(json.dumps([{"table": "account", "action": "updated", "id": self.account.id, "data": {}}]))
+
+        assert crud_account.get_principal("token") is None
+
+    async def test_invalidate_events_lost(self):
+        crud_account.remember_principal("token", account=self.account, scopes=["staff"])
+
+        event_bus._receive(None)
+
+        assert crud_account.get_principal("token") is None
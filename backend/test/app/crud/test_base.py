@@ -1,12 +1,13 @@
+import json
 from datetime import datetime as _datetime
+from datetime import timedelta, timezone
 from operator import gt
 from test.base_test import BaseTest
 from typing import Optional
-from unittest.mock import patch
 
-from app.crud.base import CRUDBase, patch_timezone_sqlite
+from app.core.events import event_bus
+from app.crud.base import CRUDBase
 from app.db.base_class import Base, Datetime, Mapped, Str256, Str512
-from app.db.databases.postgres import PostgresDatabase
 from app.dependencies import get_db
 from app.schemas.base import DefaultModel
 
@@ -118,6 +119,84 @@ class TestBaseCRUD(BaseTest):
             assert len(await self.crud.query(session, distinct=ModelUser.id)) == 4
             assert len(await self.crud.query(session, distinct=ModelUser.email)) == 3
 
+    async def test_exists(self):
+        async with get_db.get_session() as session:
+            # Act
+            with self.record_statements() as statements:
+                found = await self.crud.exists(session, email="user1@example.com")
+                not_found = await self.crud.exists(session, email="user1@example.com", id={gt: 1})
+
+            # Assert
+            assert found is True
+            assert not_found is False
+            assert len(statements) == 2
+            assert all("EXISTS" in statement for statement in statements)
+
+    async def test_query_grouped(self):
+        async with get_db.get_session() as session:
+            # Act
+            await self.crud.create(session, obj_in=self.users[0])
+
+            result = await self.crud.query_grouped(session, group_by=ModelUser.email)
+
+            # Assert
+            assert [(user.id, quantity) for user, quantity in result] == [(1, 2), (2, 1), (3, 1)]
+
+    async def test_query_grouped_filter(self):
+        async with get_db.get_session() as session:
+            # Act
+            await self.crud.create(session, obj_in=self.users[0])
+
+            result = await self.crud.query_grouped(session, group_by=ModelUser.email, id={gt: 1})
+
+            # Assert
+            assert [(user.id, quantity) for user, quantity in result] == [(2, 1), (3, 1), (4, 1)]
+
+    async def test_create_many(self):
+        async with get_db.get_session() as session:
+            # Act
+            with self.record_statements() as statements:
+                result = await self.crud.create_many(session, objs_in=self.users)
+
+            # Assert
+            assert len(statements) == 1
+            assert [user.id for user in result] == [4, 5, 6]
+            assert [user.email for user in result] == [user_in.email for user_in in self.users]
+            assert all(user.datetime.tzinfo is not None for user in result)
+            assert len(await self.crud.query(session)) == 6
+
+    async def test_create_many_empty(self):
+        async with get_db.get_session() as session:
+            # Act
+            with self.record_statements() as statements:
+                result = await self.crud.create_many(session, objs_in=[])
+
+            # Assert
+            assert result == []
+            assert statements == []
+
+    async def test_read_datetime_utc(self):
+        async with get_db.get_session() as session:
+            # Act
+            result = await self.crud.query(session)
+
+            # Assert
+            assert all(user.datetime.tzinfo == timezone.utc for user in result)
+
+    async def test_create_datetime_other_timezone(self):
+        # Arrange
+        user_in = self.users[0].model_copy(
+            update={"datetime": _datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))},
+        )
+
+        async with get_db.get_session() as session:
+            # Act
+            result = await self.crud.create(session, obj_in=user_in)
+
+            # Assert
+            assert result.datetime == _datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+            assert result.datetime.tzinfo == timezone.utc
+
     async def test_update_with_dict(self):
         async with get_db.get_session() as session:
             # Act
@@ -163,25 +242,26 @@ class TestBaseCRUD(BaseTest):
 
             assert await self.crud.read(session, id=1) is None
 
+    async def test_publish_changes(self):
+        # Arrange
+        self.crud.event_fields = ("email",)
 
-def test_patch_timezone_sqlite():
-    create_model = ModelUser(
-        email="user1@example.com",
-        password="password1",
-        datetime=_datetime.now(),
-    )
-    model = patch_timezone_sqlite(create_model)
-
-    assert model.datetime.tzinfo is not None
+        async with event_bus.subscribe() as messages, get_db.get_session() as session:
+            # Act
+            db_obj = await self.crud.read(session, id=1)
+            await self.crud.update(session, db_obj=db_obj, obj_in={"email": "modified@example.com"})
+            await self.crud.delete(session, id=2)
 
+            # Assert
+            assert [json.loads(messages.get_nowait()) for _ in range(messages.qsize())] == [
+                [{"table": "modeluser", "action": "updated", "id": 1, "data": {"email": "modified@example.com"}}],
+                [{"table": "modeluser", "action": "deleted", "id": 2, "data": {}}],
+            ]
 
-@patch("app.crud.base.select_db", PostgresDatabase)
-def test_patch_timezone_sqlite_postgres():
-    create_model = ModelUser(
-        email="user1@example.com",
-        password="password1",
-        datetime=_datetime.now(),
-    )
-    model = patch_timezone_sqlite(create_model)
+    async def test_publish_changes_not_streamed(self):
+        async with event_bus.subscribe() as messages, get_db.get_session() as session:
+            # Act
+            await self.crud.delete(session, id=1)
 
-    assert model.datetime.tzinfo is None
+            # Assert
+            assert messages.empty()
@@ -0,0 +1,219 @@
+import datetime
+from test.base_test import BaseTest
+
+from sqlalchemy import select
+
+from app.core.types import IconName, PaymentMethod, RollupItemType, TradeType
+from app.crud.crud_barrel import barrel as crud_barrel
+from app.crud.crud_consumable import consumable as crud_consumable
+from app.crud.crud_consumable_item import consumable_item as crud_consumable_item
+from app.crud.crud_drink_item import drink_item as crud_drink_item
+from app.crud.crud_non_inventoried_item import non_inventoried_item as crud_non_inventoried_item
+from app.crud.crud_sales_rollup import get_night
+from app.crud.crud_sales_rollup import sales_rollup as crud_sales_rollup
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.dependencies import get_db
+from app.models.sales_rollup import SalesRollup
+from app.schemas.consumable_item import ConsumableItemCreate
+from app.schemas.drink_item import DrinkItemCreate
+from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.barrel import BarrelCreate
+from app.schemas.v2.consumable import ConsumableCreate
+from app.schemas.v2.non_inventoried_item import NonInventoriedItemCreate
+from app.schemas.v2.transaction import (
+    CartGlass,
+    CartNonInventoried,
+    TransactionCartCreate,
+    TransactionCommerceCreate,
+    TransactionCommerceUpdate,
+)
+
+# 22:00 in Paris
+NIGHT = datetime.datetime(2026, 10, 17, 20, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestCRUDSalesRollup(BaseTest):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            await crud_treasury.create(
+                session,
+                obj_in=TreasuryCreate(total_amount=100, cash_amount=100, lydia_rate=0.015),
+            )
+            self.drink_item = await crud_drink_item.create(session, obj_in=DrinkItemCreate(name="beer"))
+            self.consumable_item = await crud_consumable_item.create(
+                session,
+                obj_in=ConsumableItemCreate(name="chips", icon=IconName.FOOD),
+            )
+            self.non_inventoried_item = await crud_non_inventoried_item.create(
+                session,
+                obj_in=NonInventoriedItemCreate(name="cup", icon=IconName.MISC, sell_price=1),
+            )
+
+            # The purchase of a barrel and of consumables, validated the same night
+            purchase = await crud_transaction.create_pending(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=NIGHT,
+                    payment_method=PaymentMethod.CASH,
+                    trade=TradeType.PURCHASE,
+                ),
+            )
+            self.barrel = await crud_barrel.create_v2(
+                session,
+                obj_in=BarrelCreate(
+                    drink_item_id=self.drink_item.id,
+                    buy_price=50,
+                    sell_price=2,
+                    transactionId=purchase.id,
+                ),
+            )
+            # A consumable is sold by each cart
+            self.consumables = [
+                await crud_consumable.create_v2(
+                    session,
+                    obj_in=ConsumableCreate(
+                        consumable_item_id=self.consumable_item.id,
+                        buy_price=1,
+                        sell_price=3,
+                        transactionId=purchase.id,
+                    ),
+                )
+                for _ in range(2)
+            ]
+            await crud_transaction.validate(session, db_obj=purchase, obj_in=TransactionCommerceUpdate())
+
+    async def sell_cart(self, payment_method: PaymentMethod, datetime: datetime.datetime = NIGHT) -> int:
+        async with get_db.get_session() as session:
+            transaction = await crud_transaction.create_cart(
+                session,
+                obj_in=TransactionCartCreate(
+                    datetime=datetime,
+                    payment_method=payment_method,
+                    trade=TradeType.SALE,
+                    glasses=[CartGlass(barrel_id=self.barrel.id, quantity=3)],
+                    consumable_ids=[self.consumables.pop().id],
+                    non_inventorieds=[CartNonInventoried(non_inventoried_item_id=self.non_inventoried_item.id)],
+                ),
+            )
+            return transaction.id
+
+    async def read_rollup(self) -> dict[tuple, tuple]:
+        async with get_db.get_session() as session:
+            rows = await session.scalars(select(SalesRollup))
+            return {
+                (row.day, row.trade, row.payment_method, row.item_type, row.item_id): (
+                    row.quantity,
+                    round(row.revenue, 2),
+                    round(row.cost, 2),
+                    round(row.lydia_fees, 4),
+                )
+                for row in rows
+            }
+
+    def test_get_night(self):
+        # Arrange
+        evening = datetime.datetime(2026, 10, 17, 20, 0, tzinfo=datetime.timezone.utc)
+        after_midnight = datetime.datetime(2026, 10, 18, 1, 0, tzinfo=datetime.timezone.utc)
+        morning = datetime.datetime(2026, 10, 18, 5, 0, tzinfo=datetime.timezone.utc)
+
+        # Act
+        # Assert
+        assert get_night(evening) == datetime.date(2026, 10, 17)
+        assert get_night(after_midnight) == datetime.date(2026, 10, 17)
+        assert get_night(morning) == datetime.date(2026, 10, 18)
+        assert get_night(evening.replace(tzinfo=None)) == datetime.date(2026, 10, 17)
+
+    async def test_validate(self):
+        # Arrange
+        key = (datetime.date(2026, 10, 17), TradeType.PURCHASE, PaymentMethod.CASH)
+
+        # Act
+        rollup = await self.read_rollup()
+
+        # Assert
+        assert rollup == {
+            (*key, RollupItemType.BARREL, self.drink_item.id): (1, 0, 50, 0),
+            (*key, RollupItemType.CONSUMABLE, self.consumable_item.id): (2, 0, 2, 0),
+        }
+
+    async def test_create_cart(self):
+        # Arrange
+        key = (datetime.date(2026, 10, 17), TradeType.SALE, PaymentMethod.LYDIA)
+
+        # Act
+        await self.sell_cart(PaymentMethod.LYDIA)
+        rollup = await self.read_rollup()
+
+        # Assert
+        # The cart costs 10, 9.85 is added to the treasury, the fees are shared in proportion of the prices
+        assert rollup[(*key, RollupItemType.GLASS, self.drink_item.id)] == (3, 6, 0, 0.09)
+        assert rollup[(*key, RollupItemType.CONSUMABLE, self.consumable_item.id)] == (1, 3, 0, 0.045)
+        assert rollup[(*key, RollupItemType.NON_INVENTORIED, self.non_inventoried_item.id)] == (1, 1, 0, 0.015)
+
+    async def test_delete(self):
+        # Arrange
+        before = await self.read_rollup()
+        transaction_id = await self.sell_cart(PaymentMethod.CARD)
+
+        # Act
+        async with get_db.get_session() as session:
+            await crud_transaction.delete(session, id=transaction_id)
+
+        # Assert
+        assert await self.read_rollup() == before
+
+    async def test_rebuild(self):
+        # Arrange
+        await self.sell_cart(PaymentMethod.CASH)
+        incremental = await self.read_rollup()
+
+        # Act
+        async with get_db.get_session() as session:
+            rows = await crud_sales_rollup.rebuild(session, batch_size=1)
+
+        # Assert
+        assert rows == len(incremental)
+        assert await self.read_rollup() == incremental
+
+    async def test_read_nights(self):
+        # Arrange
+        await self.sell_cart(PaymentMethod.CASH)
+        await self.sell_cart(PaymentMethod.CARD, datetime=NIGHT + datetime.timedelta(days=1))
+
+        # Act
+        async with get_db.get_session() as session:
+            nights = await crud_sales_rollup.read_nights(session)
+            last_night = await crud_sales_rollup.read_nights(session, start=datetime.date(2026, 10, 18))
+
+        # Assert
+        assert [(night.day, night.quantity, night.revenue, night.cost, night.net) for night in nights] == [
+            (datetime.date(2026, 10, 17), 5, 10, 52, -42),
+            (datetime.date(2026, 10, 18), 5, 10, 0, 10),
+        ]
+        assert [night.day for night in last_night] == [datetime.date(2026, 10, 18)]
+
+    async def test_read_top_sellers(self):
+        # Arrange
+        await self.sell_cart(PaymentMethod.CASH)
+        await self.sell_cart(PaymentMethod.CARD)
+
+        # Act
+        async with get_db.get_session() as session:
+            by_revenue = await crud_sales_rollup.read_top_sellers(session)
+            by_quantity = await crud_sales_rollup.read_top_sellers(session, by_quantity=True, limit=1)
+            non_inventorieds = await crud_sales_rollup.read_top_sellers(
+                session,
+                item_type=RollupItemType.NON_INVENTORIED,
+            )
+
+        # Assert
+        assert [(seller.name, seller.quantity, seller.revenue) for seller in by_revenue] == [
+            ("beer", 6, 12),
+            ("chips", 2, 6),
+            ("cup", 2, 2),
+        ]
+        assert [seller.name for seller in by_quantity] == ["beer"]
+        assert [seller.item_type for seller in non_inventorieds] == [RollupItemType.NON_INVENTORIED]
@@ -1,16 +1,21 @@
+import asyncio
 import datetime
+import json
 from test.base_test import BaseTest
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
 
-from app.core.types import IconName, PaymentMethod, TradeType
+from app.core.events import event_bus
+from app.core.types import IconName, PaymentMethod, Status, TradeType
 from app.crud.crud_barrel import barrel as crud_barrel
 from app.crud.crud_consumable import consumable as crud_consumable
 from app.crud.crud_consumable_item import consumable_item as crud_consumable_item
 from app.crud.crud_drink_item import drink_item as crud_drink_item
 from app.crud.crud_glass import glass as crud_glass
 from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_transaction import with_price_sum
 from app.crud.crud_treasury import treasury as crud_treasury
 from app.dependencies import get_db
 from app.schemas.consumable_item import ConsumableItemCreate
@@ -20,6 +25,8 @@ from app.schemas.v2.barrel import BarrelCreate, BarrelUpdateSale
 from app.schemas.v2.consumable import ConsumableCreate, ConsumableUpdateSale
 from app.schemas.v2.glass import GlassCreate
 from app.schemas.v2.transaction import (
+    CartGlass,
+    TransactionCartCreate,
     TransactionCommerceCreate,
     TransactionCommerceUpdate,
     TransactionTreasuryCreate,
@@ -326,6 +333,58 @@ class TestCRUDTransaction(BaseTest):
             self.assertEqual(len(transaction_purchase.barrels_purchase), 1)
             self.assertEqual(barrels[0].empty_or_solded, False)
 
+    async def test_create_pending(self):
+        async with get_db.get_session() as session:
+            # Act
+            transaction = await crud_transaction.create_pending(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.PURCHASE,
+                ),
+            )
+
+            # Assert
+            assert transaction.status == Status.PENDING
+            assert await crud_transaction.exists(session, status=Status.PENDING)
+
+    async def test_create_pending_already_pending(self):
+        async with get_db.get_session() as session:
+            obj_in = TransactionCommerceCreate(
+                datetime=datetime.datetime.now(),
+                payment_method=PaymentMethod.CARD,
+                trade=TradeType.PURCHASE,
+            )
+            await crud_transaction.create_pending(session, obj_in=obj_in)
+
+            # Act
+            with pytest.raises(HTTPException) as exception:
+                await crud_transaction.create_pending(session, obj_in=obj_in)
+
+            # Assert
+            assert exception.value.status_code == 400
+            assert len(await crud_transaction.query(session)) == 1
+
+    async def test_create_pending_concurrently(self):
+        async with get_db.get_session() as session:
+            obj_in = TransactionCommerceCreate(
+                datetime=datetime.datetime.now(),
+                payment_method=PaymentMethod.CARD,
+                trade=TradeType.PURCHASE,
+            )
+            await crud_transaction.create_pending(session, obj_in=obj_in)
+
+            # Act
+            # Another till checked before the first transaction was committed, the unique index rejects the insert
+            with patch.object(crud_transaction, "exists", return_value=False):
+                with pytest.raises(HTTPException) as exception:
+                    await crud_transaction.create_pending(session, obj_in=obj_in)
+
+            # Assert
+            assert exception.value.status_code == 400
+            assert len(await crud_transaction.query(session)) == 1
+
     async def test_create_treasury(self):
         async with get_db.get_session() as session:
             # Purchase transaction
@@ -345,3 +404,133 @@ class TestCRUDTransaction(BaseTest):
 
             treasury = await crud_treasury.get_last_treasury(session)
             assert treasury.total_amount == 10
+
+    async def test_get_price_sum(self):
+        async with get_db.get_session() as session:
+            transaction_purchase = await crud_transaction.create_v2(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.PURCHASE,
+                ),
+            )
+            barrel = await crud_barrel.create_v2(
+                session,
+                obj_in=BarrelCreate(
+                    drink_item_id=self.drink_item_in_db.id,
+                    buy_price=10,
+                    sell_price=2,
+                    transactionId=transaction_purchase.id,
+                ),
+            )
+            await crud_consumable.create_v2(
+                session,
+                obj_in=ConsumableCreate(
+                    consumable_item_id=self.consumable_item_in_db.id,
+                    buy_price=1.5,
+                    sell_price=3,
+                    transactionId=transaction_purchase.id,
+                ),
+            )
+            # There is at most one pending transaction at a time
+            await crud_transaction.update(session, db_obj=transaction_purchase, obj_in={"status": Status.VALIDATED})
+            transaction_sale = await crud_transaction.create_v2(
+                session,
+                obj_in=TransactionCommerceCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.SALE,
+                ),
+            )
+            for _ in range(2):
+                await crud_glass.create_v2(
+                    session,
+                    obj_in=GlassCreate(barrel_id=barrel.id, transaction_id=transaction_sale.id),
+                )
+
+            # Act
+            purchase_price_sum = await crud_transaction.get_price_sum(session, id=transaction_purchase.id)
+            sale_price_sum = await crud_transaction.get_price_sum(session, id=transaction_sale.id)
+            transactions = await crud_transaction.query(session, options=[with_price_sum])
+
+        # Assert
+        assert purchase_price_sum == 11.5
+        assert sale_price_sum == 4
+        assert [transaction.price_sum for transaction in transactions] == [11.5, 4]
+
+    async def test_create_cart_publish_changes(self):
+        async with get_db.get_session() as session:
+            barrel = await crud_barrel.create(
+                session,
+                obj_in=BarrelCreate(
+                    drink_item_id=self.drink_item_in_db.id, buy_price=10, sell_price=2, transactionId=0
+                ),
+            )
+            consumable = await crud_consumable.create(
+                session,
+                obj_in=ConsumableCreate(
+                    consumable_item_id=self.consumable_item_in_db.id,
+                    buy_price=1,
+                    sell_price=3,
+                    transactionId=0,
+                ),
+            )
+
+            async with event_bus.subscribe() as messages:
+                # Act
+                transaction = await crud_transaction.create_cart(
+                    session,
+                    obj_in=TransactionCartCreate(
+                        datetime=datetime.datetime.now(),
+                        payment_method=PaymentMethod.CASH,
+                        trade=TradeType.SALE,
+                        glasses=[CartGlass(barrel_id=barrel.id, quantity=1)],
+                        consumable_ids=[consumable.id],
+                    ),
+                )
+
+                # Assert
+                events = json.loads(messages.get_nowait())
+                assert messages.empty()
+
+        assert [(event["table"], event["action"], event["id"]) for event in events] == [
+            ("transaction", "created", transaction.id),
+            ("consumable", "updated", consumable.id),
+        ]
+        assert events[0]["data"]["status"] == Status.VALIDATED.value
+        assert events[0]["data"]["amount"] == 5
+        assert events[1]["data"] == {"consumableItemId": self.consumable_item_in_db.id, "solded": True}
+
+    async def test_create_cart_concurrently(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            barrel = await crud_barrel.create(
+                session,
+                obj_in=BarrelCreate(
+                    drink_item_id=self.drink_item_in_db.id, buy_price=10, sell_price=2, transactionId=0
+                ),
+            )
+
+        async def sell() -> None:
+            async with get_db.get_session() as session:
+                await crud_transaction.create_cart(
+                    session,
+                    obj_in=TransactionCartCreate(
+                        datetime=datetime.datetime.now(),
+                        payment_method=PaymentMethod.CASH,
+                        trade=TradeType.SALE,
+                        glasses=[CartGlass(barrel_id=barrel.id, quantity=1)],
+                    ),
+                )
+
+        # Act
+        # Each till reads before writing, on its own connection
+        await asyncio.gather(*(sell() for _ in range(8)))
+
+        # Assert
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.get_last_treasury(session)
+            assert len(await crud_transaction.query(session)) == 8
+        assert treasury.total_amount == 16
+        assert treasury.version == 9
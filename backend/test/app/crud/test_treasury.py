@@ -6,8 +6,9 @@ from fastapi import HTTPException
 from app.core.types import PaymentMethod, TransactionTypeV1
 from app.crud.crud_treasury import treasury as crud_treasury
 from app.dependencies import get_db
+from app.models.treasury import Treasury as TreasuryModel
 from app.schemas.transaction import TransactionCreate
-from app.schemas.treasury import Treasury, TreasuryCreate
+from app.schemas.treasury import Treasury, TreasuryCreate, TreasuryUpdate
 
 
 class TestCRUDTreasury(BaseTest):
@@ -135,3 +136,234 @@ class TestCRUDTreasury(BaseTest):
                 amount=5,
                 payment_method=PaymentMethod.CASH,
             )
+
+    async def test_get_cached_treasury(self):
+        # Arrange
+        crud_treasury.invalidate()
+        async with get_db.get_session() as session:
+            await crud_treasury.get_cached_treasury(session)
+
+        # Act
+        with self.record_statements() as statements:
+            async with get_db.get_session() as session:
+                treasury = await crud_treasury.get_cached_treasury(session)
+
+        # Assert
+        assert statements == []
+        assert treasury.id == self.treasury_in_db.id
+        assert treasury.version == 1
+
+    async def test_get_current_treasury(self):
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.get_current_treasury(session)
+
+        # Assert
+        assert treasury.id == self.treasury_in_db.id
+
+    async def test_get_current_treasury_deleted(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            new_treasury = await crud_treasury.create(
+                session,
+                obj_in=TreasuryCreate(cash_amount=0, total_amount=0, lydia_rate=0.015),
+            )
+        # Simulate a deletion by another process, the cache still holds the deleted treasury
+        async with get_db.get_session() as session:
+            await session.delete(await session.get(TreasuryModel, new_treasury.id))
+            await session.commit()
+
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.get_current_treasury(session)
+
+        # Assert
+        assert treasury.id == self.treasury_in_db.id
+
+    async def test_update_write_through(self):
+        # Act
+        async with get_db.get_session() as session:
+            db_obj = await crud_treasury.read(session, id=self.treasury_in_db.id)
+            await crud_treasury.update(session, db_obj=db_obj, obj_in=TreasuryUpdate(lydia_rate=0.02))
+
+            treasury = await crud_treasury.get_cached_treasury(session)
+
+        # Assert
+        assert treasury.lydia_rate == 0.02
+        assert treasury.version == 2
+
+    async def test_update_concurrent_transaction(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            db_obj = await crud_treasury.read(session, id=self.treasury_in_db.id)
+            # A sale is committed between the read and the update
+            async with get_db.get_session() as other_session:
+                await crud_treasury.apply_delta(other_session, id=self.treasury_in_db.id, total_delta=10)
+                await other_session.commit()
+
+            # Act
+            with self.assertRaises(HTTPException) as exception:
+                await crud_treasury.update(session, db_obj=db_obj, obj_in=TreasuryUpdate(lydia_rate=0.02))
+
+        # Assert
+        assert exception.exception.status_code == 409
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.read(session, id=self.treasury_in_db.id)
+        assert treasury.total_amount == 10
+        assert treasury.lydia_rate == 0.015
+
+    async def test_delete_invalidate(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            await crud_treasury.get_cached_treasury(session)
+
+        # Act
+        async with get_db.get_session() as session:
+            await crud_treasury.delete(session, id=self.treasury_in_db.id)
+
+        # Assert
+        with self.assertRaises(HTTPException):
+            async with get_db.get_session() as session:
+                await crud_treasury.get_cached_treasury(session)
+
+    async def test_apply_delta(self):
+        # Act
+        async with get_db.get_session() as session:
+            with self.record_statements() as statements:
+                treasury = await crud_treasury.apply_delta(
+                    session,
+                    id=self.treasury_in_db.id,
+                    total_delta=10.005,
+                    cash_delta=5.1,
+                )
+            await session.commit()
+
+        # Assert
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE treasury")
+        assert treasury is not None
+        assert treasury.total_amount == 10.01
+        assert treasury.cash_amount == 5.1
+        assert treasury.version == 2
+        async with get_db.get_session() as session:
+            assert (await crud_treasury.get_cached_treasury(session)).version == 2
+
+    async def test_apply_delta_rollback(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            await crud_treasury.get_cached_treasury(session)
+
+        # Act
+        async with get_db.get_session() as session:
+            await crud_treasury.apply_delta(session, id=self.treasury_in_db.id, total_delta=10, cash_delta=10)
+            await session.rollback()
+
+        # Assert
+        # The uncommitted amounts never reach the cache
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.get_cached_treasury(session)
+        assert treasury.version == 1
+        assert treasury.total_amount == 0
+
+    async def test_apply_delta_negative_cash(self):
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.apply_delta(
+                session,
+                id=self.treasury_in_db.id,
+                total_delta=-5,
+                cash_delta=-5,
+            )
+
+            treasury_in_db = await crud_treasury.read(session, id=self.treasury_in_db.id)
+
+        # Assert
+        assert treasury is None
+        assert treasury_in_db.cash_amount == 0
+        assert treasury_in_db.version == 1
+
+    async def test_apply_delta_negative_cash_card(self):
+        # Arrange
+        # Legacy data, the cash amount is already negative
+        async with get_db.get_session() as session:
+            (await session.get(TreasuryModel, self.treasury_in_db.id)).cash_amount = -5
+            await session.commit()
+
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.apply_delta(session, id=self.treasury_in_db.id, total_delta=5)
+            await session.commit()
+
+        # Assert
+        assert treasury is not None
+        assert treasury.total_amount == 5
+        assert treasury.cash_amount == -5
+
+    async def test_apply_delta_lydia_rate_changed(self):
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.apply_delta(
+                session,
+                id=self.treasury_in_db.id,
+                total_delta=5,
+                lydia_rate=0.02,
+            )
+
+        # Assert
+        assert treasury is None
+
+    async def test_apply_transaction_stale_cache(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            await crud_treasury.get_cached_treasury(session)
+        # Simulate an update by another process, the cache still holds the previous Lydia rate
+        async with get_db.get_session() as session:
+            (await session.get(TreasuryModel, self.treasury_in_db.id)).lydia_rate = 0.5
+            await session.commit()
+
+        # Act
+        async with get_db.get_session() as session:
+            treasury, real_amount = await crud_treasury.apply_transaction(
+                session,
+                amount=10,
+                sale=True,
+                payment_method=PaymentMethod.LYDIA,
+            )
+            await session.commit()
+
+        # Assert
+        assert real_amount == 5
+        assert treasury.total_amount == 5
+        assert treasury.cash_amount == 0
+
+    async def test_apply_transaction_negative_cash(self):
+        # Act
+        with self.assertRaises(HTTPException):
+            async with get_db.get_session() as session:
+                await crud_treasury.apply_transaction(
+                    session,
+                    amount=10,
+                    sale=False,
+                    payment_method=PaymentMethod.CASH,
+                )
+
+    async def test_apply_revert(self):
+        # Arrange
+        async with get_db.get_session() as session:
+            await crud_treasury.apply_transaction(session, amount=10, sale=True, payment_method=PaymentMethod.CASH)
+            await session.commit()
+
+        # Act
+        async with get_db.get_session() as session:
+            treasury = await crud_treasury.apply_revert(session, amount=4, payment_method=PaymentMethod.CASH)
+            await session.commit()
+
+        # Assert
+        assert treasury.total_amount == 6
+        assert treasury.cash_amount == 6
+
+    async def test_apply_revert_negative_cash(self):
+        # Act
+        with self.assertRaises(HTTPException):
+            async with get_db.get_session() as session:
+                await crud_treasury.apply_revert(session, amount=4, payment_method=PaymentMethod.CASH)
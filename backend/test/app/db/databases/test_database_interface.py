@@ -59,3 +59,19 @@ class TestDatabase(IsolatedAsyncioTestCase):
         db = SqliteDatabase()
 
         await db.shutdown()
+
+    async def test_pool_status(self):
+        db = SqliteDatabase()
+        db.setup()
+
+        status = db.pool_status()
+        self.assertEqual(status["pool_class"], "AsyncAdaptedQueuePool")
+        self.assertEqual(status["checked_out"], 0)
+
+        await db.shutdown()
+
+    async def test_pool_status_no_setup(self):
+        db = SqliteDatabase()
+
+        with self.assertRaises(RuntimeError):
+            db.pool_status()
@@ -0,0 +1,77 @@
+from unittest import IsolatedAsyncioTestCase
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.databases.pool import InstrumentedAsyncQueuePool, WaitTimeHistogram, get_pool_status
+
+
+class TestWaitTimeHistogram(IsolatedAsyncioTestCase):
+    def test_observe(self):
+        histogram = WaitTimeHistogram(buckets=(0.01, 0.1))
+        histogram.observe(0.001)
+        histogram.observe(0.01)
+        histogram.observe(0.05)
+        histogram.observe(2)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.total, 2.061)
+        self.assertEqual(
+            histogram.snapshot(),
+            [
+                {"le": 0.01, "count": 2},
+                {"le": 0.1, "count": 1},
+                {"le": None, "count": 1},
+            ],
+        )
+
+
+class TestInstrumentedAsyncQueuePool(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.engine = create_async_engine(
+            "sqlite+aiosqlite://",
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.engine.dispose()
+
+    async def test_checkout(self):
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            status = get_pool_status(self.engine.pool)
+            self.assertEqual(status["pool_class"], "InstrumentedAsyncQueuePool")
+            self.assertEqual(status["size"], 1)
+            self.assertEqual(status["checked_out"], 1)
+
+        status = get_pool_status(self.engine.pool)
+        self.assertEqual(status["checked_out"], 0)
+        self.assertEqual(status["checked_in"], 1)
+        self.assertEqual(status["wait_count"], 1)
+        self.assertEqual(sum(bucket["count"] for bucket in status["wait_time_histogram"]), 1)
+
+    async def test_timeout(self):
+        async with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                async with self.engine.connect():
+                    pass  # pragma: no cover
+
+        status = get_pool_status(self.engine.pool)
+        self.assertEqual(status["timeouts"], 1)
+        self.assertEqual(status["wait_count"], 2)
+
+
+class TestGetPoolStatus(IsolatedAsyncioTestCase):
+    async def test_not_queue_pool(self):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=NullPool)
+
+        status = get_pool_status(engine.pool)
+        self.assertEqual(status["pool_class"], "NullPool")
+        self.assertIsNone(status["size"])
+        self.assertEqual(status["wait_time_histogram"], [])
+
+        await engine.dispose()
@@ -5,6 +5,7 @@ from sqlalchemy import URL, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.db.databases.pool import InstrumentedAsyncQueuePool
 from app.db.databases.postgres import PostgresDatabase
 
 postgres_url = URL.create(
@@ -14,6 +15,7 @@ postgres_url = URL.create(
     host=settings.POSTGRES_HOST,
     port=settings.POSTGRES_PORT,
     database=settings.POSTGRES_DB,
+    query={"prepared_statement_cache_size": str(settings.POSTGRES_STATEMENT_CACHE_SIZE)},
 )
 
 
@@ -30,7 +32,12 @@ class TestPostgresDatabase(IsolatedAsyncioTestCase):
 
         mock_create_async_engine.assert_called_once_with(
             postgres_url,
-            pool_pre_ping=True,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+            pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+            pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
         )
         mock_async_sessionmaker.assert_called_once_with(
             mock_async_engine,
@@ -2,6 +2,7 @@ from unittest import IsolatedAsyncioTestCase
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import text
 
 from app.db.databases.sqlite import SqliteDatabase
 
@@ -11,6 +12,38 @@ class TestSqliteDatabase:
         db = SqliteDatabase()
         db.setup("sqlite+aiosqlite:///" + str(tmp_path / "test.db"))
 
+    @pytest.mark.asyncio
+    async def test_setup_tuned(self, tmp_path):
+        db = SqliteDatabase()
+        db.setup("sqlite+aiosqlite:///" + str(tmp_path / "test.db"), profile="tuned", foreign_keys=True)
+
+        async with db.get_session() as session:
+            pragmas = {
+                name: (await session.execute(text(f"PRAGMA {name}"))).scalar_one()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "foreign_keys")
+            }
+            connection = await (await session.connection()).get_raw_connection()
+            isolation_level = connection.dbapi_connection.isolation_level
+        await db.shutdown()
+
+        # synchronous NORMAL is 1
+        assert pragmas == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "foreign_keys": 1}
+        # The write transactions take the write lock first
+        assert isolation_level == "IMMEDIATE"
+
+    @pytest.mark.asyncio
+    async def test_setup_default(self, tmp_path):
+        db = SqliteDatabase()
+        db.setup("sqlite+aiosqlite:///" + str(tmp_path / "test.db"), profile="default", foreign_keys=False)
+
+        async with db.get_session() as session:
+            journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar_one()
+            foreign_keys = (await session.execute(text("PRAGMA foreign_keys"))).scalar_one()
+        await db.shutdown()
+
+        assert journal_mode == "delete"
+        assert foreign_keys == 0
+
     @pytest.mark.asyncio
     async def test_drop(self, tmp_path):
         db = SqliteDatabase()
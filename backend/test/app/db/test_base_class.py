@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.base_class import UTCDateTime
+
+
+def test_utc_datetime_bind_naive():
+    value = UTCDateTime().process_bind_param(datetime(2024, 1, 1, 12), sqlite.dialect())
+
+    assert value == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def test_utc_datetime_bind_other_timezone():
+    value = UTCDateTime().process_bind_param(
+        datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+        postgresql.dialect(),
+    )
+
+    assert value is not None
+    assert value.tzinfo == timezone.utc
+    assert value.hour == 10
+
+
+def test_utc_datetime_result_naive():
+    value = UTCDateTime().process_result_value(datetime(2024, 1, 1, 12), sqlite.dialect())
+
+    assert value == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert value.tzinfo == timezone.utc
+
+
+def test_utc_datetime_none():
+    assert UTCDateTime().process_bind_param(None, sqlite.dialect()) is None
+    assert UTCDateTime().process_result_value(None, sqlite.dialect()) is None
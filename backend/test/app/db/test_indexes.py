@@ -0,0 +1,92 @@
+import datetime
+from test.base_test import BaseTest
+
+from app.core.types import PaymentMethod, TradeType
+from app.crud.crud_transaction import transaction as crud_transaction
+from app.crud.crud_treasury import treasury as crud_treasury
+from app.dependencies import get_db
+from app.schemas.treasury import TreasuryCreate
+from app.schemas.v2.transaction import TransactionTreasuryCreate
+
+
+class TestIndexes(BaseTest):
+    """
+    The main endpoint queries are explained by SQLite, the query plans must use the indexes.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async with get_db.get_session() as session:
+            await crud_treasury.create(session, obj_in=TreasuryCreate(total_amount=0, cash_amount=0, lydia_rate=0.015))
+            self.transaction = await crud_transaction.create_v2(
+                session,
+                obj_in=TransactionTreasuryCreate(
+                    datetime=datetime.datetime.now(),
+                    payment_method=PaymentMethod.CARD,
+                    trade=TradeType.PURCHASE,
+                    amount=10,
+                    description="test",
+                ),
+            )
+
+    async def query_plans(self, url: str) -> str:
+        """
+        Get the query plans of the SELECT statements of an endpoint.
+
+        :param url: The url of the endpoint
+
+        :return: The details of the steps of all the query plans, one step per line
+        """
+        with self.record_statements() as statements:
+            response = self._client.get(url)
+        assert response.status_code == 200
+
+        steps: list[str] = []
+        async with get_db.async_engine.connect() as connection:  # type: ignore
+            for statement in statements:
+                if not statement.lstrip().upper().startswith("SELECT"):
+                    continue
+                rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", statement.parameters)
+                steps.extend(row[3] for row in rows)
+        return "\n".join(steps)
+
+    async def test_distinct_barrels(self):
+        plans = await self.query_plans("/api/v2/barrel/distincts/?is_mounted=true")
+
+        assert "USING INDEX ix_barrel_in_stock" in plans
+
+    async def test_distinct_consumables(self):
+        plans = await self.query_plans("/api/v2/consumable/distincts/")
+
+        assert "USING INDEX ix_consumable_in_stock" in plans
+
+    async def test_transactions_page(self):
+        plans = await self.query_plans("/api/v2/transaction/?limit=10")
+
+        assert "SCAN transaction USING INDEX ix_transaction_datetime_id" in plans
+        assert "TEMP B-TREE" not in plans
+
+    async def test_pending_transactions(self):
+        plans = await self.query_plans("/api/v2/transaction/?status=pending")
+
+        assert "USING INDEX ix_transaction_pending" in plans
+
+    async def test_transaction_detail(self):
+        plans = await self.query_plans(f"/api/v2/transaction/{self.transaction.id}")
+
+        # The items of the transaction are loaded by foreign key
+        assert "USING INDEX ix_glass_transaction_id" in plans
+        assert "USING INDEX ix_noninventoried_transaction_id" in plans
+        assert "USING INDEX ix_barrel_transaction_id_purchase" in plans
+        assert "USING INDEX ix_consumable_transaction_id_sale" in plans
+
+    async def test_glasses_by_barrel(self):
+        plans = await self.query_plans("/api/v2/glass/?barrel_id=1")
+
+        assert "USING INDEX ix_glass_barrel_id" in plans
+
+    async def test_accounts_by_username(self):
+        plans = await self.query_plans("/api/v1/account/?username=test")
+
+        assert "USING INDEX ix_account_username" in plans
@@ -2,13 +2,17 @@ from datetime import datetime
 from unittest.mock import MagicMock
 
 import pytest
+from fastapi.exceptions import RequestValidationError
 from pydantic import FieldValidationInfo, ValidationError
 
 from app.core.security import get_password_hash, verify_password
 from app.schemas.account import (
     AccountCreate,
+    AccountCreateBody,
     AccountUpdate,
     OwnAccountUpdate,
+    OwnAccountUpdateBody,
+    validate_account_body,
     validate_password,
 )
 
@@ -135,3 +139,33 @@ def test_own_account_update():
     with pytest.raises(ValidationError) as exc_info:
         OwnAccountUpdate(**account_dict)
     assert "extra_forbidden" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_validate_account_body():
+    body = AccountCreateBody(
+        username="johndoe",
+        last_name="Doe",
+        first_name="John",
+        promotion_year=datetime.now().year,
+        password=strong_password,
+    )
+    account = await validate_account_body(AccountCreate, body)
+    assert isinstance(account, AccountCreate)
+    assert account.username == "johndoe"
+    assert verify_password(strong_password, account.password)
+
+    # Only the fields sent are set
+    account_update = await validate_account_body(OwnAccountUpdate, OwnAccountUpdateBody(username="janedoe"))
+    assert account_update.model_dump(exclude_unset=True) == {"username": "janedoe"}
+
+
+@pytest.mark.asyncio
+async def test_validate_account_body_weak_password():
+    body = OwnAccountUpdateBody(password="password")
+    with pytest.raises(RequestValidationError) as exc_info:
+        await validate_account_body(OwnAccountUpdate, body)
+
+    errors = exc_info.value.errors()
+    assert errors[0]["loc"] == ("body", "password")
+    assert "Password is too weak" in errors[0]["msg"]
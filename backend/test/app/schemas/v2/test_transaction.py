@@ -1,7 +1,10 @@
 import datetime
 
-from app.core.types import PaymentMethod, TradeType
-from app.schemas.v2.transaction import TransactionTreasuryCreate
+import pytest
+from pydantic import ValidationError
+
+from app.core.types import PaymentMethod, Status, TradeType
+from app.schemas.v2.transaction import TransactionCartCreate, TransactionTreasuryCreate
 
 
 def test_amount_must_match_trade_purchase_0():
@@ -50,3 +53,42 @@ def test_amount_must_match_trade_sale_1():
     )
 
     assert transaction.amount == 10
+
+
+def test_cart_is_validated():
+    cart = TransactionCartCreate(
+        datetime=datetime.datetime.now(),
+        trade=TradeType.SALE,
+        payment_method=PaymentMethod.CARD,
+        consumable_ids=[1],
+    )
+
+    assert cart.status == Status.VALIDATED
+
+
+def test_cart_consumables_must_be_unique():
+    with pytest.raises(ValidationError):
+        TransactionCartCreate(
+            datetime=datetime.datetime.now(),
+            trade=TradeType.SALE,
+            payment_method=PaymentMethod.CARD,
+            consumable_ids=[1, 1],
+        )
+
+
+@pytest.mark.parametrize("quantity", [0, 101])
+def test_cart_quantity_bounds(quantity):
+    with pytest.raises(ValidationError):
+        TransactionCartCreate(
+            datetime=datetime.datetime.now(),
+            trade=TradeType.SALE,
+            payment_method=PaymentMethod.CARD,
+            glasses=[{"barrel_id": 1, "quantity": quantity}],
+        )
+    with pytest.raises(ValidationError):
+        TransactionCartCreate(
+            datetime=datetime.datetime.now(),
+            trade=TradeType.SALE,
+            payment_method=PaymentMethod.CARD,
+            non_inventorieds=[{"non_inventoried_item_id": 1, "quantity": quantity}],
+        )
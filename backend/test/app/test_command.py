@@ -62,13 +62,22 @@ async def test_dump_db(mock_dump_db):
     mock_dump_db.assert_called_once_with("test.json")
 
 
+@pytest.mark.asyncio
+@patch("app.command.dump_db_stream")
+async def test_dump_db_stream(mock_dump_db_stream):
+    args = ["test", "dump", "--format", "ndjson", "--compression", "gzip", "--batch-size", "10"]
+    with patch("sys.argv", args):
+        await main("dump")
+    mock_dump_db_stream.assert_called_once_with("dump", compression="gzip", batch_size=10)
+
+
 @pytest.mark.asyncio
 @patch("app.command.load_db")
 async def test_load_db(mock_load_db):
     args = ["test", "load", "--input", "test.json"]
     with patch("sys.argv", args):
         await main("load")
-    mock_load_db.assert_called_once_with("test.json")
+    mock_load_db.assert_called_once_with("test.json", batch_size=5000)
 
 
 @pytest.mark.asyncio
@@ -78,3 +87,12 @@ async def test_execute_sql_command(mock_execute_sql_command):
     with patch("sys.argv", args):
         await main("execute")
     mock_execute_sql_command.assert_called_once_with("SELECT * FROM users")
+
+
+@pytest.mark.asyncio
+@patch("app.command.rebuild_rollup")
+async def test_rebuild_rollup(mock_rebuild_rollup):
+    args = ["test", "rebuild-rollup"]
+    with patch("sys.argv", args):
+        await main("rebuild-rollup")
+    mock_rebuild_rollup.assert_called_once_with()
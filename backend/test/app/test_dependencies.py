@@ -125,6 +125,71 @@ class TestGetCurrentAccount(BaseTest):
         assert account.first_name == self.account_db.first_name
         assert account.promotion_year == self.account_db.promotion_year
 
+    async def test_get_current_account_cached(self):
+        # Arrange
+        await get_current_account(security_scopes=self.security_scopes, token=self.token, db=get_db.get_session())
+
+        # Act
+        with self.record_statements() as statements:
+            current_account = await get_current_account(
+                security_scopes=self.security_scopes,
+                token=self.token,
+                db=get_db.get_session(),
+            )
+
+        # Assert
+        assert statements == []
+        assert current_account.id == self.account_db.id
+        assert current_account.password is None
+
+    async def test_get_current_account_cached_no_required_scope(self):
+        # Arrange
+        await get_current_account(security_scopes=self.security_scopes, token=self.token, db=get_db.get_session())
+
+        with self.assertRaises(HTTPException) as error:
+            await get_current_account(
+                security_scopes=SecurityScopes(["president"]),
+                token=self.token,
+                db=get_db.get_session(),
+            )
+
+        assert error.exception.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_get_current_account_invalidated_on_update(self):
+        # Arrange
+        await get_current_account(security_scopes=self.security_scopes, token=self.token, db=get_db.get_session())
+
+        # Act
+        async with get_db.get_session() as session:
+            await crud_account.update(session, db_obj=self.account_db, obj_in={"is_active": True})
+        current_account = await get_current_account(
+            security_scopes=self.security_scopes,
+            token=self.token,
+            db=get_db.get_session(),
+        )
+
+        # Assert
+        assert current_account.is_active is True
+
+    async def test_get_current_account_invalidated_on_delete(self):
+        # Arrange
+        await get_current_account(security_scopes=self.security_scopes, token=self.token, db=get_db.get_session())
+
+        # Act
+        async with get_db.get_session() as session:
+            await crud_account.delete(session, id=self.account_db.id)
+
+        with self.assertRaises(HTTPException) as error:
+            await get_current_account(
+                security_scopes=self.security_scopes,
+                token=self.token,
+                db=get_db.get_session(),
+            )
+
+        # Assert
+        assert error.exception.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "Account does not exist" in self._caplog.text
+
     async def test_get_current_active_account_inactive(self):
         # Arrange
         async with get_db.get_session() as session:
@@ -1,9 +1,14 @@
 import unittest
-from typing import cast
+from contextlib import contextmanager
+from typing import Any, Generator, cast
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from app.core.responses import catalog_cache
+from app.crud.crud_account import account as crud_account
+from app.crud.crud_treasury import treasury as crud_treasury
 from app.db.databases.sqlite import SqliteDatabase
 from app.dependencies import get_current_active_account, get_db
 
@@ -12,6 +17,14 @@ async def override_get_current_active_account():
     pass
 
 
+class RecordedStatement(str):
+    """
+    A SQL statement sent to the database, along with the parameters it was executed with.
+    """
+
+    parameters: Any
+
+
 class BaseTest(unittest.IsolatedAsyncioTestCase):
     @pytest.fixture(autouse=True)
     def inject_fixtures(self, client: TestClient, caplog: pytest.LogCaptureFixture, tmp_path):
@@ -22,9 +35,32 @@ class BaseTest(unittest.IsolatedAsyncioTestCase):
     def wipe_dependencies_overrides(self):
         self._client.app.dependency_overrides.clear()  # type: ignore
 
+    @contextmanager
+    def record_statements(self) -> Generator[list[RecordedStatement], None, None]:
+        """
+        Record the SQL statements sent to the database while the context is active, with their parameters.
+        """
+        statements: list[RecordedStatement] = []
+
+        def before_cursor_execute(_conn, _cursor, statement, parameters, *_args):
+            recorded = RecordedStatement(statement)
+            recorded.parameters = parameters
+            statements.append(recorded)
+
+        engine = get_db.async_engine.sync_engine  # type: ignore
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
     async def asyncSetUp(self) -> None:
         sqlite_path = "sqlite+aiosqlite:///" + str(self._tmp_path / "test.db")
         self._client.app.dependency_overrides[get_current_active_account] = override_get_current_active_account  # type: ignore
 
         cast(SqliteDatabase, get_db).setup(sqlite_path)
         await cast(SqliteDatabase, get_db).create_all(no_drop=True)
+        # The database is recreated for each test, the cached treasuries, principals and catalogs would be stale
+        crud_treasury.invalidate()
+        crud_account.invalidate()
+        catalog_cache.clear()